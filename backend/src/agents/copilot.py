@@ -7,17 +7,59 @@ Handles:
 3. Synthesizing responses with citations
 """
 import anthropic
+import hashlib
+import heapq
+import io
+from collections import OrderedDict
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 import structlog
 import json
+import numpy as np
+import re
+import sys
+import types
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate, groupby
+from operator import attrgetter, itemgetter
+from collections.abc import AsyncIterator
+from typing import Final
 
 from backend.src.config import get_settings
 from backend.src.agents.rag import rag_service
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 logger = structlog.get_logger()
 settings = get_settings()
 
+# Max generated responses kept in the copilot's in-process response cache
+_RESPONSE_CACHE_MAX = 200
+
+# Returned when generation produced nothing; never worth caching
+NO_RESPONSE_MESSAGE = "I apologize, but I wasn't able to generate a response. Please try again."
+
+# Bound line templates for the per-player prediction loops
+_BEST_BET_LINE = "{i}. **{name}** ({team} {matchup}) - Model: {goal}% | Point: {point:.0%}".format
+_TOP_SCORER_LINE = "{i}. **{name}** ({team}) - {goal:.0%} goal probability, {point:.0%} point probability".format
+_EXPECTED_LINE = "   Expected: {g:.2f}G, {a:.2f}A, {p:.2f}P".format
+_CONFIDENCE_LINE = "   Confidence: {label} ({pct:.0%})".format
+
+# English month names for date headers; avoids the locale-dependent strftime path
+_MONTHS: Final[tuple[str, ...]] = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+)
+
+
+def _long_date(d) -> str:
+    """Render a date as e.g. "January 02, 2026" (same as strftime('%B %d, %Y'))."""
+    return f"{_MONTHS[d.month - 1]} {d.day:02d}, {d.year}"
+
 
 SYSTEM_PROMPT = """You are PowerplAI, an expert hockey analytics assistant. You help users understand NHL statistics, player performance, and make data-driven insights for fantasy hockey and predictions.
 
@@ -53,6 +95,144 @@ Formatting rules:
 - Keep a clean, professional, analytical tone - like a quant sports analyst, not a sports broadcaster."""
 
 
+# Static parts of the response-generation prompt; only context and query vary per call
+_PROMPT_PREFIX = 'Context from database and knowledge base:\n\n'
+_PROMPT_MIDDLE = '\n\n---\n\nUser question: '
+_PROMPT_SUFFIX = """
+
+Provide a helpful, accurate response based on the context above.
+
+IMPORTANT:
+- Base your answer ONLY on the context provided above. Do not say you don't have access to data if it's in the context.
+- If the context contains scoring predictions, present them clearly with percentages and player names.
+- The "Overall Best Bets Tonight" list contains up to 15 ranked players. If a follow-up asks for more picks, draw from players further down that list (e.g., ranks 4-6 for "give me three more").
+- If this is a follow-up question referencing previous conversation (e.g., "tell me more", "what about that"), use the conversation history above for context.
+- If the user attached an image, analyze it in the context of the hockey question asked.
+- Always end your response with a "Sources:" section listing where the data came from, formatted as:
+
+Sources:
+- PowerplAI Scoring Model (NHL API game logs, recent form analysis)
+- [Any other sources from the context]"""
+
+
+# Team name/nickname -> abbreviation, built once at import. Keys are lowercase.
+# Keys and abbreviations are interned so downstream equality/dict probes hit the
+# identity fast path. Exposed read-only so callers can't mutate the shared table.
+_TEAM_MAPPING: Final[types.MappingProxyType[str, str]] = types.MappingProxyType({sys.intern(k): sys.intern(v) for k, v in {
+    "toronto": "TOR", "maple leafs": "TOR", "leafs": "TOR",
+    "montreal": "MTL", "canadiens": "MTL", "habs": "MTL",
+    "ottawa": "OTT", "senators": "OTT", "sens": "OTT",
+    "boston": "BOS", "bruins": "BOS",
+    "buffalo": "BUF", "sabres": "BUF",
+    "detroit": "DET", "red wings": "DET",
+    "florida": "FLA", "panthers": "FLA",
+    "tampa": "TBL", "tampa bay": "TBL", "lightning": "TBL",
+    "carolina": "CAR", "hurricanes": "CAR", "canes": "CAR",
+    "new jersey": "NJD", "devils": "NJD",
+    "rangers": "NYR", "new york rangers": "NYR",
+    "islanders": "NYI", "new york islanders": "NYI",
+    "philadelphia": "PHI", "flyers": "PHI",
+    "pittsburgh": "PIT", "penguins": "PIT", "pens": "PIT",
+    "washington": "WSH", "capitals": "WSH", "caps": "WSH",
+    "columbus": "CBJ", "blue jackets": "CBJ",
+    "chicago": "CHI", "blackhawks": "CHI", "hawks": "CHI",
+    "colorado": "COL", "avalanche": "COL", "avs": "COL",
+    "dallas": "DAL", "stars": "DAL",
+    "minnesota": "MIN", "wild": "MIN",
+    "nashville": "NSH", "predators": "NSH", "preds": "NSH",
+    "st louis": "STL", "st. louis": "STL", "blues": "STL",
+    "winnipeg": "WPG", "jets": "WPG",
+    "arizona": "ARI", "coyotes": "ARI",
+    "utah": "UTA", "utah hockey club": "UTA",
+    "anaheim": "ANA", "ducks": "ANA",
+    "calgary": "CGY", "flames": "CGY",
+    "edmonton": "EDM", "oilers": "EDM",
+    "los angeles": "LAK", "kings": "LAK",
+    "san jose": "SJS", "sharks": "SJS",
+    "seattle": "SEA", "kraken": "SEA",
+    "vancouver": "VAN", "canucks": "VAN",
+    "vegas": "VGK", "golden knights": "VGK", "knights": "VGK",
+}.items()})
+assert all(k == k.lower() for k in _TEAM_MAPPING), "team mapping keys must be lowercase"
+# Bound once so the exact-match path is a single probe
+_team_lookup = _TEAM_MAPPING.get
+
+# Partial-match fallback for _normalize_teams, built once at import:
+# - one alternation (longest alias first) finds any alias inside the input in a single scan
+# - aliases joined into one string so "input is a fragment of an alias" is a single find()
+_TEAM_ALIAS_RE: Final[re.Pattern[str]] = re.compile(
+    "|".join(re.escape(k) for k in sorted(_TEAM_MAPPING, key=len, reverse=True))
+)
+_TEAM_ALIAS_KEYS: Final[tuple[str, ...]] = tuple(_TEAM_MAPPING)
+_TEAM_ALIAS_BLOB: Final[str] = "\n".join(_TEAM_ALIAS_KEYS)
+_TEAM_ALIAS_OFFSETS: Final[tuple[int, ...]] = tuple(
+    accumulate((len(k) + 1 for k in _TEAM_ALIAS_KEYS[:-1]), initial=0)
+)
+
+
+def _match_team_alias(team_lower: str) -> str | None:
+    """Resolve a partial team name (e.g. "boston bruins", "tampa b") to an abbreviation."""
+    match = _TEAM_ALIAS_RE.search(team_lower)
+    if match:
+        return _TEAM_MAPPING[match.group()]
+    if team_lower and "\n" not in team_lower:
+        pos = _TEAM_ALIAS_BLOB.find(team_lower)
+        if pos != -1:
+            return _TEAM_MAPPING[_TEAM_ALIAS_KEYS[bisect_right(_TEAM_ALIAS_OFFSETS, pos) - 1]]
+    return None
+
+
+@lru_cache(maxsize=1024)
+def _normalize_team(team: str) -> str | None:
+    """Convert one team name to its abbreviation, or None if unrecognized.
+
+    Cached per name since the same teams are re-asked across queries.
+    """
+    stripped = team.strip()
+    # API-sourced names are usually lowercase already; skip the lower() copy then
+    team_lower = stripped if stripped.islower() else stripped.lower()
+    abbrev = _team_lookup(team_lower)
+    if abbrev is not None:
+        return abbrev
+    if len(team) == 3:
+        return team.upper()
+    # Try partial matching
+    return _match_team_alias(team_lower)
+
+
+def _top_k_indices(values: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest values, highest first (O(n) partition + sort of k)."""
+    if values.size <= k:
+        return np.argsort(-values, kind="stable")
+    idx = np.argpartition(-values, k)[:k]
+    return idx[np.argsort(-values[idx], kind="stable")]
+
+
+def _rank_top_k(values: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest values, highest first; ties keep input order.
+
+    Plain selection loop so numba can compile it without temporaries.
+    """
+    n = values.shape[0]
+    k = min(k, n)
+    out = np.empty(k, dtype=np.int64)
+    taken = np.zeros(n, dtype=np.bool_)
+    for j in range(k):
+        best = -1
+        for i in range(n):
+            if not taken[i] and (best == -1 or values[i] > values[best]):
+                best = i
+        taken[best] = True
+        out[j] = best
+    return out
+
+
+# numba is an optional accelerator (pip install "powerplai[perf]"). The explicit
+# signature compiles at import (cached on disk), so the first request pays nothing.
+if njit is not None:
+    _top_k_indices = njit("int64[:](float64[::1], int64)", cache=True, nogil=True)(_rank_top_k)
+
+
 class QueryType:
     STATS_LOOKUP = "stats_lookup"       # "How many goals does Makar have?"
     COMPARISON = "comparison"           # "Compare McDavid vs Crosby"
@@ -74,7 +254,10 @@ class PowerplAICopilot:
     """Main copilot agent for hockey analytics queries."""
 
     def __init__(self):
-        self.client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
+        # Async client so classification and generation never block the event loop
+        self.client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
+        # Exact-match LRU of generated responses, keyed by a hash of the prompt inputs
+        self._response_cache: OrderedDict[bytes, str] = OrderedDict()
 
     async def query(
         self,
@@ -351,18 +534,29 @@ class PowerplAICopilot:
                 sources.append({"type": "sql", "data": "league_leaders"})
 
         # Try to get structured stats if players are mentioned
+        stats_context = None
         if classification.get("players"):
             stats_context = await self._fetch_player_stats(db, classification["players"])
             if stats_context:
                 context_parts.append(f"## Player Statistics\n{stats_context}")
                 sources.append({"type": "sql", "data": "player_stats"})
 
-        # Get RAG context for additional knowledge
-        if include_rag:
+        # Get RAG context for additional knowledge. Pure stats/leaders/prediction
+        # lookups are fully answered by the structured queries above, so skip the
+        # embedding + vector search for those.
+        query_type = classification.get("type")
+        rag_useful = query_type in (QueryType.EXPLAINER, QueryType.TREND_ANALYSIS) or (
+            not classification.get("is_prediction_query")
+            and not classification.get("is_leaders_query")
+            and not (query_type == QueryType.STATS_LOOKUP and stats_context)
+        )
+        if include_rag and not rag_useful:
+            logger.info("rag_skipped", type=query_type)
+        if include_rag and rag_useful:
             # Pass query type for strategy-aware retrieval
             rag_results = await rag_service.search(
                 db, user_query, limit=3,
-                query_type=classification.get("type"),
+                query_type=query_type,
             )
             if rag_results:
                 # Format with citations for transparent sourcing
@@ -392,7 +586,7 @@ class PowerplAICopilot:
 
     async def _classify_query(self, query: str) -> dict:
         """Use Claude to classify the query and extract entities."""
-        message = self.client.messages.create(
+        message = await self.client.messages.create(
             model="claude-sonnet-4-20250514",
             max_tokens=500,
             messages=[
@@ -616,61 +810,8 @@ Examples:
         if not teams:
             return None
 
-        # Map team names to abbreviations
-        team_mapping = {
-            "toronto": "TOR", "maple leafs": "TOR", "leafs": "TOR",
-            "montreal": "MTL", "canadiens": "MTL", "habs": "MTL",
-            "ottawa": "OTT", "senators": "OTT", "sens": "OTT",
-            "boston": "BOS", "bruins": "BOS",
-            "buffalo": "BUF", "sabres": "BUF",
-            "detroit": "DET", "red wings": "DET",
-            "florida": "FLA", "panthers": "FLA",
-            "tampa": "TBL", "tampa bay": "TBL", "lightning": "TBL",
-            "carolina": "CAR", "hurricanes": "CAR", "canes": "CAR",
-            "new jersey": "NJD", "devils": "NJD",
-            "new york rangers": "NYR", "rangers": "NYR",
-            "new york islanders": "NYI", "islanders": "NYI",
-            "philadelphia": "PHI", "flyers": "PHI",
-            "pittsburgh": "PIT", "penguins": "PIT", "pens": "PIT",
-            "washington": "WSH", "capitals": "WSH", "caps": "WSH",
-            "columbus": "CBJ", "blue jackets": "CBJ",
-            "chicago": "CHI", "blackhawks": "CHI", "hawks": "CHI",
-            "colorado": "COL", "avalanche": "COL", "avs": "COL",
-            "dallas": "DAL", "stars": "DAL",
-            "minnesota": "MIN", "wild": "MIN",
-            "nashville": "NSH", "predators": "NSH", "preds": "NSH",
-            "st louis": "STL", "st. louis": "STL", "blues": "STL",
-            "winnipeg": "WPG", "jets": "WPG",
-            "arizona": "ARI", "coyotes": "ARI",
-            "utah": "UTA", "utah hockey club": "UTA",
-            "anaheim": "ANA", "ducks": "ANA",
-            "calgary": "CGY", "flames": "CGY",
-            "edmonton": "EDM", "oilers": "EDM",
-            "los angeles": "LAK", "kings": "LAK",
-            "san jose": "SJS", "sharks": "SJS",
-            "seattle": "SEA", "kraken": "SEA",
-            "vancouver": "VAN", "canucks": "VAN",
-            "vegas": "VGK", "golden knights": "VGK", "knights": "VGK",
-        }
-
         # Convert team names to abbreviations
-        team_abbrevs = []
-        for team in teams:
-            if not team:
-                continue
-            team_lower = team.lower()
-            # Direct match
-            if team_lower in team_mapping:
-                team_abbrevs.append(team_mapping[team_lower])
-            # 3-letter abbreviation
-            elif len(team) == 3:
-                team_abbrevs.append(team.upper())
-            else:
-                # Try partial matching - check if any key is in the team name
-                for key, abbrev in team_mapping.items():
-                    if key in team_lower or team_lower in key:
-                        team_abbrevs.append(abbrev)
-                        break
+        team_abbrevs = self._normalize_teams(teams)
 
         if not team_abbrevs:
             return None
@@ -778,8 +919,9 @@ Examples:
         )
         latest_season = season_result.scalar()
 
-        # Use window function to rank players within each team
-        result = await db.execute(
+        # Use window function to rank players within each team. Streamed with
+        # yield_per so rows are grouped as they arrive instead of materialized.
+        result = await db.stream(
             text(f"""
                 WITH ranked AS (
                     SELECT
@@ -798,37 +940,32 @@ Examples:
                 )
                 SELECT * FROM ranked WHERE rank <= :top_n
                 ORDER BY team_abbrev, rank
-            """),
+            """).execution_options(yield_per=64),
             {"season": latest_season, "top_n": top_n},
         )
 
-        rows = result.fetchall()
-        if not rows:
+        # Rows arrive ordered by team, so group on the fly. A team can span two
+        # partitions, hence tracking the current team across them.
+        team_lines = []
+        current_team = None
+        async for partition in result.mappings().partitions():
+            for team, group in groupby(partition, key=itemgetter("team_abbrev")):
+                if team != current_team:
+                    team_lines.append(f"\n**{team}:**")
+                    current_team = team
+                for row in group:
+                    team_lines.append(
+                        f"  {row['rank']}. {row['name']}: {row[sort_column]} {stat_label.lower()}"
+                    )
+
+        if not team_lines:
             return None
 
         # Format season for display
         display_season = self._format_season_display(latest_season)
 
-        # Group by team
-        teams = {}
-        for row in rows:
-            team = row.team_abbrev
-            if team not in teams:
-                teams[team] = []
-            teams[team].append(row)
-
-        # Format output
-        stats_text = [f"**Top {top_n} players by {stat_label} on each team ({display_season} season):**\n"]
-
-        for team in sorted(teams.keys()):
-            players = teams[team]
-            team_lines = [f"\n**{team}:**"]
-            for row in players:
-                stat_value = getattr(row, sort_column)
-                team_lines.append(f"  {row.rank}. {row.name}: {stat_value} {stat_label.lower()}")
-            stats_text.append("\n".join(team_lines))
-
-        return "\n".join(stats_text)
+        header = f"**Top {top_n} players by {stat_label} on each team ({display_season} season):**\n"
+        return "\n".join([header, *team_lines])
 
     async def _fetch_multi_season_leaders(
         self,
@@ -1154,18 +1291,34 @@ Examples:
                     except ValueError:
                         pass
 
-        # If specific teams mentioned, get matchup prediction
+        # If specific teams mentioned, get matchup prediction(s). Teams come in
+        # pairs ("TOR vs BOS and EDM vs CGY"); all matchups go into one context
+        # so the whole question is answered by a single response call.
         if len(teams) >= 2:
-            # Convert team names to abbreviations if needed
-            team_abbrevs = self._normalize_teams(teams[:2])
-            if len(team_abbrevs) >= 2:
+            # Pair the names as given, then convert each to an abbreviation, so
+            # one unrecognized team drops its own matchup instead of shifting
+            # every later team into the wrong pair
+            matchups = []
+            for home_name, away_name in zip(teams[0::2], teams[1::2]):
+                home_team = _normalize_team(home_name) if home_name else None
+                away_team = _normalize_team(away_name) if away_name else None
+                if home_team is None or away_team is None:
+                    logger.warning("matchup_team_unrecognized", teams=[home_name, away_name])
+                    continue
+                matchups.append((home_team, away_team))
+            predictions = []
+            if matchups:
                 try:
-                    prediction = await prediction_engine.get_matchup_prediction(
-                        db, team_abbrevs[0], team_abbrevs[1], target_date, top_n=8
+                    predictions = await prediction_engine.get_matchup_predictions_batch(
+                        db, matchups, target_date, top_n=8
                     )
-                    return self._format_matchup_prediction(prediction)
                 except Exception as e:
-                    logger.warning("matchup_prediction_failed", teams=teams, error=str(e))
+                    logger.warning("matchup_prediction_failed", matchups=matchups, error=str(e))
+                    await db.rollback()
+            if len(predictions) == 1:
+                return self._format_matchup_prediction(predictions[0])
+            if predictions:
+                return self._format_matchups_batch(predictions)
 
         # If only one team mentioned, find their scheduled game
         elif len(teams) == 1:
@@ -1193,7 +1346,7 @@ Examples:
                         )
                         return self._format_matchup_prediction(prediction)
                     else:
-                        return f"No game scheduled for {team_abbrev} on {target_date.strftime('%B %d, %Y')}."
+                        return f"No game scheduled for {team_abbrev} on {_long_date(target_date)}."
                 except Exception as e:
                     logger.warning("single_team_prediction_failed", team=team_abbrev, error=str(e))
 
@@ -1230,10 +1383,10 @@ Examples:
                 ]
 
                 if not games:
-                    return f"No games scheduled for {target_date.strftime('%B %d, %Y')}."
+                    return f"No games scheduled for {_long_date(target_date)}."
 
                 date_label = "Tonight's" if target_date == date.today() else target_date.strftime('%A, %B %d')
-                predictions_text = [f"**{date_label} Games - {target_date.strftime('%B %d, %Y')}**\n"]
+                predictions_text = [f"**{date_label} Games - {_long_date(target_date)}**\n"]
 
                 # ── Fetch live market odds once for all games ──────────
                 market_probs: dict[str, float] = {}
@@ -1250,13 +1403,17 @@ Examples:
                 except Exception:
                     pass  # odds are optional - degrade gracefully
 
+                # Slate-wide ranking kept as a flat float array (index-aligned with
+                # all_top_scorers) so the top-k selection never touches the objects
                 all_top_scorers = []
+                goal_probs = []
                 for game in games[:10]:  # Process up to 10 games
                     try:
                         matchup = await prediction_engine.get_matchup_prediction(
                             db, game["home_team"], game["away_team"], target_date, top_n=10
                         )
                         all_top_scorers.extend(matchup.top_scorers)
+                        goal_probs.extend(pred.prob_goal for pred in matchup.top_scorers)
 
                         predictions_text.append(f"\n### {game['away_team']} @ {game['home_team']}")
                         if game.get("venue"):
@@ -1264,11 +1421,11 @@ Examples:
 
                         predictions_text.append("\n**Top Goal Scorers:**")
                         for i, pred in enumerate(matchup.top_scorers[:5], 1):
-                            prob_pct = int(pred.prob_goal * 100)
+                            prob_pct = round(pred.prob_goal * 100)
                             line = f"{i}. **{pred.player_name}** ({pred.team}) - Model: {prob_pct}%"
                             mkt = market_probs.get(pred.player_name.lower())
                             if mkt:
-                                mkt_pct = int(mkt * 100)
+                                mkt_pct = round(mkt * 100)
                                 edge = prob_pct - mkt_pct
                                 edge_str = f" (+{edge}% edge)" if edge >= 5 else (f" ({edge}% edge)" if edge < -5 else "")
                                 line += f" | Market: {mkt_pct}%{edge_str}"
@@ -1276,12 +1433,14 @@ Examples:
                             if pred.factors:
                                 predictions_text.append(f"   _{pred.factors[0]}_")
                     except Exception as e:
-                        logger.warning("game_prediction_failed", game=game, error=str(e))
+                        # Pass the exception itself; it is only rendered if the event is emitted
+                        logger.warning("game_prediction_failed", game=game, exc_info=e)
                         continue
 
                 # Add overall top scorers across all tonight's games (top 15 for full follow-up coverage)
-                all_top_scorers.sort(key=lambda p: p.prob_goal, reverse=True)
-                if all_top_scorers:
+                top_idx = _top_k_indices(np.asarray(goal_probs, dtype=np.float64), 15)
+                overall_top = [all_top_scorers[i] for i in top_idx]
+                if overall_top:
                     has_odds = bool(market_probs)
                     predictions_text.append("\n### Overall Best Bets Tonight")
                     if has_odds:
@@ -1289,16 +1448,21 @@ Examples:
                             "_Model probability vs live market implied probability. "
                             "Positive edge = model sees more value than the market._\n"
                         )
-                    for i, pred in enumerate(all_top_scorers[:15], 1):
-                        prob_pct = int(pred.prob_goal * 100)
-                        matchup_str = f"vs {pred.opponent}" if pred.is_home else f"@ {pred.opponent}"
-                        line = (
-                            f"{i}. **{pred.player_name}** ({pred.team} {matchup_str}) - "
-                            f"Model: {prob_pct}% | Point: {int(pred.prob_point * 100)}%"
+                    for i, pred in enumerate(overall_top, 1):
+                        name = pred.player_name
+                        opponent = pred.opponent
+                        prob_pct = round(pred.prob_goal * 100)
+                        line = _BEST_BET_LINE(
+                            i=i,
+                            name=name,
+                            team=pred.team,
+                            matchup=("vs " + opponent) if pred.is_home else ("@ " + opponent),
+                            goal=prob_pct,
+                            point=pred.prob_point,
                         )
-                        mkt = market_probs.get(pred.player_name.lower())
+                        mkt = market_probs.get(name.lower())
                         if mkt:
-                            mkt_pct = int(mkt * 100)
+                            mkt_pct = round(mkt * 100)
                             edge = prob_pct - mkt_pct
                             edge_str = f" **Edge: +{edge}%**" if edge >= 5 else (
                                 f" Edge: {edge}%" if edge < -5 else f" Edge: {edge:+d}%"
@@ -1315,58 +1479,61 @@ Examples:
 
     def _format_matchup_prediction(self, prediction) -> str:
         """Format a matchup prediction as readable text."""
-        lines = [
-            f"**{prediction.away_team} @ {prediction.home_team}** - {prediction.game_date.strftime('%B %d, %Y')}"
-        ]
+        # One growing buffer instead of a list of lines joined at the end;
+        # multi-game nights produce many sections per context block.
+        buf = io.StringIO()
+        write = buf.write
+        write(f"**{prediction.away_team} @ {prediction.home_team}** - {_long_date(prediction.game_date)}")
 
         if prediction.venue:
-            lines.append(f"*{prediction.venue}*")
+            write(f"\n*{prediction.venue}*")
 
         # Add matchup context (goalies, pace)
         if prediction.expected_total_goals:
             pace_desc = prediction.pace_rating or "average"
-            lines.append(f"\n**Game Environment:** Expected {prediction.expected_total_goals:.1f} total goals ({pace_desc} pace)")
+            write(f"\n\n**Game Environment:** Expected {prediction.expected_total_goals:.1f} total goals ({pace_desc} pace)")
 
         if prediction.home_goalie or prediction.away_goalie:
-            lines.append("\n**Goalie Matchup:**")
+            write("\n\n**Goalie Matchup:**")
             if prediction.home_goalie:
                 hg = prediction.home_goalie
-                lines.append(f"- {prediction.home_team}: {hg.get('name', 'Unknown')} ({hg.get('save_pct', 0):.3f} SV%, {hg.get('gaa', 0):.2f} GAA)")
+                write(f"\n- {prediction.home_team}: {hg.get('name', 'Unknown')} ({hg.get('save_pct', 0):.3f} SV%, {hg.get('gaa', 0):.2f} GAA)")
             if prediction.away_goalie:
                 ag = prediction.away_goalie
-                lines.append(f"- {prediction.away_team}: {ag.get('name', 'Unknown')} ({ag.get('save_pct', 0):.3f} SV%, {ag.get('gaa', 0):.2f} GAA)")
+                write(f"\n- {prediction.away_team}: {ag.get('name', 'Unknown')} ({ag.get('save_pct', 0):.3f} SV%, {ag.get('gaa', 0):.2f} GAA)")
 
-        lines.append("\n**Most Likely Scorers:**")
+        write("\n\n**Most Likely Scorers:**")
         for i, pred in enumerate(prediction.top_scorers[:10], 1):
-            prob_pct = int(pred.prob_goal * 100)
-            point_pct = int(pred.prob_point * 100)
-            lines.append(
-                f"{i}. **{pred.player_name}** ({pred.team}) - "
-                f"{prob_pct}% goal probability, {point_pct}% point probability"
-            )
-            lines.append(f"   Expected: {pred.expected_goals:.2f}G, {pred.expected_assists:.2f}A, {pred.expected_points:.2f}P")
-            if pred.factors:
-                lines.append(f"   _{' | '.join(pred.factors[:2])}_")
-            lines.append(f"   Confidence: {pred.confidence} ({int(pred.confidence_score * 100)}%)")
+            write("\n")
+            write(_TOP_SCORER_LINE(
+                i=i,
+                name=pred.player_name,
+                team=pred.team,
+                goal=pred.prob_goal,
+                point=pred.prob_point,
+            ))
+            write("\n")
+            write(_EXPECTED_LINE(g=pred.expected_goals, a=pred.expected_assists, p=pred.expected_points))
+            if pred.factors_summary:
+                write(f"\n   _{pred.factors_summary}_")
+            write("\n")
+            write(_CONFIDENCE_LINE(label=pred.confidence, pct=pred.confidence_score))
 
         # Add team breakdowns
-        lines.append(f"\n**{prediction.home_team} (Home) Key Players:**")
-        for pred in prediction.home_players[:3]:
-            prob_pct = int(pred.prob_goal * 100)
-            goalie_note = ""
-            if pred.opponent_goalie:
-                goalie_note = f" (vs {pred.opponent_goalie})"
-            lines.append(f"- {pred.player_name}: {prob_pct}% goal, {pred.expected_points:.2f} expected points{goalie_note}")
-
-        lines.append(f"\n**{prediction.away_team} (Away) Key Players:**")
-        for pred in prediction.away_players[:3]:
-            prob_pct = int(pred.prob_goal * 100)
-            goalie_note = ""
-            if pred.opponent_goalie:
-                goalie_note = f" (vs {pred.opponent_goalie})"
-            lines.append(f"- {pred.player_name}: {prob_pct}% goal, {pred.expected_points:.2f} expected points{goalie_note}")
+        for team, label, players in (
+            (prediction.home_team, "Home", prediction.home_players),
+            (prediction.away_team, "Away", prediction.away_players),
+        ):
+            write(f"\n\n**{team} ({label}) Key Players:**")
+            for pred in players[:3]:
+                goalie_note = f" (vs {pred.opponent_goalie})" if pred.opponent_goalie else ""
+                write(f"\n- {pred.player_name}: {pred.prob_goal:.0%} goal, {pred.expected_points:.2f} expected points{goalie_note}")
 
-        return "\n".join(lines)
+        return buf.getvalue()
+
+    def _format_matchups_batch(self, predictions: list) -> str:
+        """Format several matchup predictions as one context block."""
+        return "\n\n---\n\n".join(map(self._format_matchup_prediction, predictions))
 
     async def _fetch_trade_suggestions(
         self,
@@ -2390,20 +2557,19 @@ Examples:
                     except Exception:
                         continue
 
-                all_scorers.sort(key=lambda p: p.prob_goal, reverse=True)
-                top_picks = all_scorers[:5]
+                top_picks = heapq.nlargest(5, all_scorers, key=attrgetter("prob_goal"))
 
                 if top_picks:
                     sections.append("\n### Top Scoring Picks Tonight")
                     for i, pred in enumerate(top_picks, 1):
-                        model_pct = int(pred.prob_goal * 100)
+                        model_pct = round(pred.prob_goal * 100)
                         matchup_str = f"vs {pred.opponent}" if pred.is_home else f"@ {pred.opponent}"
                         line = f"{i}. **{pred.player_name}** ({pred.team} {matchup_str}) - Model: **{model_pct}%**"
 
                         # Attach market odds if available
                         mkt = market_probs.get(pred.player_name.lower())
                         if mkt:
-                            mkt_pct = int(mkt * 100)
+                            mkt_pct = round(mkt * 100)
                             edge_pct = model_pct - mkt_pct
                             edge_tag = f" (+{edge_pct}% edge)" if edge_pct >= 5 else ""
                             line += f" | Market: {mkt_pct}%{edge_tag}"
@@ -2424,7 +2590,7 @@ Examples:
                 sections.append("\n### 💰 Best Bets Tonight")
                 for edge in top_edges:
                     grade = edge.edge_grade
-                    model_pct = int(edge.prob_goal * 100)
+                    model_pct = round(edge.prob_goal * 100)
                     sections.append(
                         f"- **{edge.player_name}** ({edge.team} vs {edge.opponent}) "
                         f"Grade: **{grade}** | {model_pct}% goal | {edge.suggested_bet}"
@@ -2654,59 +2820,7 @@ Examples:
 
     def _normalize_teams(self, teams: list[str]) -> list[str]:
         """Convert team names to abbreviations."""
-        team_mapping = {
-            "toronto": "TOR", "maple leafs": "TOR", "leafs": "TOR",
-            "montreal": "MTL", "canadiens": "MTL", "habs": "MTL",
-            "ottawa": "OTT", "senators": "OTT", "sens": "OTT",
-            "boston": "BOS", "bruins": "BOS",
-            "buffalo": "BUF", "sabres": "BUF",
-            "detroit": "DET", "red wings": "DET",
-            "florida": "FLA", "panthers": "FLA",
-            "tampa": "TBL", "tampa bay": "TBL", "lightning": "TBL",
-            "carolina": "CAR", "hurricanes": "CAR", "canes": "CAR",
-            "new jersey": "NJD", "devils": "NJD",
-            "rangers": "NYR", "new york rangers": "NYR",
-            "islanders": "NYI", "new york islanders": "NYI",
-            "philadelphia": "PHI", "flyers": "PHI",
-            "pittsburgh": "PIT", "penguins": "PIT", "pens": "PIT",
-            "washington": "WSH", "capitals": "WSH", "caps": "WSH",
-            "columbus": "CBJ", "blue jackets": "CBJ",
-            "chicago": "CHI", "blackhawks": "CHI", "hawks": "CHI",
-            "colorado": "COL", "avalanche": "COL", "avs": "COL",
-            "dallas": "DAL", "stars": "DAL",
-            "minnesota": "MIN", "wild": "MIN",
-            "nashville": "NSH", "predators": "NSH", "preds": "NSH",
-            "st louis": "STL", "st. louis": "STL", "blues": "STL",
-            "winnipeg": "WPG", "jets": "WPG",
-            "arizona": "ARI", "coyotes": "ARI",
-            "utah": "UTA", "utah hockey club": "UTA",
-            "anaheim": "ANA", "ducks": "ANA",
-            "calgary": "CGY", "flames": "CGY",
-            "edmonton": "EDM", "oilers": "EDM",
-            "los angeles": "LAK", "kings": "LAK",
-            "san jose": "SJS", "sharks": "SJS",
-            "seattle": "SEA", "kraken": "SEA",
-            "vancouver": "VAN", "canucks": "VAN",
-            "vegas": "VGK", "golden knights": "VGK", "knights": "VGK",
-        }
-
-        result = []
-        for team in teams:
-            if not team:
-                continue
-            team_lower = team.lower().strip()
-            if team_lower in team_mapping:
-                result.append(team_mapping[team_lower])
-            elif len(team) == 3:
-                result.append(team.upper())
-            else:
-                # Try partial matching
-                for key, abbrev in team_mapping.items():
-                    if key in team_lower or team_lower in key:
-                        result.append(abbrev)
-                        break
-
-        return result
+        return [abbrev for abbrev in map(_normalize_team, filter(None, teams)) if abbrev is not None]
 
     async def _generate_response(
         self,
@@ -2716,6 +2830,44 @@ Examples:
         images: list[dict] | None = None,
     ) -> str:
         """Generate the final response using Claude (with optional vision)."""
+        # Identical query + context + history (UI repeats, retries) reuses the last answer.
+        # Image attachments are not cached.
+        cache_key = None
+        if not images:
+            history = json.dumps(conversation_history[-10:]) if conversation_history else ""
+            cache_key = hashlib.blake2b(
+                f"{query}\0{context}\0{history}".encode(), digest_size=16
+            ).digest()
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                self._response_cache.move_to_end(cache_key)
+                logger.info("response_cache_hit", query=query[:50])
+                return cached
+
+        chunks = [
+            chunk async for chunk in self._stream_response(query, context, conversation_history, images)
+        ]
+
+        # Safely handle an empty response
+        if not chunks:
+            logger.error("empty_response_content")
+            return NO_RESPONSE_MESSAGE
+
+        response_text = "".join(chunks)
+        if cache_key is not None:
+            self._response_cache[cache_key] = response_text
+            if len(self._response_cache) > _RESPONSE_CACHE_MAX:
+                self._response_cache.popitem(last=False)
+        return response_text
+
+    async def _stream_response(
+        self,
+        query: str,
+        context: str,
+        conversation_history: list[dict] | None = None,
+        images: list[dict] | None = None,
+    ) -> AsyncIterator[str]:
+        """Stream the final response text from Claude as it is generated."""
         # Build message list with conversation history for context
         messages = []
 
@@ -2727,28 +2879,8 @@ Examples:
                     "content": msg["content"],
                 })
 
-        # Build the user message text
-        user_text = f"""Context from database and knowledge base:
-
-{context}
-
----
-
-User question: {query}
-
-Provide a helpful, accurate response based on the context above.
-
-IMPORTANT:
-- Base your answer ONLY on the context provided above. Do not say you don't have access to data if it's in the context.
-- If the context contains scoring predictions, present them clearly with percentages and player names.
-- The "Overall Best Bets Tonight" list contains up to 15 ranked players. If a follow-up asks for more picks, draw from players further down that list (e.g., ranks 4-6 for "give me three more").
-- If this is a follow-up question referencing previous conversation (e.g., "tell me more", "what about that"), use the conversation history above for context.
-- If the user attached an image, analyze it in the context of the hockey question asked.
-- Always end your response with a "Sources:" section listing where the data came from, formatted as:
-
-Sources:
-- PowerplAI Scoring Model (NHL API game logs, recent form analysis)
-- [Any other sources from the context]"""
+        # Build the user message text around the static prompt scaffolding
+        user_text = "".join((_PROMPT_PREFIX, context, _PROMPT_MIDDLE, query, _PROMPT_SUFFIX))
 
         # Build the user message content - include images if provided (Claude vision)
         if images:
@@ -2770,19 +2902,14 @@ Sources:
         else:
             messages.append({"role": "user", "content": user_text})
 
-        message = self.client.messages.create(
+        async with self.client.messages.stream(
             model="claude-sonnet-4-20250514",
             max_tokens=1500,
             system=SYSTEM_PROMPT,
             messages=messages,
-        )
-
-        # Safely access response content
-        if not message.content or len(message.content) == 0:
-            logger.error("empty_response_content")
-            return "I apologize, but I wasn't able to generate a response. Please try again."
-
-        return message.content[0].text
+        ) as stream:
+            async for text_chunk in stream.text_stream:
+                yield text_chunk
 
 
 # Singleton instance
@@ -31,14 +31,40 @@ Confidence Scoring:
 
 For evaluation metrics and calibration, see model_evaluation.py
 """
-from dataclasses import dataclass
+import asyncio
+import heapq
+import time
+from collections import Counter, OrderedDict, defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from datetime import date, timedelta
+from operator import attrgetter
 from typing import Any
+import numpy as np
 import structlog
 
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.src.agents.playoffs import get_player_playoff_experience
+
+# Goalie/pace context lives in the ingestion package, which pulls in httpx;
+# degrade to default context if it can't be imported.
+try:
+    from backend.src.ingestion.team_goalie_stats import (
+        get_matchup_context as fetch_context,
+        get_matchup_contexts as fetch_contexts,
+    )
+except ImportError:
+    fetch_context = None
+    fetch_contexts = None
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
+
 logger = structlog.get_logger()
 
 
@@ -65,18 +91,266 @@ PLAYOFF_WEIGHTS = {
     "playoff_experience": 0.25,  # career playoff PPG, scaled by sample depth
 }
 
+
+
+def _weight_arrays(weights: dict[str, float]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Precompute a weight set for the scoring kernel.
+
+    Returns (component weights for recent/season/h2h/playoff, the weight sum
+    for each of the 16 component-presence bitmasks, adjustment weights for
+    home/away/goalie/pace).
+    """
+    component = np.array([
+        weights["recent_form"],
+        weights["season_baseline"],
+        weights["h2h_history"],
+        weights.get("playoff_experience", 0.0),
+    ])
+    bits = np.arange(16)[:, None] >> np.arange(4) & 1
+    norms = bits @ component
+    norms[0] = 1.0  # no components available: leave the (zero) sum unscaled
+    adjustment = np.array([weights["home_away"], weights["goalie_matchup"], weights["team_pace"]])
+    return component, norms, adjustment
+
+
+# Kernel-ready weights, keyed by is_playoff
+_WEIGHT_ARRAYS = {False: _weight_arrays(WEIGHTS), True: _weight_arrays(PLAYOFF_WEIGHTS)}
+_PRESENCE_BITS = np.array([1, 2, 4, 8])
+
+
+# SQL statements, compiled once at import
+_Q_TONIGHT_GAMES = text("""
+    SELECT home_team_abbrev, away_team_abbrev, start_time_utc
+    FROM games
+    WHERE game_date = :today
+      AND game_state NOT IN ('OFF', 'FINAL', 'CRIT')
+    ORDER BY start_time_utc
+""")
+
+_Q_FIND_PLAYER = text("""
+    SELECT p.id, p.name, s.team_abbrev
+    FROM players p
+    JOIN player_season_stats s ON p.id = s.player_id
+    WHERE p.name ILIKE :name
+    ORDER BY s.season DESC
+    LIMIT 1
+""")
+
+_Q_GAME_INFO = text("""
+    SELECT nhl_game_id, venue, start_time_utc, game_type
+    FROM games
+    WHERE home_team_abbrev = :home_team
+      AND away_team_abbrev = :away_team
+      AND game_date = :game_date
+    LIMIT 1
+""")
+
+_Q_GAME_INFOS = text("""
+    SELECT home_team_abbrev, away_team_abbrev, nhl_game_id, venue, start_time_utc, game_type
+    FROM games
+    WHERE game_date = :game_date
+      AND home_team_abbrev = ANY(:home_teams)
+""")
+
+_Q_CURRENT_SEASON = text("SELECT MAX(season) FROM player_season_stats")
+
+# Per-team top-N players with every aggregate the model needs, one row per
+# player. {tops_cte} picks the players (one team, or many via the batch
+# variant), {opponent} is the h2h opponent expression and {recent_ctes}
+# supplies the last-N-games "recent" CTE.
+_TEAM_PLAYER_STATS_SQL = """
+    WITH {tops_cte}
+{recent_ctes}    season AS (
+        SELECT DISTINCT ON (s.player_id)
+            s.player_id, s.games_played, s.goals, s.points, s.xg
+        FROM player_season_stats s
+        JOIN tops t ON t.id = s.player_id
+        ORDER BY s.player_id, s.season DESC
+    ),
+    logs AS (
+        SELECT
+            gl.player_id,
+            COUNT(*) FILTER (WHERE gl.opponent = {opponent}) as h2h_games,
+            COALESCE(SUM(gl.goals) FILTER (WHERE gl.opponent = {opponent}), 0) as h2h_goals,
+            COALESCE(SUM(gl.points) FILTER (WHERE gl.opponent = {opponent}), 0) as h2h_points,
+            COUNT(*) FILTER (WHERE gl.home_away = 'home') as home_games,
+            COALESCE(SUM(gl.points) FILTER (WHERE gl.home_away = 'home'), 0) as home_points,
+            COUNT(*) FILTER (WHERE gl.home_away = 'away') as away_games,
+            COALESCE(SUM(gl.points) FILTER (WHERE gl.home_away = 'away'), 0) as away_points
+        FROM game_logs gl
+        JOIN tops t ON t.id = gl.player_id
+        GROUP BY gl.player_id
+    )
+    SELECT
+        t.team, t.id, t.name,
+        r.games as recent_games, r.goals as recent_goals,
+        r.points as recent_points, r.avg_shots as recent_avg_shots,
+        se.games_played as season_games, se.goals as season_goals,
+        se.points as season_points, se.xg as season_xg,
+        l.h2h_games, l.h2h_goals, l.h2h_points,
+        l.home_games, l.home_points, l.away_games, l.away_points
+    FROM tops t
+    LEFT JOIN recent r ON r.player_id = t.id
+    LEFT JOIN season se ON se.player_id = t.id
+    LEFT JOIN logs l ON l.player_id = t.id
+    ORDER BY t.points DESC
+"""
+
+_RECENT_FORM_WINDOW_CTES = """    ranked AS (
+        -- Last-N window per player in one ordered pass over
+        -- idx_game_logs_player_date instead of a sort+limit per player
+        SELECT
+            gl.player_id, gl.goals, gl.points, gl.shots,
+            ROW_NUMBER() OVER (PARTITION BY gl.player_id ORDER BY gl.game_date DESC) as rn
+        FROM game_logs gl
+        JOIN tops t ON t.id = gl.player_id
+        WHERE gl.game_date < :before_date
+    ),
+    recent AS (
+        SELECT
+            player_id,
+            COUNT(*) as games,
+            COALESCE(SUM(goals), 0) as goals,
+            COALESCE(SUM(points), 0) as points,
+            COALESCE(AVG(shots), 0) as avg_shots
+        FROM ranked
+        WHERE rn <= :n_games
+        GROUP BY player_id
+    ),
+"""
+
+# player_recent_form is a materialized view of each player's last 5 games
+# before the day it was refreshed (see db/migrations.py); it stands in for
+# the window when predicting today's games, but only if it was refreshed
+# today (matview_refreshes), since it freezes CURRENT_DATE at refresh time.
+_RECENT_FORM_VIEW_CTES = """    recent AS (
+        SELECT r.player_id, r.games, r.goals, r.points, r.avg_shots
+        FROM player_recent_form r
+        JOIN tops t ON t.id = r.player_id
+    ),
+"""
+
+_Q_RECENT_FORM_VIEW_DAY = text(
+    "SELECT refreshed_on FROM matview_refreshes WHERE view_name = 'player_recent_form'"
+)
+
+_TEAM_TOPS_CTE = """tops AS (
+        SELECT p.id, p.name, s.points, s.team_abbrev as team
+        FROM players p
+        JOIN player_season_stats s ON p.id = s.player_id
+        WHERE s.team_abbrev = :team AND s.season = :season
+        ORDER BY s.points DESC
+        LIMIT :limit
+    ),"""
+
+# Top-N per team for many (team, opponent) sides at once, passed as
+# parallel :teams / :opponents arrays. Each team may appear only once
+# (get_matchup_predictions_batch predicts split-squad games separately).
+_TEAMS_TOPS_CTE = """sides AS (
+        SELECT * FROM unnest(CAST(:teams AS text[]), CAST(:opponents AS text[])) AS m(team, opponent)
+    ),
+    tops AS (
+        SELECT id, name, points, team, opponent
+        FROM (
+            SELECT
+                p.id, p.name, s.points, m.team, m.opponent,
+                ROW_NUMBER() OVER (PARTITION BY m.team ORDER BY s.points DESC) as rn
+            FROM sides m
+            JOIN player_season_stats s ON s.team_abbrev = m.team AND s.season = :season
+            JOIN players p ON p.id = s.player_id
+        ) ranked_tops
+        WHERE rn <= :limit
+    ),"""
+
+
+def _team_player_stats_query(batch: bool, today: bool):
+    """Build one variant of the team player stats query."""
+    return text(_TEAM_PLAYER_STATS_SQL.format(
+        tops_cte=_TEAMS_TOPS_CTE if batch else _TEAM_TOPS_CTE,
+        opponent="t.opponent" if batch else ":opponent",
+        recent_ctes=_RECENT_FORM_VIEW_CTES if today else _RECENT_FORM_WINDOW_CTES,
+    ))
+
+
+_Q_TEAM_PLAYER_STATS = _team_player_stats_query(batch=False, today=False)
+_Q_TEAM_PLAYER_STATS_TODAY = _team_player_stats_query(batch=False, today=True)
+_Q_TEAMS_PLAYER_STATS = _team_player_stats_query(batch=True, today=False)
+_Q_TEAMS_PLAYER_STATS_TODAY = _team_player_stats_query(batch=True, today=True)
+
+_Q_RECENT_FORM = text("""
+    SELECT
+        COUNT(*) as games,
+        COALESCE(SUM(goals), 0) as goals,
+        COALESCE(SUM(assists), 0) as assists,
+        COALESCE(SUM(points), 0) as points,
+        COALESCE(AVG(shots), 0) as avg_shots
+    FROM (
+        SELECT goals, assists, points, shots
+        FROM game_logs
+        WHERE player_id = :player_id
+          AND game_date < :before_date
+        ORDER BY game_date DESC
+        LIMIT :n_games
+    ) recent_games
+""")
+
+_Q_SEASON_STATS = text("""
+    SELECT games_played, goals, assists, points, xg
+    FROM player_season_stats
+    WHERE player_id = :player_id
+    ORDER BY season DESC
+    LIMIT 1
+""")
+
+_Q_H2H_STATS = text("""
+    SELECT
+        COUNT(*) as games,
+        COALESCE(SUM(goals), 0) as goals,
+        COALESCE(SUM(assists), 0) as assists,
+        COALESCE(SUM(points), 0) as points
+    FROM game_logs
+    WHERE player_id = :player_id AND opponent = :opponent
+""")
+
+_Q_HOME_AWAY_STATS = text("""
+    SELECT
+        home_away,
+        COUNT(*) as games,
+        COALESCE(SUM(points), 0) as points
+    FROM game_logs
+    WHERE player_id = :player_id
+    GROUP BY home_away
+""")
+
 # Minimum sample sizes for reliable predictions
 MIN_GAMES_RECENT = 3
 MIN_GAMES_SEASON = 10
 MIN_GAMES_H2H = 3
 
+# In-process cache lifetimes (seconds) for per-day lookups shared across requests
+MATCHUP_CONTEXT_TTL = 300
+CURRENT_SEASON_TTL = 300
+# Matchup contexts kept at once; ~16 games a night, so this is several days' worth
+MATCHUP_CONTEXT_CACHE_SIZE = 256
+
+# Neutral matchup context used when goalie/pace data is unavailable.
+# Shared across calls; treat as read-only.
+DEFAULT_MATCHUP_CONTEXT = {
+    "home_goalie": None,
+    "away_goalie": None,
+    "expected_total_goals": 6.0,
+    "home_expected_goals": 3.0,
+    "away_expected_goals": 3.0,
+}
+
 # League averages for normalization
 LEAGUE_AVG_SAVE_PCT = 0.905
 LEAGUE_AVG_GAA = 3.00
 LEAGUE_AVG_GOALS_PER_GAME = 3.10  # Per team
 
 
-@dataclass
+@dataclass(slots=True)
 class PlayerPrediction:
     """Prediction for a single player in a game."""
     player_name: str
@@ -120,8 +394,14 @@ class PlayerPrediction:
     playoff_ppg: float = 0.0              # Career playoff points-per-game
     playoff_multiplier: float = 1.0       # Multiplier derived from experience
 
+    # Top two factors pre-joined for display (derived, not passed in)
+    factors_summary: str = field(init=False, default="")
+
+    def __post_init__(self):
+        self.factors_summary = " | ".join(self.factors[:2])
+
 
-@dataclass
+@dataclass(slots=True)
 class MatchupPrediction:
     """Prediction for a full game matchup."""
     game_id: int | None
@@ -146,6 +426,34 @@ class MatchupPrediction:
     is_playoff: bool = False
 
 
+@dataclass(slots=True)
+class _ScoringInputs:
+    """Per-player model inputs gathered before the (batched) scoring step."""
+    player_id: int
+    player_name: str
+    team: str
+    opponent: str
+    is_home: bool
+    is_playoff: bool
+
+    # (recent, season, h2h, playoff) PPG components; None where unavailable
+    components: tuple[float | None, float | None, float | None, float | None]
+    home_away_adjustment: float
+    goalie_adjustment: float
+    pace_adjustment: float
+    playoff_multiplier: float
+    goal_ratio: float
+
+    recent: dict
+    season: dict
+    h2h: dict
+    opponent_goalie_name: str | None
+    opponent_goalie_sv_pct: float | None
+    playoff_games: int
+    playoff_ppg: float
+    factors: list[str]
+
+
 class PredictionEngine:
     """Engine for calculating player and game predictions."""
 
@@ -158,6 +466,41 @@ class PredictionEngine:
                 Otherwise, db must be passed to each method.
         """
         self._db = db
+        # (home, away, day) -> (expires_at, context), least recently used first;
+        # season -> (expires_at, season)
+        self._ctx_cache: OrderedDict[tuple, tuple[float, dict]] = OrderedDict()
+        self._season_cache: tuple[float, str] | None = None
+        self._recent_form_view_day: date | None = None
+        # One lock per cache key being filled so concurrent misses issue a single fetch
+        self._locks: defaultdict[Any, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    def invalidate_matchup_contexts(self) -> None:
+        """Forget cached matchup contexts, e.g. after team/goalie stats are refreshed."""
+        self._ctx_cache.clear()
+
+    def _cache_context(self, key: tuple, expires_at: float, context: dict) -> None:
+        """Store a matchup context, evicting expired and then least recently used entries."""
+        self._ctx_cache[key] = (expires_at, context)
+        self._ctx_cache.move_to_end(key)
+        if len(self._ctx_cache) <= MATCHUP_CONTEXT_CACHE_SIZE:
+            return
+        now = time.monotonic()
+        for stale in [k for k, (expires, _) in self._ctx_cache.items() if expires <= now]:
+            del self._ctx_cache[stale]
+        while len(self._ctx_cache) > MATCHUP_CONTEXT_CACHE_SIZE:
+            self._ctx_cache.popitem(last=False)
+
+    @asynccontextmanager
+    async def _fill_lock(self, key):
+        """Hold key's lock for one cache fill; the lock is dropped once the fill is done."""
+        lock = self._locks[key]
+        try:
+            async with lock:
+                yield
+        finally:
+            # Waiters keep their reference and re-check the cache once they acquire it
+            if self._locks.get(key) is lock:
+                del self._locks[key]
 
     async def predict_tonight(self) -> list["MatchupPrediction"]:
         """
@@ -169,17 +512,10 @@ class PredictionEngine:
             raise ValueError("Database session required. Initialize with PredictionEngine(db)")
 
         # Get today's games
-        from datetime import date
         today = date.today()
 
         result = await self._db.execute(
-            text("""
-                SELECT home_team_abbrev, away_team_abbrev, start_time_utc
-                FROM games
-                WHERE game_date = :today
-                  AND game_state NOT IN ('OFF', 'FINAL', 'CRIT')
-                ORDER BY start_time_utc
-            """),
+            _Q_TONIGHT_GAMES,
             {"today": today}
         )
 
@@ -188,26 +524,29 @@ class PredictionEngine:
         if not games:
             return []
 
-        matchups = []
-        for game in games:
+        matchups = [(home_team, away_team) for home_team, away_team, _start_time in games]
+        try:
+            return await self.get_matchup_predictions_batch(self._db, matchups, today)
+        except Exception as e:
+            # One bad matchup shouldn't cost the whole slate: retry game by game
+            logger.warning("batch_matchup_prediction_failed", error=str(e))
+            await self._db.rollback()
+
+        predictions = []
+        for home_team, away_team in matchups:
             try:
-                prediction = await self.get_matchup_prediction(
-                    self._db,
-                    game.home_team_abbrev,
-                    game.away_team_abbrev,
-                    today,
-                )
-                matchups.append(prediction)
+                predictions.append(await self.get_matchup_prediction(
+                    self._db, home_team, away_team, today,
+                ))
             except Exception as e:
                 logger.warning(
                     "matchup_prediction_failed",
-                    home=game.home_team_abbrev,
-                    away=game.away_team_abbrev,
+                    home=home_team,
+                    away=away_team,
                     error=str(e)
                 )
-                continue
-
-        return matchups
+                await self._db.rollback()
+        return predictions
 
     async def get_matchup_prediction(
         self,
@@ -240,52 +579,125 @@ class PredictionEngine:
         if is_playoff is None:
             is_playoff = bool(game_info and game_info.get("game_type") == 3)
 
+        # Season is constant for the whole matchup; resolve it once
+        current_season = await self._get_current_season(db)
+
         # Get matchup context (goalies, pace, etc.)
-        matchup_context = await self._get_matchup_context(db, home_team, away_team)
+        matchup_context = await self._get_matchup_context(
+            db, home_team, away_team, current_season=current_season,
+        )
 
-        # Get predictions for home team players (playing against away goalie)
-        home_players = await self._get_team_predictions(
-            db, home_team, away_team, is_home=True, game_date=game_date,
-            limit=top_n, matchup_context=matchup_context, is_playoff=is_playoff,
+        # Home players face the away goalie and vice versa. The two sides are
+        # independent, so run them concurrently on their own sessions.
+        home_players, away_players = await asyncio.gather(
+            _on_own_session(
+                db, self._get_team_predictions, home_team, away_team, is_home=True,
+                game_date=game_date, limit=top_n, matchup_context=matchup_context,
+                is_playoff=is_playoff, current_season=current_season,
+            ),
+            _on_own_session(
+                db, self._get_team_predictions, away_team, home_team, is_home=False,
+                game_date=game_date, limit=top_n, matchup_context=matchup_context,
+                is_playoff=is_playoff, current_season=current_season,
+            ),
         )
 
-        # Get predictions for away team players (playing against home goalie)
-        away_players = await self._get_team_predictions(
-            db, away_team, home_team, is_home=False, game_date=game_date,
-            limit=top_n, matchup_context=matchup_context, is_playoff=is_playoff,
+        return _build_matchup_prediction(
+            home_team, away_team, game_date, game_info, matchup_context,
+            home_players, away_players, is_playoff,
         )
 
-        # Combine and rank by goal probability
-        all_players = home_players + away_players
-        top_scorers = sorted(all_players, key=lambda p: p.prob_goal, reverse=True)[:15]
+    async def get_matchup_predictions_batch(
+        self,
+        db: AsyncSession,
+        matchups: list[tuple[str, str]],
+        game_date: date | None = None,
+        top_n: int = 10,
+    ) -> list[MatchupPrediction]:
+        """
+        Get predictions for several (home, away) matchups on the same date.
+
+        Same results as get_matchup_prediction per pair (in the same order),
+        but game info, goalie/pace context and every team's player stats are
+        each fetched for all matchups in one roundtrip instead of per game.
+        """
+        if game_date is None:
+            game_date = date.today()
 
-        # Determine pace rating
-        expected_total = matchup_context.get("expected_total_goals", 6.0)
-        if expected_total >= 6.5:
-            pace_rating = "high"
-        elif expected_total <= 5.5:
-            pace_rating = "low"
+        if not matchups:
+            return []
+        unique = list(dict.fromkeys(matchups))
+        # The batch query ranks and keys player rows by team, so it needs each
+        # team to play once. Split-squad days (one team in two games) predict
+        # those games one at a time instead.
+        appearances = Counter(team for pair in unique for team in pair)
+        predictions = {}
+        for home_team, away_team in unique:
+            if appearances[home_team] > 1 or appearances[away_team] > 1:
+                predictions[(home_team, away_team)] = await self.get_matchup_prediction(
+                    db, home_team, away_team, game_date, top_n=top_n,
+                )
+        unique = [pair for pair in unique if pair not in predictions]
+        if not unique:
+            return [predictions[pair] for pair in matchups]
+
+        current_season = await self._get_current_season(db)
+        game_infos = await self._get_game_infos(db, unique, game_date)
+        contexts = await self._get_matchup_contexts(db, unique, current_season)
+
+        sides = unique + [(away, home) for home, away in unique]
+        params = {
+            "teams": [team for team, _ in sides],
+            "opponents": [opponent for _, opponent in sides],
+            "season": current_season,
+            "limit": top_n,
+        }
+        if game_date == date.today() and await self._recent_form_view_current(db):
+            result = await db.execute(_Q_TEAMS_PLAYER_STATS_TODAY, params)
         else:
-            pace_rating = "average"
-
-        return MatchupPrediction(
-            game_id=game_info.get("game_id") if game_info else None,
-            game_date=game_date,
-            home_team=home_team,
-            away_team=away_team,
-            venue=game_info.get("venue") if game_info else None,
-            start_time=game_info.get("start_time") if game_info else None,
-            home_players=home_players,
-            away_players=away_players,
-            top_scorers=top_scorers,
-            expected_total_goals=matchup_context.get("expected_total_goals"),
-            home_expected_goals=matchup_context.get("home_expected_goals"),
-            away_expected_goals=matchup_context.get("away_expected_goals"),
-            home_goalie=matchup_context.get("home_goalie"),
-            away_goalie=matchup_context.get("away_goalie"),
-            pace_rating=pace_rating,
-            is_playoff=is_playoff,
-        )
+            result = await db.execute(
+                _Q_TEAMS_PLAYER_STATS, {**params, "before_date": game_date, "n_games": 5}
+            )
+        rows_by_team = defaultdict(list)
+        for row in result.all():
+            rows_by_team[row[0]].append(row)
+
+        # Every side's inputs first, so the whole slate is scored in one
+        # kernel call (per weight set) rather than one call per side
+        side_inputs = []
+        for home_team, away_team in unique:
+            game_info = game_infos.get((home_team, away_team))
+            is_playoff = bool(game_info and game_info.get("game_type") == 3)
+            matchup_context = contexts[(home_team, away_team)]
+            for team, opponent, is_home in ((home_team, away_team, True), (away_team, home_team, False)):
+                side_inputs.append(await self._prepare_team_inputs(
+                    db, rows_by_team[team], team, opponent, is_home,
+                    game_date, matchup_context, is_playoff,
+                ))
+
+        side_scores = [None] * len(side_inputs)
+        for is_playoff in (False, True):
+            group = [i for i, (inputs, _) in enumerate(side_inputs) if inputs and inputs[0].is_playoff == is_playoff]
+            scores = iter(await _score_inputs([inp for i in group for inp in side_inputs[i][0]]))
+            for i in group:
+                side_scores[i] = [next(scores) for _ in side_inputs[i][0]]
+
+        side_players = [
+            [
+                _build_player_prediction(inp, *score, both_goalies=both_goalies)
+                for inp, score in zip(inputs, scores or ())
+            ]
+            for (inputs, both_goalies), scores in zip(side_inputs, side_scores)
+        ]
+
+        for n, (home_team, away_team) in enumerate(unique):
+            game_info = game_infos.get((home_team, away_team))
+            predictions[(home_team, away_team)] = _build_matchup_prediction(
+                home_team, away_team, game_date, game_info, contexts[(home_team, away_team)],
+                side_players[2 * n], side_players[2 * n + 1],
+                bool(game_info and game_info.get("game_type") == 3),
+            )
+        return [predictions[pair] for pair in matchups]
 
     async def get_player_prediction(
         self,
@@ -312,21 +724,14 @@ class PredictionEngine:
 
         # Find player
         result = await db.execute(
-            text("""
-                SELECT p.id, p.name, s.team_abbrev
-                FROM players p
-                JOIN player_season_stats s ON p.id = s.player_id
-                WHERE p.name ILIKE :name
-                ORDER BY s.season DESC
-                LIMIT 1
-            """),
+            _Q_FIND_PLAYER,
             {"name": f"%{player_name}%"}
         )
         row = result.fetchone()
         if not row:
             return None
 
-        player_id, name, team = row.id, row.name, row.team_abbrev
+        player_id, name, team = row
 
         # Get matchup context for goalie/pace adjustments
         home_team = team if is_home else opponent
@@ -347,31 +752,36 @@ class PredictionEngine:
     ) -> dict | None:
         """Get game info from database if available."""
         result = await db.execute(
-            text("""
-                SELECT nhl_game_id, venue, start_time_utc, game_type
-                FROM games
-                WHERE home_team_abbrev = :home_team
-                  AND away_team_abbrev = :away_team
-                  AND game_date = :game_date
-                LIMIT 1
-            """),
+            _Q_GAME_INFO,
             {"home_team": home_team, "away_team": away_team, "game_date": game_date}
         )
         row = result.fetchone()
-        if row:
-            return {
-                "game_id": row.nhl_game_id,
-                "venue": row.venue,
-                "start_time": row.start_time_utc.isoformat() if row.start_time_utc else None,
-                "game_type": row.game_type,
-            }
-        return None
+        return _game_info(*row) if row else None
+
+    async def _get_game_infos(
+        self,
+        db: AsyncSession,
+        matchups: list[tuple[str, str]],
+        game_date: date,
+    ) -> dict[tuple[str, str], dict]:
+        """Game info for each (home, away) pair found on game_date."""
+        result = await db.execute(
+            _Q_GAME_INFOS,
+            {"game_date": game_date, "home_teams": [home for home, _ in matchups]}
+        )
+        wanted = set(matchups)
+        infos = {}
+        for home_team, away_team, *row in result.all():
+            if (home_team, away_team) in wanted:
+                infos.setdefault((home_team, away_team), _game_info(*row))
+        return infos
 
     async def _get_matchup_context(
         self,
         db: AsyncSession,
         home_team: str,
         away_team: str,
+        current_season: str | None = None,
     ) -> dict:
         """
         Get enhanced matchup context including goalie and pace data.
@@ -382,36 +792,112 @@ class PredictionEngine:
         - expected_total_goals: Expected total goals in game
         - home_expected_goals: Home team expected goals
         - away_expected_goals: Away team expected goals
+
+        Results are cached per matchup and day for MATCHUP_CONTEXT_TTL seconds.
         """
-        try:
-            from backend.src.ingestion.team_goalie_stats import get_matchup_context as fetch_context
+        if fetch_context is None:
+            return DEFAULT_MATCHUP_CONTEXT
+
+        key = (home_team, away_team, date.today().isoformat())
+        cached = self._ctx_cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            self._ctx_cache.move_to_end(key)
+            return cached[1]
+
+        async with self._fill_lock(key):
+            cached = self._ctx_cache.get(key)
+            if cached and cached[0] > time.monotonic():
+                return cached[1]
+            try:
+                context = await self._load_matchup_context(db, home_team, away_team, current_season)
+            except Exception as e:
+                logger.warning("matchup_context_unavailable", error=str(e))
+                # Return defaults if data not available (not cached, so the next call retries)
+                return DEFAULT_MATCHUP_CONTEXT
+            self._cache_context(key, time.monotonic() + MATCHUP_CONTEXT_TTL, context)
+            return context
 
-            # Get current season
-            season_result = await db.execute(
-                text("SELECT MAX(season) FROM player_season_stats")
-            )
-            current_season = season_result.scalar() or "20252026"
-
-            context = await fetch_context(db, home_team, away_team, current_season)
-            return {
-                "home_goalie": context.get("home_team", {}).get("goalie"),
-                "away_goalie": context.get("away_team", {}).get("goalie"),
-                "expected_total_goals": context.get("expected_total_goals", 6.0),
-                "home_expected_goals": context.get("home_expected_goals", 3.0),
-                "away_expected_goals": context.get("away_expected_goals", 3.0),
-                "home_pace": context.get("home_team", {}).get("pace"),
-                "away_pace": context.get("away_team", {}).get("pace"),
-            }
-        except Exception as e:
-            logger.warning("matchup_context_unavailable", error=str(e))
-            # Return defaults if data not available
-            return {
-                "home_goalie": None,
-                "away_goalie": None,
-                "expected_total_goals": 6.0,
-                "home_expected_goals": 3.0,
-                "away_expected_goals": 3.0,
-            }
+    async def _load_matchup_context(
+        self,
+        db: AsyncSession,
+        home_team: str,
+        away_team: str,
+        current_season: str | None = None,
+    ) -> dict:
+        """Fetch matchup context from the goalie/pace tables (uncached)."""
+        if current_season is None:
+            current_season = await self._get_current_season(db)
+        current_season = current_season or "20252026"
+
+        context = await fetch_context(db, home_team, away_team, current_season)
+        return _matchup_context(context)
+
+    async def _get_matchup_contexts(
+        self,
+        db: AsyncSession,
+        matchups: list[tuple[str, str]],
+        current_season: str | None = None,
+    ) -> dict[tuple[str, str], dict]:
+        """
+        _get_matchup_context for many pairs; cache misses share one fetch.
+        """
+        if fetch_contexts is None:
+            return {pair: DEFAULT_MATCHUP_CONTEXT for pair in matchups}
+
+        day = date.today().isoformat()
+        now = time.monotonic()
+        contexts = {}
+        missing = []
+        for pair in matchups:
+            cached = self._ctx_cache.get((*pair, day))
+            if cached and cached[0] > now:
+                self._ctx_cache.move_to_end((*pair, day))
+                contexts[pair] = cached[1]
+            else:
+                missing.append(pair)
+
+        if missing:
+            try:
+                fetched = await fetch_contexts(db, missing, current_season or "20252026")
+            except Exception as e:
+                logger.warning("matchup_context_unavailable", error=str(e))
+                # Defaults are not cached, so the next call retries
+                fetched = None
+            expires_at = time.monotonic() + MATCHUP_CONTEXT_TTL
+            for pair in missing:
+                if fetched is None:
+                    contexts[pair] = DEFAULT_MATCHUP_CONTEXT
+                    continue
+                contexts[pair] = _matchup_context(fetched[pair])
+                self._cache_context((*pair, day), expires_at, contexts[pair])
+        return contexts
+
+    async def _get_current_season(self, db: AsyncSession) -> str | None:
+        """Latest season in player_season_stats, memoized for CURRENT_SEASON_TTL."""
+        cached = self._season_cache
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        async with self._fill_lock("current_season"):
+            cached = self._season_cache
+            if cached and cached[0] > time.monotonic():
+                return cached[1]
+            result = await db.execute(_Q_CURRENT_SEASON)
+            season = result.scalar()
+            if season:
+                self._season_cache = (time.monotonic() + CURRENT_SEASON_TTL, season)
+            return season
+
+    async def _recent_form_view_current(self, db: AsyncSession) -> bool:
+        """Whether player_recent_form was refreshed today; remembered once it was."""
+        today = date.today()
+        if self._recent_form_view_day == today:
+            return True
+        result = await db.execute(_Q_RECENT_FORM_VIEW_DAY)
+        refreshed_on = result.scalar()
+        if refreshed_on == today:
+            self._recent_form_view_day = today
+        return refreshed_on == today
 
     async def _get_team_predictions(
         self,
@@ -423,38 +909,85 @@ class PredictionEngine:
         limit: int = 10,
         matchup_context: dict | None = None,
         is_playoff: bool = False,
+        current_season: str | None = None,
     ) -> list[PlayerPrediction]:
         """Get predictions for top players on a team."""
-        # Get current season
-        season_result = await db.execute(
-            text("SELECT MAX(season) FROM player_season_stats")
+        if current_season is None:
+            current_season = await self._get_current_season(db)
+
+        # Top players by points for this team, with every stat aggregate the
+        # model needs, in a single roundtrip (one row per player).
+        params = {"team": team, "season": current_season, "limit": limit, "opponent": opponent}
+        if game_date == date.today() and await self._recent_form_view_current(db):
+            # Today's recent form is precomputed by the player_recent_form view
+            result = await db.execute(_Q_TEAM_PLAYER_STATS_TODAY, params)
+        else:
+            result = await db.execute(
+                _Q_TEAM_PLAYER_STATS, {**params, "before_date": game_date, "n_games": 5}
+            )
+
+        return await self._build_team_predictions(
+            db, result.all(), team, opponent, is_home, game_date, matchup_context, is_playoff,
         )
-        current_season = season_result.scalar()
 
-        # Get top players by points for this team
-        result = await db.execute(
-            text("""
-                SELECT p.id, p.name, s.team_abbrev, s.points, s.games_played
-                FROM players p
-                JOIN player_season_stats s ON p.id = s.player_id
-                WHERE s.team_abbrev = :team AND s.season = :season
-                ORDER BY s.points DESC
-                LIMIT :limit
-            """),
-            {"team": team, "season": current_season, "limit": limit}
+    async def _build_team_predictions(
+        self,
+        db: AsyncSession,
+        rows: list,
+        team: str,
+        opponent: str,
+        is_home: bool,
+        game_date: date,
+        matchup_context: dict | None = None,
+        is_playoff: bool = False,
+    ) -> list[PlayerPrediction]:
+        """Score one side of a matchup from its team player stats rows."""
+        inputs, both_goalies = await self._prepare_team_inputs(
+            db, rows, team, opponent, is_home, game_date, matchup_context, is_playoff,
         )
+        return await _score_and_build(inputs, both_goalies)
 
-        predictions = []
-        for row in result.fetchall():
-            pred = await self._calculate_player_prediction(
-                db, row.id, row.name, team, opponent, is_home, game_date,
-                matchup_context=matchup_context,
+    async def _prepare_team_inputs(
+        self,
+        db: AsyncSession,
+        rows: list,
+        team: str,
+        opponent: str,
+        is_home: bool,
+        game_date: date,
+        matchup_context: dict | None = None,
+        is_playoff: bool = False,
+    ) -> tuple[list[_ScoringInputs], bool]:
+        """Scoring inputs for one side of a matchup, plus whether both goalies are known."""
+        # Same goalie/pace context for every player on this side of the matchup
+        opponent_goalie_name, opponent_goalie_sv_pct, expected_total, both_goalies = (
+            _unpack_matchup_context(matchup_context, is_home)
+        )
+
+        inputs = []
+        # Plain tuple unpacking; avoids a Row attribute lookup per column
+        for (
+            _team, player_id, name,
+            recent_games, recent_goals, recent_points, recent_avg_shots,
+            season_games, season_goals, season_points, season_xg,
+            h2h_games, h2h_goals, h2h_points,
+            home_games, home_points, away_games, away_points,
+        ) in rows:
+            inputs.append(await self._prepare_player_inputs(
+                db, player_id, name, team, opponent, is_home, game_date,
+                opponent_goalie_name=opponent_goalie_name,
+                opponent_goalie_sv_pct=opponent_goalie_sv_pct,
+                expected_total=expected_total,
                 is_playoff=is_playoff,
-            )
-            if pred:
-                predictions.append(pred)
+                stats=(
+                    _recent_form_stats(recent_games, recent_goals, recent_points, recent_avg_shots),
+                    _season_stats(season_games, season_goals, season_points, season_xg),
+                    _h2h_stats(h2h_games, h2h_goals, h2h_points),
+                    _home_away_stats(home_games, home_points, away_games, away_points, is_home),
+                ),
+            ))
 
-        return predictions
+        return inputs, both_goalies
 
     async def _calculate_player_prediction(
         self,
@@ -467,6 +1000,7 @@ class PredictionEngine:
         game_date: date,
         matchup_context: dict | None = None,
         is_playoff: bool = False,
+        stats: tuple[dict, dict, dict, dict] | None = None,
     ) -> PlayerPrediction:
         """
         Calculate prediction for a player using the enhanced weighted model.
@@ -474,13 +1008,51 @@ class PredictionEngine:
         Model: P(score) = w1*recent + w2*season + w3*h2h + w4*home_away + w5*goalie + w6*pace
         When is_playoff=True, a "playoff experience" factor is added and the
         active weights shift to PLAYOFF_WEIGHTS.
+
+        stats: Optional prefetched (recent, season, h2h, home_away) dicts from
+            the batch helpers; fetched per player when omitted.
+        """
+        opponent_goalie_name, opponent_goalie_sv_pct, expected_total, both_goalies = (
+            _unpack_matchup_context(matchup_context, is_home)
+        )
+        inputs = await self._prepare_player_inputs(
+            db, player_id, player_name, team, opponent, is_home, game_date,
+            opponent_goalie_name=opponent_goalie_name,
+            opponent_goalie_sv_pct=opponent_goalie_sv_pct,
+            expected_total=expected_total,
+            is_playoff=is_playoff,
+            stats=stats,
+        )
+        return (await _score_and_build([inputs], both_goalies))[0]
+
+    async def _prepare_player_inputs(
+        self,
+        db: AsyncSession,
+        player_id: int,
+        player_name: str,
+        team: str,
+        opponent: str,
+        is_home: bool,
+        game_date: date,
+        opponent_goalie_name: str | None = None,
+        opponent_goalie_sv_pct: float | None = None,
+        expected_total: float | None = None,
+        is_playoff: bool = False,
+        stats: tuple[dict, dict, dict, dict] | None = None,
+    ) -> "_ScoringInputs":
+        """
+        Collect a player's model inputs and explanatory factors (no scoring math).
+
+        The goalie/pace arguments come pre-extracted from the matchup context
+        (see _unpack_matchup_context); expected_total is None without context.
         """
-        import math
         factors = []
-        active_weights = PLAYOFF_WEIGHTS if is_playoff else WEIGHTS
 
-        # 1. Get recent form (last 5 games)
-        recent = await self._get_recent_form(db, player_id, game_date, n_games=5)
+        if stats is None:
+            stats = await self._get_player_stats(db, player_id, opponent, is_home, game_date)
+        recent, season, h2h, home_away = stats
+
+        # 1. Recent form (last 5 games)
         recent_form_ppg = recent["ppg"] if recent["games"] >= MIN_GAMES_RECENT else None
 
         if recent_form_ppg is not None:
@@ -489,12 +1061,10 @@ class PredictionEngine:
             elif recent_form_ppg < recent.get("season_ppg", 0) * 0.8:
                 factors.append(f"Cold streak: {recent_form_ppg:.2f} PPG in last {recent['games']} games")
 
-        # 2. Get season baseline
-        season = await self._get_season_stats(db, player_id)
+        # 2. Season baseline
         season_avg_ppg = season["ppg"] if season["games"] >= MIN_GAMES_SEASON else None
 
-        # 3. Get head-to-head history
-        h2h = await self._get_h2h_stats(db, player_id, opponent)
+        # 3. Head-to-head history
         h2h_ppg = h2h["ppg"] if h2h["games"] >= MIN_GAMES_H2H else None
 
         if h2h_ppg is not None:
@@ -503,8 +1073,7 @@ class PredictionEngine:
             elif h2h_ppg < (season_avg_ppg or 0) * 0.7:
                 factors.append(f"Struggles vs {opponent}: {h2h_ppg:.2f} PPG in {h2h['games']} games")
 
-        # 4. Get home/away splits
-        home_away = await self._get_home_away_stats(db, player_id, is_home)
+        # 4. Home/away splits
         home_away_adjustment = home_away.get("adjustment", 0.0)
 
         if abs(home_away_adjustment) > 0.1:
@@ -514,32 +1083,22 @@ class PredictionEngine:
 
         # 5. Calculate goalie matchup adjustment
         goalie_adjustment = 0.0
-        opponent_goalie_name = None
-        opponent_goalie_sv_pct = None
-
-        if matchup_context:
-            # If player is home, they face away goalie; if away, they face home goalie
-            opp_goalie = matchup_context.get("away_goalie" if is_home else "home_goalie")
-            if opp_goalie:
-                opponent_goalie_name = opp_goalie.get("name")
-                opponent_goalie_sv_pct = opp_goalie.get("save_pct")
-
-                if opponent_goalie_sv_pct:
-                    # Calculate adjustment: negative for good goalies, positive for weak goalies
-                    # Each 0.01 difference in save % = ~0.05 PPG adjustment
-                    sv_diff = LEAGUE_AVG_SAVE_PCT - opponent_goalie_sv_pct
-                    goalie_adjustment = sv_diff * 5.0  # Scale factor
-
-                    if sv_diff > 0.01:
-                        factors.append(f"Favorable goalie matchup: {opponent_goalie_name} ({opponent_goalie_sv_pct:.3f} SV%)")
-                    elif sv_diff < -0.01:
-                        factors.append(f"Tough goalie matchup: {opponent_goalie_name} ({opponent_goalie_sv_pct:.3f} SV%)")
+
+        if opponent_goalie_sv_pct:
+            # Calculate adjustment: negative for good goalies, positive for weak goalies
+            # Each 0.01 difference in save % = ~0.05 PPG adjustment
+            sv_diff = LEAGUE_AVG_SAVE_PCT - opponent_goalie_sv_pct
+            goalie_adjustment = sv_diff * 5.0  # Scale factor
+
+            if sv_diff > 0.01:
+                factors.append(f"Favorable goalie matchup: {opponent_goalie_name} ({opponent_goalie_sv_pct:.3f} SV%)")
+            elif sv_diff < -0.01:
+                factors.append(f"Tough goalie matchup: {opponent_goalie_name} ({opponent_goalie_sv_pct:.3f} SV%)")
 
         # 6. Calculate pace adjustment
         pace_adjustment = 0.0
 
-        if matchup_context:
-            expected_total = matchup_context.get("expected_total_goals", 6.0)
+        if expected_total is not None:
             # Average game is ~6.2 total goals (2 teams * 3.1 per team)
             league_avg_total = LEAGUE_AVG_GOALS_PER_GAME * 2
             pace_diff = expected_total - league_avg_total
@@ -552,28 +1111,12 @@ class PredictionEngine:
             elif pace_diff < -0.5:
                 factors.append(f"Low-scoring game expected: {expected_total:.1f} total goals")
 
-        # Calculate weighted prediction
-        components = []
-        weights_used = []
-
-        if recent_form_ppg is not None:
-            components.append(("recent", recent_form_ppg, active_weights["recent_form"]))
-            weights_used.append(active_weights["recent_form"])
-
-        if season_avg_ppg is not None:
-            components.append(("season", season_avg_ppg, active_weights["season_baseline"]))
-            weights_used.append(active_weights["season_baseline"])
-
-        if h2h_ppg is not None:
-            components.append(("h2h", h2h_ppg, active_weights["h2h_history"]))
-            weights_used.append(active_weights["h2h_history"])
-
         # 7. Playoff experience (only applied in playoff mode)
         playoff_games = 0
         playoff_ppg = 0.0
         playoff_multiplier = 1.0
+        playoff_component = None
         if is_playoff:
-            from backend.src.agents.playoffs import get_player_playoff_experience
             exp = await get_player_playoff_experience(db, player_id)
             playoff_games = exp.games
             playoff_ppg = exp.ppg
@@ -582,8 +1125,7 @@ class PredictionEngine:
             if exp.games >= 5:
                 # Use career playoff PPG as a direct component. Falls back to
                 # regular-season PPG if playoff sample is tiny.
-                components.append(("playoff_experience", exp.ppg, active_weights["playoff_experience"]))
-                weights_used.append(active_weights["playoff_experience"])
+                playoff_component = exp.ppg
 
                 if exp.games >= 20 and exp.ppg >= 0.80:
                     factors.append(f"Proven playoff performer: {exp.ppg:.2f} PPG in {exp.games} career PO games")
@@ -592,90 +1134,50 @@ class PredictionEngine:
             else:
                 factors.append(f"Limited playoff history ({exp.games} career PO games)")
 
-        # Normalize weights for the base components
-        total_weight = sum(weights_used) if weights_used else 1.0
-
-        # Calculate weighted expected points from base components
-        expected_points = 0.0
-        for name, value, weight in components:
-            expected_points += value * (weight / total_weight)
-
-        # Apply adjustments (these are additive modifiers)
-        expected_points += home_away_adjustment * active_weights["home_away"]
-        expected_points += goalie_adjustment * active_weights["goalie_matchup"]
-        expected_points += pace_adjustment * active_weights["team_pace"]
-
-        # In playoff mode, scale the whole expectation by the experience
-        # multiplier. Veterans with a real track record get a bump, rookies
-        # with no sample hold steady (multiplier == 1.0).
-        if is_playoff and playoff_multiplier != 1.0:
-            expected_points *= playoff_multiplier
-
-        # Ensure expected_points doesn't go negative
-        expected_points = max(0.0, expected_points)
-
         # Calculate expected goals/assists (typically ~40% goals, 60% assists for forwards)
         goal_ratio = recent.get("goal_ratio", 0.4) if recent["games"] > 0 else 0.4
-        expected_goals = expected_points * goal_ratio
-        expected_assists = expected_points * (1 - goal_ratio)
-
-        # Calculate probabilities using Poisson-like model
-        # P(at least 1 goal) ≈ 1 - e^(-expected_goals)
-        prob_goal = 1 - math.exp(-expected_goals) if expected_goals > 0 else 0.05
-        prob_point = 1 - math.exp(-expected_points) if expected_points > 0 else 0.1
-        prob_multi_point = 1 - math.exp(-expected_points) - expected_points * math.exp(-expected_points) if expected_points > 0 else 0.02
-
-        # Calculate confidence from prediction strength + data quality
-        games_analyzed = (recent.get("games", 0) + season.get("games", 0) + h2h.get("games", 0))
-        data_quality = min(1.0, games_analyzed / 50)
-
-        # Confidence reflects how strong the prediction signal is:
-        # - High prob_goal with solid data = high confidence
-        # - Low prob_goal or thin data = lower confidence
-        confidence_score = prob_goal * 0.7 + data_quality * 0.3
-        if matchup_context and matchup_context.get("home_goalie") and matchup_context.get("away_goalie"):
-            confidence_score = min(1.0, confidence_score + 0.05)
-
-        if confidence_score >= 0.30:
-            confidence = "high"
-        elif confidence_score >= 0.18:
-            confidence = "medium"
-        else:
-            confidence = "low"
-            if data_quality < 0.4:
-                factors.append("Limited data - prediction less reliable")
 
-        return PlayerPrediction(
-            player_name=player_name,
+        return _ScoringInputs(
             player_id=player_id,
+            player_name=player_name,
             team=team,
             opponent=opponent,
             is_home=is_home,
-            prob_goal=round(prob_goal, 3),
-            prob_point=round(prob_point, 3),
-            prob_multi_point=round(prob_multi_point, 3),
-            expected_goals=round(expected_goals, 2),
-            expected_assists=round(expected_assists, 2),
-            expected_points=round(expected_points, 2),
-            expected_shots=round(recent.get("avg_shots", 2.5), 1),
-            recent_form_ppg=round(recent_form_ppg, 2) if recent_form_ppg else 0,
-            season_avg_ppg=round(season_avg_ppg, 2) if season_avg_ppg else 0,
-            h2h_ppg=round(h2h_ppg, 2) if h2h_ppg else None,
-            home_away_adjustment=round(home_away_adjustment, 2),
-            goalie_adjustment=round(goalie_adjustment, 2),
-            pace_adjustment=round(pace_adjustment, 2),
-            opponent_goalie=opponent_goalie_name,
-            opponent_goalie_sv_pct=round(opponent_goalie_sv_pct, 3) if opponent_goalie_sv_pct else None,
-            confidence=confidence,
-            confidence_score=round(confidence_score, 2),
-            games_analyzed=games_analyzed,
-            factors=factors,
             is_playoff=is_playoff,
+            components=(recent_form_ppg, season_avg_ppg, h2h_ppg, playoff_component),
+            home_away_adjustment=home_away_adjustment,
+            goalie_adjustment=goalie_adjustment,
+            pace_adjustment=pace_adjustment,
+            # In playoff mode the whole expectation is scaled by the experience
+            # multiplier; 1.0 (rookies, regular season) leaves it unchanged.
+            playoff_multiplier=playoff_multiplier,
+            goal_ratio=goal_ratio,
+            recent=recent,
+            season=season,
+            h2h=h2h,
+            opponent_goalie_name=opponent_goalie_name,
+            opponent_goalie_sv_pct=opponent_goalie_sv_pct,
             playoff_games=playoff_games,
-            playoff_ppg=round(playoff_ppg, 2),
-            playoff_multiplier=round(playoff_multiplier, 3),
+            playoff_ppg=playoff_ppg,
+            factors=factors,
         )
 
+    async def _get_player_stats(
+        self,
+        db: AsyncSession,
+        player_id: int,
+        opponent: str,
+        is_home: bool,
+        game_date: date,
+    ) -> tuple[dict, dict, dict, dict]:
+        """Run the four independent per-player stat queries concurrently."""
+        return tuple(await asyncio.gather(
+            _on_own_session(db, self._get_recent_form, player_id, game_date, 5),
+            _on_own_session(db, self._get_season_stats, player_id),
+            _on_own_session(db, self._get_h2h_stats, player_id, opponent),
+            _on_own_session(db, self._get_home_away_stats, player_id, is_home),
+        ))
+
     async def _get_recent_form(
         self,
         db: AsyncSession,
@@ -686,64 +1188,26 @@ class PredictionEngine:
         """Get player's recent form from game logs."""
         # Use subquery to get last N games, then aggregate
         result = await db.execute(
-            text("""
-                SELECT
-                    COUNT(*) as games,
-                    COALESCE(SUM(goals), 0) as goals,
-                    COALESCE(SUM(assists), 0) as assists,
-                    COALESCE(SUM(points), 0) as points,
-                    COALESCE(AVG(shots), 0) as avg_shots
-                FROM (
-                    SELECT goals, assists, points, shots
-                    FROM game_logs
-                    WHERE player_id = :player_id
-                      AND game_date < :before_date
-                    ORDER BY game_date DESC
-                    LIMIT :n_games
-                ) recent_games
-            """),
+            _Q_RECENT_FORM,
             {"player_id": player_id, "before_date": before_date, "n_games": n_games}
         )
         row = result.fetchone()
-
-        if not row or row.games == 0:
-            return {"games": 0, "ppg": 0, "gpg": 0, "avg_shots": 0, "goal_ratio": 0.4}
-
-        games = row.games
-        points = row.points
-        goals = row.goals
-
-        return {
-            "games": games,
-            "ppg": float(points) / games if games > 0 else 0.0,
-            "gpg": float(goals) / games if games > 0 else 0.0,
-            "avg_shots": float(row.avg_shots) if row.avg_shots else 2.5,
-            "goal_ratio": float(goals) / float(points) if points > 0 else 0.4,
-        }
+        if not row:
+            return _empty_recent_form()
+        games, goals, _assists, points, avg_shots = row
+        return _recent_form_stats(games, goals, points, avg_shots)
 
     async def _get_season_stats(self, db: AsyncSession, player_id: int) -> dict:
         """Get player's season statistics."""
         result = await db.execute(
-            text("""
-                SELECT games_played, goals, assists, points, xg
-                FROM player_season_stats
-                WHERE player_id = :player_id
-                ORDER BY season DESC
-                LIMIT 1
-            """),
+            _Q_SEASON_STATS,
             {"player_id": player_id}
         )
         row = result.fetchone()
-
-        if not row or not row.games_played:
-            return {"games": 0, "ppg": 0, "gpg": 0, "xg_per_game": 0}
-
-        return {
-            "games": row.games_played,
-            "ppg": float(row.points) / row.games_played if row.games_played > 0 else 0.0,
-            "gpg": float(row.goals) / row.games_played if row.games_played > 0 else 0.0,
-            "xg_per_game": float(row.xg) / row.games_played if row.xg and row.games_played > 0 else 0.0,
-        }
+        if not row:
+            return _empty_season_stats()
+        games_played, goals, _assists, points, xg = row
+        return _season_stats(games_played, goals, points, xg)
 
     async def _get_h2h_stats(
         self,
@@ -753,27 +1217,14 @@ class PredictionEngine:
     ) -> dict:
         """Get player's head-to-head stats against opponent."""
         result = await db.execute(
-            text("""
-                SELECT
-                    COUNT(*) as games,
-                    COALESCE(SUM(goals), 0) as goals,
-                    COALESCE(SUM(assists), 0) as assists,
-                    COALESCE(SUM(points), 0) as points
-                FROM game_logs
-                WHERE player_id = :player_id AND opponent = :opponent
-            """),
+            _Q_H2H_STATS,
             {"player_id": player_id, "opponent": opponent}
         )
         row = result.fetchone()
-
-        if not row or row.games == 0:
-            return {"games": 0, "ppg": 0, "gpg": 0}
-
-        return {
-            "games": row.games,
-            "ppg": float(row.points) / row.games if row.games > 0 else 0.0,
-            "gpg": float(row.goals) / row.games if row.games > 0 else 0.0,
-        }
+        if not row:
+            return _empty_h2h_stats()
+        games, goals, _assists, points = row
+        return _h2h_stats(games, goals, points)
 
     async def _get_home_away_stats(
         self,
@@ -783,40 +1234,421 @@ class PredictionEngine:
     ) -> dict:
         """Get player's home/away performance differential."""
         result = await db.execute(
-            text("""
-                SELECT
-                    home_away,
-                    COUNT(*) as games,
-                    COALESCE(SUM(points), 0) as points
-                FROM game_logs
-                WHERE player_id = :player_id
-                GROUP BY home_away
-            """),
+            _Q_HOME_AWAY_STATS,
             {"player_id": player_id}
         )
-        rows = result.fetchall()
-
-        home_ppg = 0.0
-        away_ppg = 0.0
-
-        for row in rows:
-            if row.home_away == "home" and row.games > 0:
-                home_ppg = float(row.points) / row.games
-            elif row.home_away == "away" and row.games > 0:
-                away_ppg = float(row.points) / row.games
-
-        # Calculate adjustment relative to average
-        avg_ppg = (home_ppg + away_ppg) / 2 if (home_ppg + away_ppg) > 0 else 0
-        if is_home:
-            adjustment = home_ppg - avg_ppg
+        splits = {location: (games, points) for location, games, points in result.all()}
+        home_games, home_points = splits.get("home", (0, 0))
+        away_games, away_points = splits.get("away", (0, 0))
+        return _home_away_stats(home_games, home_points, away_games, away_points, is_home)
+
+
+def _score_players(
+    components: np.ndarray,
+    component_weights: np.ndarray,
+    weight_norms: np.ndarray,
+    adjustments: np.ndarray,
+    adjustment_weights: np.ndarray,
+    multiplier: np.ndarray,
+    goal_ratio: np.ndarray,
+) -> tuple[np.ndarray, ...]:
+    """
+    Vectorized weighted model for a batch of players.
+
+    components is (n, 4) PPG inputs with NaN where a component is unavailable;
+    present components are renormalized by their weight sum, looked up in
+    weight_norms by presence bitmask. adjustments is (n, 3) additive
+    home/away, goalie and pace modifiers.
+
+    Returns (expected_points, expected_goals, expected_assists,
+    prob_goal, prob_point, prob_multi_point).
+    """
+    present = ~np.isnan(components)
+    total_weight = weight_norms[present @ _PRESENCE_BITS]
+
+    expected_points = np.where(present, components, 0.0) @ component_weights / total_weight
+    expected_points += adjustments @ adjustment_weights
+    expected_points *= multiplier
+    # Ensure expected_points doesn't go negative
+    np.maximum(expected_points, 0.0, out=expected_points)
+
+    expected_goals = expected_points * goal_ratio
+    expected_assists = expected_points * (1 - goal_ratio)
+
+    # Poisson-like model: P(at least 1 goal) = 1 - e^(-expected_goals).
+    # expm1 keeps precision for small rates and e^(-ep) is evaluated once;
+    # P(2+) = P(1+) - ep*e^(-ep). Zero-rate players keep the fixed floors.
+    no_points = np.exp(-expected_points)
+    at_least_one = -np.expm1(-expected_points)
+    scoring = expected_points > 0
+    prob_goal = np.where(expected_goals > 0, -np.expm1(-expected_goals), 0.05)
+    prob_point = np.where(scoring, at_least_one, 0.1)
+    prob_multi_point = np.where(scoring, at_least_one - expected_points * no_points, 0.02)
+    return expected_points, expected_goals, expected_assists, prob_goal, prob_point, prob_multi_point
+
+
+def _score_players_loop(
+    components: np.ndarray,
+    component_weights: np.ndarray,
+    weight_norms: np.ndarray,
+    adjustments: np.ndarray,
+    adjustment_weights: np.ndarray,
+    multiplier: np.ndarray,
+    goal_ratio: np.ndarray,
+) -> tuple[np.ndarray, ...]:
+    """
+    Same model as _score_players as one fused per-player loop.
+
+    Written for numba: no temporaries, no Python objects, one pass per player.
+    Players are independent, so the outer loop is a prange.
+    """
+    n = components.shape[0]
+    expected_points = np.empty(n)
+    expected_goals = np.empty(n)
+    expected_assists = np.empty(n)
+    prob_goal = np.empty(n)
+    prob_point = np.empty(n)
+    prob_multi_point = np.empty(n)
+
+    for i in prange(n):
+        weighted = 0.0
+        mask = 0
+        for j in range(components.shape[1]):
+            value = components[i, j]
+            if not np.isnan(value):
+                weighted += value * component_weights[j]
+                mask |= 1 << j
+        ep = weighted / weight_norms[mask]
+        for j in range(adjustments.shape[1]):
+            ep += adjustments[i, j] * adjustment_weights[j]
+        ep *= multiplier[i]
+        if ep < 0.0:
+            ep = 0.0
+
+        eg = ep * goal_ratio[i]
+        expected_points[i] = ep
+        expected_goals[i] = eg
+        expected_assists[i] = ep * (1 - goal_ratio[i])
+
+        prob_goal[i] = -np.expm1(-eg) if eg > 0 else 0.05
+        if ep > 0:
+            at_least_one = -np.expm1(-ep)
+            prob_point[i] = at_least_one
+            prob_multi_point[i] = at_least_one - ep * np.exp(-ep)
         else:
-            adjustment = away_ppg - avg_ppg
-
-        return {
-            "home_ppg": home_ppg,
-            "away_ppg": away_ppg,
-            "adjustment": adjustment,
-        }
+            prob_point[i] = 0.1
+            prob_multi_point[i] = 0.02
+
+    return expected_points, expected_goals, expected_assists, prob_goal, prob_point, prob_multi_point
+
+
+# The NumPy build, kept reachable when numba replaces _score_players below
+_score_players_numpy = _score_players
+
+# numba is an optional accelerator (pip install "powerplai[perf]"). The explicit
+# signature compiles at import (cached on disk), so the first request pays nothing.
+# fastmath is left off: it assumes no NaNs, and NaN marks a missing component.
+if njit is not None:
+    _score_players = njit(
+        "UniTuple(float64[::1], 6)(float64[:, ::1], float64[::1], float64[::1], "
+        "float64[:, ::1], float64[::1], float64[::1], float64[::1])",
+        cache=True,
+        nogil=True,
+    )(_score_players_loop)
+    # Thread start-up costs more than scoring a single matchup's ~20 players,
+    # so the multi-core build is only used for slate-sized batches.
+    _score_players_parallel = njit(
+        "UniTuple(float64[::1], 6)(float64[:, ::1], float64[::1], float64[::1], "
+        "float64[:, ::1], float64[::1], float64[::1], float64[::1])",
+        cache=True,
+        nogil=True,
+        parallel=True,
+    )(_score_players_loop)
+else:
+    _score_players_parallel = _score_players
+
+PARALLEL_SCORING_MIN_PLAYERS = 256
+
+
+async def _on_own_session(db: AsyncSession, fetch, *args, **kwargs):
+    """
+    Await fetch(session, ...) on a fresh session bound to db's engine.
+
+    An AsyncSession can't multiplex statements, so concurrent queries each
+    take their own short-lived session (and pooled connection).
+    """
+    async with AsyncSession(db.bind, expire_on_commit=False) as session:
+        return await fetch(session, *args, **kwargs)
+
+
+def _game_info(game_id, venue, start_time_utc, game_type) -> dict:
+    """Game info dict from a games row."""
+    return {
+        "game_id": game_id,
+        "venue": venue,
+        "start_time": start_time_utc.isoformat() if start_time_utc else None,
+        "game_type": game_type,
+    }
+
+
+def _matchup_context(context: dict) -> dict:
+    """Flatten team_goalie_stats matchup context into the engine's shape."""
+    return {
+        "home_goalie": context.get("home_team", {}).get("goalie"),
+        "away_goalie": context.get("away_team", {}).get("goalie"),
+        "expected_total_goals": context.get("expected_total_goals", 6.0),
+        "home_expected_goals": context.get("home_expected_goals", 3.0),
+        "away_expected_goals": context.get("away_expected_goals", 3.0),
+        "home_pace": context.get("home_team", {}).get("pace"),
+        "away_pace": context.get("away_team", {}).get("pace"),
+    }
+
+
+def _build_matchup_prediction(
+    home_team: str,
+    away_team: str,
+    game_date: date,
+    game_info: dict | None,
+    matchup_context: dict,
+    home_players: list[PlayerPrediction],
+    away_players: list[PlayerPrediction],
+    is_playoff: bool,
+) -> MatchupPrediction:
+    """Assemble a MatchupPrediction from both sides' player predictions."""
+    # Combine and rank by goal probability
+    all_players = home_players + away_players
+    top_scorers = heapq.nlargest(15, all_players, key=attrgetter("prob_goal"))
+
+    # Determine pace rating
+    expected_total = matchup_context.get("expected_total_goals", 6.0)
+    if expected_total >= 6.5:
+        pace_rating = "high"
+    elif expected_total <= 5.5:
+        pace_rating = "low"
+    else:
+        pace_rating = "average"
+
+    return MatchupPrediction(
+        game_id=game_info.get("game_id") if game_info else None,
+        game_date=game_date,
+        home_team=home_team,
+        away_team=away_team,
+        venue=game_info.get("venue") if game_info else None,
+        start_time=game_info.get("start_time") if game_info else None,
+        home_players=home_players,
+        away_players=away_players,
+        top_scorers=top_scorers,
+        expected_total_goals=matchup_context.get("expected_total_goals"),
+        home_expected_goals=matchup_context.get("home_expected_goals"),
+        away_expected_goals=matchup_context.get("away_expected_goals"),
+        home_goalie=matchup_context.get("home_goalie"),
+        away_goalie=matchup_context.get("away_goalie"),
+        pace_rating=pace_rating,
+        is_playoff=is_playoff,
+    )
+
+
+def _unpack_matchup_context(
+    matchup_context: dict | None,
+    is_home: bool,
+) -> tuple[str | None, float | None, float | None, bool]:
+    """
+    Pull the per-side values the model needs out of a matchup context once.
+
+    Returns (opponent goalie name, opponent goalie SV%, expected total goals,
+    whether both starting goalies are known). A home player faces the away
+    goalie and vice versa.
+    """
+    if not matchup_context:
+        return None, None, None, False
+
+    opp_goalie = matchup_context.get("away_goalie" if is_home else "home_goalie") or {}
+    both_goalies = bool(matchup_context.get("home_goalie") and matchup_context.get("away_goalie"))
+    return (
+        opp_goalie.get("name"),
+        opp_goalie.get("save_pct"),
+        matchup_context.get("expected_total_goals", 6.0),
+        both_goalies,
+    )
+
+
+async def _score_and_build(inputs: list[_ScoringInputs], both_goalies: bool) -> list[PlayerPrediction]:
+    """Score a batch of players in one vectorized pass and build their predictions."""
+    return [
+        _build_player_prediction(inp, *score, both_goalies=both_goalies)
+        for inp, score in zip(inputs, await _score_inputs(inputs))
+    ]
+
+
+async def _score_inputs(inputs: list[_ScoringInputs]) -> list[tuple[float, ...]]:
+    """
+    Score players sharing one weight set in a single kernel call.
+
+    Returns (expected_points, expected_goals, expected_assists, prob_goal,
+    prob_point, prob_multi_point) per player. Slate-sized batches run on a
+    worker thread (the kernels release the GIL) so the event loop keeps
+    serving requests; small ones stay inline, as the thread handoff would
+    cost more than scoring them.
+    """
+    if not inputs:
+        return []
+
+    # All players in a batch share a game type, so they share the weight set
+    component_weights, weight_norms, adjustment_weights = _WEIGHT_ARRAYS[inputs[0].is_playoff]
+
+    components = np.array(
+        [[np.nan if c is None else c for c in inp.components] for inp in inputs], dtype=np.float64
+    )
+    adjustments = np.array(
+        [[inp.home_away_adjustment, inp.goalie_adjustment, inp.pace_adjustment] for inp in inputs],
+        dtype=np.float64,
+    )
+    multiplier = np.array([inp.playoff_multiplier for inp in inputs], dtype=np.float64)
+    goal_ratio = np.array([inp.goal_ratio for inp in inputs], dtype=np.float64)
+
+    args = (components, component_weights, weight_norms, adjustments, adjustment_weights, multiplier, goal_ratio)
+    if len(inputs) >= PARALLEL_SCORING_MIN_PLAYERS:
+        scores = await asyncio.to_thread(_score_players_parallel, *args)
+    else:
+        scores = _score_players(*args)
+    return list(zip(*(col.tolist() for col in scores)))
+
+
+def _build_player_prediction(
+    inp: _ScoringInputs,
+    expected_points: float,
+    expected_goals: float,
+    expected_assists: float,
+    prob_goal: float,
+    prob_point: float,
+    prob_multi_point: float,
+    both_goalies: bool,
+) -> PlayerPrediction:
+    """Attach confidence to scored values and assemble the PlayerPrediction."""
+    recent, season, h2h = inp.recent, inp.season, inp.h2h
+    recent_form_ppg, season_avg_ppg, h2h_ppg, _ = inp.components
+    factors = inp.factors
+
+    # Calculate confidence from prediction strength + data quality
+    games_analyzed = (recent.get("games", 0) + season.get("games", 0) + h2h.get("games", 0))
+    data_quality = min(1.0, games_analyzed / 50)
+
+    # Confidence reflects how strong the prediction signal is:
+    # - High prob_goal with solid data = high confidence
+    # - Low prob_goal or thin data = lower confidence
+    confidence_score = prob_goal * 0.7 + data_quality * 0.3
+    if both_goalies:
+        confidence_score = min(1.0, confidence_score + 0.05)
+
+    if confidence_score >= 0.30:
+        confidence = "high"
+    elif confidence_score >= 0.18:
+        confidence = "medium"
+    else:
+        confidence = "low"
+        if data_quality < 0.4:
+            factors.append("Limited data - prediction less reliable")
+
+    return PlayerPrediction(
+        player_name=inp.player_name,
+        player_id=inp.player_id,
+        team=inp.team,
+        opponent=inp.opponent,
+        is_home=inp.is_home,
+        prob_goal=round(prob_goal, 3),
+        prob_point=round(prob_point, 3),
+        prob_multi_point=round(prob_multi_point, 3),
+        expected_goals=round(expected_goals, 2),
+        expected_assists=round(expected_assists, 2),
+        expected_points=round(expected_points, 2),
+        expected_shots=round(recent.get("avg_shots", 2.5), 1),
+        recent_form_ppg=round(recent_form_ppg, 2) if recent_form_ppg else 0,
+        season_avg_ppg=round(season_avg_ppg, 2) if season_avg_ppg else 0,
+        h2h_ppg=round(h2h_ppg, 2) if h2h_ppg else None,
+        home_away_adjustment=round(inp.home_away_adjustment, 2),
+        goalie_adjustment=round(inp.goalie_adjustment, 2),
+        pace_adjustment=round(inp.pace_adjustment, 2),
+        opponent_goalie=inp.opponent_goalie_name,
+        opponent_goalie_sv_pct=round(inp.opponent_goalie_sv_pct, 3) if inp.opponent_goalie_sv_pct else None,
+        confidence=confidence,
+        confidence_score=round(confidence_score, 2),
+        games_analyzed=games_analyzed,
+        factors=factors,
+        is_playoff=inp.is_playoff,
+        playoff_games=inp.playoff_games,
+        playoff_ppg=round(inp.playoff_ppg, 2),
+        playoff_multiplier=round(inp.playoff_multiplier, 3),
+    )
+
+
+def _empty_recent_form() -> dict:
+    return {"games": 0, "ppg": 0, "gpg": 0, "avg_shots": 0, "goal_ratio": 0.4}
+
+
+def _empty_season_stats() -> dict:
+    return {"games": 0, "ppg": 0, "gpg": 0, "xg_per_game": 0}
+
+
+def _empty_h2h_stats() -> dict:
+    return {"games": 0, "ppg": 0, "gpg": 0}
+
+
+def _recent_form_stats(games, goals, points, avg_shots) -> dict:
+    """Build the recent-form stats dict from last-N-games aggregates."""
+    if not games:
+        return _empty_recent_form()
+
+    return {
+        "games": games,
+        "ppg": float(points) / games if games > 0 else 0.0,
+        "gpg": float(goals) / games if games > 0 else 0.0,
+        "avg_shots": float(avg_shots) if avg_shots else 2.5,
+        "goal_ratio": float(goals) / float(points) if points > 0 else 0.4,
+    }
+
+
+def _season_stats(games_played, goals, points, xg) -> dict:
+    """Build the season stats dict from a player_season_stats row's values."""
+    if not games_played:
+        return _empty_season_stats()
+
+    return {
+        "games": games_played,
+        "ppg": float(points) / games_played if games_played > 0 else 0.0,
+        "gpg": float(goals) / games_played if games_played > 0 else 0.0,
+        "xg_per_game": float(xg) / games_played if xg and games_played > 0 else 0.0,
+    }
+
+
+def _h2h_stats(games, goals, points) -> dict:
+    """Build the head-to-head stats dict from aggregates vs one opponent."""
+    if not games:
+        return _empty_h2h_stats()
+
+    return {
+        "games": games,
+        "ppg": float(points) / games if games > 0 else 0.0,
+        "gpg": float(goals) / games if games > 0 else 0.0,
+    }
+
+
+def _home_away_stats(home_games, home_points, away_games, away_points, is_home: bool) -> dict:
+    """Compute the home/away PPG differential from per-location aggregates."""
+    home_ppg = float(home_points) / home_games if home_games else 0.0
+    away_ppg = float(away_points) / away_games if away_games else 0.0
+
+    # Calculate adjustment relative to average
+    avg_ppg = (home_ppg + away_ppg) / 2 if (home_ppg + away_ppg) > 0 else 0
+    if is_home:
+        adjustment = home_ppg - avg_ppg
+    else:
+        adjustment = away_ppg - avg_ppg
+
+    return {
+        "home_ppg": home_ppg,
+        "away_ppg": away_ppg,
+        "adjustment": adjustment,
+    }
 
 
 # Singleton instance
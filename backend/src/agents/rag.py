@@ -10,18 +10,80 @@ Features:
 """
 from enum import Enum
 from dataclasses import dataclass
+from functools import lru_cache
+from collections.abc import Iterator
 from sentence_transformers import SentenceTransformer
-from sqlalchemy import text
+from transformers import AutoTokenizer
+from sqlalchemy import insert, text
 from sqlalchemy.ext.asyncio import AsyncSession
 import structlog
+from pathlib import Path
 import numpy as np
+import torch
+import asyncio
+import hashlib
+import os
 import re
+import sqlite3
+import threading
+
+from backend.src.db.models import Document
+
+# ONNX Runtime is an optional accelerator (pip install "powerplai[perf]"). The
+# model's hub repo ships a dynamically quantized INT8 export, which runs the
+# VNNI int8 GEMM kernels on CPU instead of the FP32 PyTorch graph.
+try:
+    import onnxruntime
+except ImportError:
+    onnxruntime = None
 
 logger = structlog.get_logger()
 
 # Using a small, fast model that runs well locally
 EMBEDDING_MODEL = "all-MiniLM-L6-v2"
 EMBEDDING_DIM = 384
+ONNX_MODEL_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+# chunk_text's 500-character chunks are ~120 tokens; anything past 128 tokens
+# is mostly padding for the chunked corpus
+MAX_SEQ_LENGTH = 128
+EMBED_SHARD_MIN_SIZE = 128  # texts per worker before sharding pays for itself
+# torch intra-op threads per encode, set once at model load. Large ingests
+# get their parallelism from shards (one per EMBED_THREADS_PER_WORKER CPUs)
+# instead of retuning the process-global thread count per call.
+EMBED_THREADS_PER_WORKER = 2
+QUERY_CACHE_SIZE = 4096  # ~6 MB of float32 query embeddings
+EMBEDDING_CACHE_PATH = Path("data/embedding_cache.sqlite")
+
+# First search stage: rank by Hamming distance over the embedding's sign bits
+# (embedding_bits), overfetching so the cosine ordering in the outer query can
+# recover neighbours the 1-bit codes rank too low. The rerank similarity is
+# computed once per candidate from the half-precision copy (embedding_half).
+BINARY_OVERFETCH = 10
+HNSW_MIN_EF_SEARCH = 40  # pgvector's default
+_CANDIDATES_CTE = """
+    WITH candidates AS (
+        SELECT id, 1 - (embedding_half <=> CAST(:embedding AS halfvec(384))) as semantic_sim
+        FROM documents
+        WHERE embedding_bits IS NOT NULL AND embedding_half IS NOT NULL
+        ORDER BY embedding_bits <~> binary_quantize(CAST(:embedding AS vector(384)))::bit(384)
+        LIMIT :candidates
+    )
+"""
+# The quantized columns need pgvector >= 0.7; on an older extension the
+# migrations skip them and candidates come straight from the full embedding.
+_FULL_PRECISION_CANDIDATES_CTE = """
+    WITH candidates AS (
+        SELECT id, 1 - (embedding <=> CAST(:embedding AS vector(384))) as semantic_sim
+        FROM documents
+        WHERE embedding IS NOT NULL
+        ORDER BY embedding <=> CAST(:embedding AS vector(384))
+        LIMIT :candidates
+    )
+"""
+_Q_QUANTIZED_COLUMNS = text("""
+    SELECT count(*) = 2 FROM information_schema.columns
+    WHERE table_name = 'documents' AND column_name IN ('embedding_bits', 'embedding_half')
+""")
 
 
 class RetrievalStrategy(Enum):
@@ -62,25 +124,150 @@ class RAGService:
     """Service for embedding and retrieving documents."""
 
     def __init__(self):
+        os.environ.setdefault("TOKENIZERS_PARALLELISM", "true")
         self._model: SentenceTransformer | None = None
+        self._disk_cache = _EmbeddingCache(EMBEDDING_CACHE_PATH)
+        # Per-instance so the cache is dropped along with the model it came from
+        self._embed_cached = lru_cache(maxsize=QUERY_CACHE_SIZE)(self._encode)
+        # Caps concurrent encode workers across overlapping sharded ingests
+        self._shard_slots = asyncio.Semaphore(_embed_workers())
+        # Whether documents has the quantized embedding columns; read once
+        self._quantized: bool | None = None
 
     @property
     def model(self) -> SentenceTransformer:
         """Lazy load the embedding model."""
         if self._model is None:
-            logger.info("loading_embedding_model", model=EMBEDDING_MODEL)
-            self._model = SentenceTransformer(EMBEDDING_MODEL)
+            # Sized from the CPUs this process may run on (not the host's
+            # count, which overstates it inside containers); never changed
+            # afterwards, since the setting is process-global
+            torch.set_num_threads(min(_cpu_count(), EMBED_THREADS_PER_WORKER))
+            backend = _embedding_backend()
+            logger.info("loading_embedding_model", model=EMBEDDING_MODEL, backend=backend)
+            if backend == "torch-fp16":
+                # Half-precision weights halve memory traffic and run on tensor
+                # cores; outputs are cast back to float32 by the embed methods.
+                self._model = SentenceTransformer(EMBEDDING_MODEL, device="cuda").half()
+            elif backend == "onnx-int8":
+                self._model = SentenceTransformer(
+                    EMBEDDING_MODEL,
+                    backend="onnx",
+                    model_kwargs={"file_name": ONNX_MODEL_FILE, "provider": "CPUExecutionProvider"},
+                )
+            else:
+                self._model = SentenceTransformer(EMBEDDING_MODEL)
+
+            # Tokenize with the Rust tokenizer, which batches across threads
+            if not self._model.tokenizer.is_fast:
+                self._model.tokenizer = AutoTokenizer.from_pretrained(
+                    f"sentence-transformers/{EMBEDDING_MODEL}", use_fast=True
+                )
+            self._model.max_seq_length = MAX_SEQ_LENGTH
         return self._model
 
-    def embed(self, text: str) -> list[float]:
-        """Generate embedding for a text string."""
-        embedding = self.model.encode(text, normalize_embeddings=True)
-        return embedding.tolist()
+    async def _has_quantized_columns(self, db: AsyncSession) -> bool:
+        """Whether the migrations added embedding_bits/embedding_half (pgvector >= 0.7)."""
+        if self._quantized is None:
+            self._quantized = bool((await db.execute(_Q_QUANTIZED_COLUMNS)).scalar())
+            if not self._quantized:
+                logger.warning("rag_quantized_columns_missing", fallback="embedding")
+        return self._quantized
+
+    def _candidates_cte(self) -> str:
+        return _CANDIDATES_CTE if self._quantized else _FULL_PRECISION_CANDIDATES_CTE
+
+    async def warmup(self) -> None:
+        """
+        Load the model and run one encode so the first user query doesn't
+        pay the cold load and first-call kernel setup.
+        """
+        await asyncio.to_thread(self.model.encode, ["warmup"])
+        logger.info("embedding_model_warm", model=EMBEDDING_MODEL)
+
+    def embed(self, text: str) -> np.ndarray:
+        """
+        Generate embedding for a text string as a read-only float32 array.
+
+        Results are memoized per exact text, so repeated queries (retries,
+        pagination, follow-ups) skip the model entirely.
+        """
+        return self._embed_cached(text)
+
+    def _encode(self, text: str) -> np.ndarray:
+        """Run the model on one text; read-only so cached results can't be mutated."""
+        embedding = self.model.encode(text, convert_to_numpy=True).astype(np.float32, copy=False)
+        _normalize(embedding)
+        embedding.flags.writeable = False
+        return embedding
+
+    async def embed_batch_sharded(self, texts: list[str], batch_size: int = 64) -> np.ndarray:
+        """
+        embed_batch for large ingests, split across worker threads.
+
+        Batches of at least 2 * EMBED_SHARD_MIN_SIZE texts are cut into one
+        contiguous shard per embed worker (each at least EMBED_SHARD_MIN_SIZE)
+        and encoded concurrently. Each worker uses EMBED_THREADS_PER_WORKER
+        intra-op threads, so the shards together fill the CPUs without
+        oversubscribing them. Smaller batches run as a single embed_batch off
+        the event loop.
+        """
+        shards = min(_embed_workers(), len(texts) // EMBED_SHARD_MIN_SIZE)
+        if shards <= 1:
+            return await asyncio.to_thread(self.embed_batch, texts, batch_size)
+
+        self.model  # Load once here rather than racing to load in every worker
+        bounds = np.linspace(0, len(texts), shards + 1, dtype=np.int64).tolist()
+
+        async def encode_shard(lo: int, hi: int) -> np.ndarray:
+            async with self._shard_slots:
+                return await asyncio.to_thread(self.embed_batch, texts[lo:hi], batch_size)
+
+        parts = await asyncio.gather(*(
+            encode_shard(lo, hi) for lo, hi in zip(bounds[:-1], bounds[1:])
+        ))
+        return np.concatenate(parts)
+
+    def embed_batch(self, texts: list[str], batch_size: int = 64) -> np.ndarray:
+        """
+        Generate embeddings for multiple texts as an (n, EMBEDDING_DIM) float32 array.
+
+        Pass the whole list in one call: encode() sorts it by length before
+        slicing micro-batches of batch_size, so each batch is only padded to
+        its own longest text, then restores the input order.
+
+        Texts already in the on-disk cache (unchanged content from an earlier
+        ingest) skip the model; only the misses are encoded.
+        """
+        keys = [_content_hash(t) for t in texts]
+        cached = self._disk_cache.get_many(keys)
+        embeddings = np.empty((len(texts), EMBEDDING_DIM), dtype=np.float32)
+
+        hits = []
+        misses = []
+        for i, key in enumerate(keys):
+            vector = cached.get(key)
+            if vector is None:
+                misses.append(i)
+            else:
+                embeddings[i] = vector
+                hits.append(i)
+        if hits:
+            # Stored as float16, so hits come back slightly off unit length
+            embeddings[hits] = _normalize(embeddings[hits])
+
+        if misses:
+            encoded = self.model.encode(
+                [texts[i] for i in misses],
+                batch_size=batch_size,
+                show_progress_bar=False,
+                convert_to_numpy=True,
+            )
+            encoded = _normalize(encoded.astype(np.float32, copy=False))
+            embeddings[misses] = encoded
+            self._disk_cache.put_many([keys[i] for i in misses], encoded)
 
-    def embed_batch(self, texts: list[str]) -> list[list[float]]:
-        """Generate embeddings for multiple texts."""
-        embeddings = self.model.encode(texts, normalize_embeddings=True)
-        return embeddings.tolist()
+        logger.debug("embed_batch", texts=len(texts), cache_hits=len(texts) - len(misses))
+        return embeddings
 
     async def add_document(
         self,
@@ -92,28 +279,56 @@ class RAGService:
         metadata: dict | None = None,
     ) -> int:
         """Add a document to the database with its embedding."""
-        embedding = self.embed(content)
+        [doc_id] = await self.add_documents(db, [{
+            "content": content,
+            "title": title,
+            "source": source,
+            "url": url,
+            "metadata": metadata,
+        }])
+
+        logger.info("document_added", doc_id=doc_id, title=title)
+        return doc_id
+
+    async def add_documents(self, db: AsyncSession, docs: list[dict]) -> list[int]:
+        """
+        Add many documents with one embedding pass and one INSERT.
+
+        Each doc needs "content" and may carry "title", "source", "url" and
+        "metadata". The batch is embedded in worker threads so the event loop
+        isn't blocked by the model. Returns the new ids in input order.
+        """
+        if not docs:
+            return []
+
+        contents = [doc["content"] for doc in docs]
+        embeddings = await self.embed_batch_sharded(contents)
+        quantized = await self._has_quantized_columns(db)
+
+        rows = []
+        for doc, embedding in zip(docs, embeddings):
+            row = {
+                "title": doc.get("title"),
+                "source": doc.get("source"),
+                "content": doc["content"],
+                "url": doc.get("url"),
+                "embedding": embedding,
+                "metadata_": doc.get("metadata"),
+            }
+            if quantized:
+                row["embedding_bits"] = _sign_bits(embedding)
+                row["embedding_half"] = embedding
+            rows.append(row)
 
         result = await db.execute(
-            text("""
-                INSERT INTO documents (title, source, content, url, embedding, metadata)
-                VALUES (:title, :source, :content, :url, :embedding, :metadata)
-                RETURNING id
-            """),
-            {
-                "title": title,
-                "source": source,
-                "content": content,
-                "url": url,
-                "embedding": str(embedding),
-                "metadata": metadata,
-            },
+            insert(Document).returning(Document.id, sort_by_parameter_order=True),
+            rows,
         )
-        doc_id = result.scalar_one()
+        doc_ids = list(result.scalars())
         await db.commit()
 
-        logger.info("document_added", doc_id=doc_id, title=title)
-        return doc_id
+        logger.info("documents_added", count=len(doc_ids))
+        return doc_ids
 
     def determine_strategy(self, query: str, query_type: str | None = None) -> RetrievalStrategy:
         """
@@ -166,6 +381,15 @@ class RAGService:
             strategy = self.determine_strategy(query, query_type)
 
         logger.info("rag_search_start", query=query[:50], strategy=strategy.value)
+        await self._has_quantized_columns(db)
+
+        # An HNSW scan returns at most ef_search rows (default 40), which would
+        # silently cap the candidate stage; size the search list to it for
+        # this transaction only.
+        await db.execute(
+            text("SELECT set_config('hnsw.ef_search', :ef, true)"),
+            {"ef": str(max(HNSW_MIN_EF_SEARCH, limit * BINARY_OVERFETCH))},
+        )
 
         # Execute retrieval based on strategy
         if strategy == RetrievalStrategy.HYBRID:
@@ -180,7 +404,12 @@ class RAGService:
         # Re-rank results for better relevance
         documents = self._rerank_results(documents, query)
 
-        logger.info("rag_search_complete", query=query[:50], results=len(documents))
+        logger.info(
+            "rag_search_complete",
+            query=query[:50],
+            results=len(documents),
+            query_cache_hits=self._embed_cached.cache_info().hits,
+        )
 
         # Convert to dict format for backwards compatibility
         return [doc.to_dict() for doc in documents]
@@ -196,16 +425,22 @@ class RAGService:
         query_embedding = self.embed(query)
 
         result = await db.execute(
-            text("""
+            text(self._candidates_cte() + """
                 SELECT
                     id, title, source, content, url,
-                    1 - (embedding <=> :embedding) as similarity
+                    semantic_sim as similarity
                 FROM documents
-                WHERE embedding IS NOT NULL
-                ORDER BY embedding <=> :embedding
+                JOIN candidates USING (id)
+                WHERE embedding IS NOT NULL AND semantic_sim >= :min_sim
+                ORDER BY semantic_sim DESC
                 LIMIT :limit
             """),
-            {"embedding": str(query_embedding), "limit": limit},
+            {
+                "embedding": query_embedding,
+                "limit": limit,
+                "candidates": limit * BINARY_OVERFETCH,
+                "min_sim": min_similarity,
+            },
         )
 
         return [
@@ -220,7 +455,6 @@ class RAGService:
                 citation=self._format_citation(row.title, row.source, row.url),
             )
             for row in result.fetchall()
-            if row.similarity >= min_similarity
         ]
 
     async def _hybrid_search(
@@ -238,18 +472,19 @@ class RAGService:
         keyword_pattern = "|".join(re.escape(k) for k in keywords) if keywords else ""
 
         result = await db.execute(
-            text("""
+            text(self._candidates_cte() + """
                 SELECT
                     id, title, source, content, url,
-                    1 - (embedding <=> :embedding) as semantic_sim,
+                    semantic_sim,
                     CASE
                         WHEN content ~* :pattern THEN 0.2
                         WHEN title ~* :pattern THEN 0.3
                         ELSE 0
                     END as keyword_boost
                 FROM documents
-                WHERE embedding IS NOT NULL
-                ORDER BY (1 - (embedding <=> :embedding)) + CASE
+                JOIN candidates USING (id)
+                WHERE embedding IS NOT NULL AND semantic_sim >= :min_sim
+                ORDER BY semantic_sim + CASE
                     WHEN content ~* :pattern THEN 0.2
                     WHEN title ~* :pattern THEN 0.3
                     ELSE 0
@@ -257,9 +492,11 @@ class RAGService:
                 LIMIT :limit
             """),
             {
-                "embedding": str(query_embedding),
+                "embedding": query_embedding,
                 "pattern": keyword_pattern,
                 "limit": limit,
+                "candidates": limit * BINARY_OVERFETCH,
+                "min_sim": min_similarity * 0.8,  # Lower threshold for hybrid
             },
         )
 
@@ -275,7 +512,6 @@ class RAGService:
                 citation=self._format_citation(row.title, row.source, row.url),
             )
             for row in result.fetchall()
-            if row.semantic_sim >= min_similarity * 0.8  # Lower threshold for hybrid
         ]
 
     async def _concept_search(
@@ -290,25 +526,31 @@ class RAGService:
 
         # Boost documents that contain definition-like patterns
         result = await db.execute(
-            text("""
+            text(self._candidates_cte() + """
                 SELECT
                     id, title, source, content, url,
-                    1 - (embedding <=> :embedding) as semantic_sim,
+                    semantic_sim,
                     CASE
                         WHEN content ~* '(is defined as|refers to|measures|calculates)' THEN 0.15
                         WHEN content ~* '(what is|definition|explanation)' THEN 0.1
                         ELSE 0
                     END as concept_boost
                 FROM documents
-                WHERE embedding IS NOT NULL
-                ORDER BY (1 - (embedding <=> :embedding)) + CASE
+                JOIN candidates USING (id)
+                WHERE embedding IS NOT NULL AND semantic_sim >= :min_sim
+                ORDER BY semantic_sim + CASE
                     WHEN content ~* '(is defined as|refers to|measures|calculates)' THEN 0.15
                     WHEN content ~* '(what is|definition|explanation)' THEN 0.1
                     ELSE 0
                 END DESC
                 LIMIT :limit
             """),
-            {"embedding": str(query_embedding), "limit": limit},
+            {
+                "embedding": query_embedding,
+                "limit": limit,
+                "candidates": limit * BINARY_OVERFETCH,
+                "min_sim": min_similarity,
+            },
         )
 
         return [
@@ -323,7 +565,6 @@ class RAGService:
                 citation=self._format_citation(row.title, row.source, row.url),
             )
             for row in result.fetchall()
-            if row.semantic_sim >= min_similarity
         ]
 
     async def _recency_search(
@@ -337,14 +578,15 @@ class RAGService:
         query_embedding = self.embed(query)
 
         result = await db.execute(
-            text("""
+            text(self._candidates_cte() + """
                 SELECT
                     id, title, source, content, url, published_at,
-                    1 - (embedding <=> :embedding) as semantic_sim
+                    semantic_sim
                 FROM documents
-                WHERE embedding IS NOT NULL
+                JOIN candidates USING (id)
+                WHERE embedding IS NOT NULL AND semantic_sim >= :min_sim
                 ORDER BY
-                    (1 - (embedding <=> :embedding)) +
+                    semantic_sim +
                     CASE
                         WHEN published_at > NOW() - INTERVAL '7 days' THEN 0.2
                         WHEN published_at > NOW() - INTERVAL '30 days' THEN 0.1
@@ -352,7 +594,12 @@ class RAGService:
                     END DESC
                 LIMIT :limit
             """),
-            {"embedding": str(query_embedding), "limit": limit},
+            {
+                "embedding": query_embedding,
+                "limit": limit,
+                "candidates": limit * BINARY_OVERFETCH,
+                "min_sim": min_similarity * 0.9,
+            },
         )
 
         return [
@@ -367,7 +614,6 @@ class RAGService:
                 citation=self._format_citation(row.title, row.source, row.url),
             )
             for row in result.fetchall()
-            if row.semantic_sim >= min_similarity * 0.9
         ]
 
     def _extract_keywords(self, query: str) -> list[str]:
@@ -435,6 +681,111 @@ class RAGService:
         return " ".join(parts) if parts else "[Untitled document]"
 
 
+def _normalize(embeddings: np.ndarray) -> np.ndarray:
+    """
+    L2-normalize float32 embeddings in place (last axis) and return them.
+
+    Done in NumPy on the encoder's output instead of encode(normalize_embeddings=True),
+    which normalizes a torch tensor and then copies it out.
+    """
+    norms = np.linalg.norm(embeddings, axis=-1, keepdims=True)
+    np.maximum(norms, 1e-12, out=norms)  # same epsilon as torch's F.normalize
+    return np.divide(embeddings, norms, out=embeddings)
+
+
+def _cpu_count() -> int:
+    """CPUs available to this process."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _embed_workers() -> int:
+    """Concurrent encode workers that fit the CPUs at EMBED_THREADS_PER_WORKER each."""
+    return max(1, _cpu_count() // EMBED_THREADS_PER_WORKER)
+
+
+@lru_cache(maxsize=None)
+def _embedding_backend() -> str:
+    """Which build of the model RAGService.model loads on this machine."""
+    if torch.cuda.is_available():
+        return "torch-fp16"
+    if onnxruntime is not None:
+        return "onnx-int8"
+    return "torch"
+
+
+def _content_hash(text: str) -> str:
+    """
+    Cache key for a text's embedding.
+
+    Includes the model and its backend: the INT8 ONNX, FP32 torch and FP16
+    CUDA builds produce different vectors, so switching either misses
+    instead of mixing embedding spaces.
+    """
+    key = f"{EMBEDDING_MODEL}\0{_embedding_backend()}\0{text}"
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+class _EmbeddingCache:
+    """
+    Persistent sha256(content) -> embedding store backed by SQLite.
+
+    Vectors are stored as float16 blobs to keep the file small. The
+    connection is opened lazily and shared across threads (embed_batch runs
+    via asyncio.to_thread), so access is serialized with a lock.
+    """
+
+    # Stay under SQLite's host-parameter limit on older builds
+    _LOOKUP_BATCH = 500
+
+    def __init__(self, path: Path):
+        self._path = path
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self._path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (hash TEXT PRIMARY KEY, vec BLOB NOT NULL)"
+            )
+        return self._conn
+
+    def get_many(self, keys: list[str]) -> dict[str, np.ndarray]:
+        """Look up cached embeddings; missing keys are absent from the result."""
+        found = {}
+        with self._lock:
+            conn = self._connect()
+            for i in range(0, len(keys), self._LOOKUP_BATCH):
+                batch = keys[i:i + self._LOOKUP_BATCH]
+                rows = conn.execute(
+                    f"SELECT hash, vec FROM embeddings WHERE hash IN ({','.join('?' * len(batch))})",
+                    batch,
+                )
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float16)
+        return found
+
+    def put_many(self, keys: list[str], vectors: np.ndarray) -> None:
+        """Store embeddings for the given keys."""
+        rows = [
+            (key, np.asarray(vector, dtype=np.float16).tobytes())
+            for key, vector in zip(keys, vectors)
+        ]
+        with self._lock:
+            conn = self._connect()
+            conn.executemany("INSERT OR REPLACE INTO embeddings (hash, vec) VALUES (?, ?)", rows)
+            conn.commit()
+
+
+def _sign_bits(embedding: np.ndarray) -> str:
+    """Bit string of the embedding's positive components (pgvector's binary_quantize)."""
+    digits = (embedding > 0).astype(np.uint8) + ord("0")
+    return digits.tobytes().decode("ascii")
+
+
 # Singleton instance
 rag_service = RAGService()
 
@@ -460,7 +811,12 @@ def chunk_text(
     if len(text) <= chunk_size:
         return [text]
 
-    chunks = []
+    chunks = (text[start:end].strip() for start, end in _chunk_bounds(text, chunk_size, overlap))
+    return [c for c in chunks if c]  # Filter empty chunks
+
+
+def _chunk_bounds(text: str, chunk_size: int, overlap: int) -> Iterator[tuple[int, int]]:
+    """(start, end) offsets of each chunk, preferring paragraph then sentence breaks."""
     start = 0
 
     while start < len(text):
@@ -468,19 +824,19 @@ def chunk_text(
 
         # Try to break at a sentence or paragraph boundary
         if end < len(text):
+            # Only breaks past the chunk's midpoint are used, so only scan that half
+            floor = start + chunk_size // 2 + 1
             # Look for paragraph break
-            para_break = text.rfind("\n\n", start, end)
-            if para_break > start + chunk_size // 2:
+            para_break = text.rfind("\n\n", floor, end)
+            if para_break >= 0:
                 end = para_break + 2
             else:
                 # Look for sentence break
-                for punct in [". ", "! ", "? "]:
-                    sent_break = text.rfind(punct, start, end)
-                    if sent_break > start + chunk_size // 2:
+                for punct in (". ", "! ", "? "):
+                    sent_break = text.rfind(punct, floor, end)
+                    if sent_break >= 0:
                         end = sent_break + 2
                         break
 
-        chunks.append(text[start:end].strip())
+        yield start, end
         start = end - overlap
-
-    return [c for c in chunks if c]  # Filter empty chunks
@@ -2,41 +2,89 @@
 PowerplAI API - FastAPI application.
 """
 import asyncio
+import re
+import time
 from contextlib import asynccontextmanager
 from datetime import datetime, date, timedelta
+from functools import lru_cache
+from heapq import nlargest
+from operator import attrgetter
 from fastapi import FastAPI, Depends, HTTPException, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel
-from sqlalchemy import text
+from sqlalchemy import Integer, String, bindparam, text
 from sqlalchemy.ext.asyncio import AsyncSession
 import structlog
 
-# Rate limiting
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
-
 from backend.src.config import get_settings
-from backend.src.db.database import get_db, engine, async_session_maker
-from backend.src.agents.copilot import copilot
+from backend.src.logging_config import configure_logging
+from backend.src.db.database import get_db, engine, async_session_maker, pool_status, warm_pool
+from backend.src.agents.copilot import NO_RESPONSE_MESSAGE, copilot
 from backend.src.agents.rag import rag_service
+from backend.src.api import query_cache
+from backend.src.api.rate_limit import close_redis, init_redis, rate_limit
+from backend.src.api.response_cache import cache_read_responses, invalidate as invalidate_cache
+from backend.src.api.responses import ORJSONResponse
 from backend.src.ingestion.scheduler import (
     get_current_season,
     get_pending_seasons,
     load_progress,
 )
 
-logger = structlog.get_logger()
 settings = get_settings()
 
-# Rate limiter - uses IP address for identification
-limiter = Limiter(key_func=get_remote_address)
+# Render and write log lines on a background thread, off the event loop
+configure_logging(settings.log_level, settings.debug)
+logger = structlog.get_logger()
 
 # Track if auto-update is running
 _auto_update_running = False
 _startup_update_results = None
 
+# Seconds shutdown waits for in-flight update tasks before cancelling them
+BACKGROUND_TASK_SHUTDOWN_TIMEOUT = 10.0
+
+# Background ingestion jobs allowed to run at once: full scrapes (game logs,
+# history, salaries, rosters) vs lighter refreshes (injuries, team stats, ...)
+INGEST_CONCURRENCY = 1
+REFRESH_CONCURRENCY = 2
+# Seconds before a background ingestion job is cancelled
+BACKGROUND_JOB_TIMEOUT = 1800
+
+
+def spawn_background_task(coro, name: str) -> asyncio.Task:
+    """
+    Run coro as a task tracked in app.state.background_tasks.
+
+    Holding the reference keeps the task from being garbage collected
+    mid-run, and lets shutdown wait for (or cancel) whatever is in flight.
+    """
+    task = asyncio.create_task(coro, name=name)
+    app.state.background_tasks.add(task)
+    task.add_done_callback(app.state.background_tasks.discard)
+    task.add_done_callback(_log_task_failure)
+    return task
+
+
+async def run_bounded(semaphore: asyncio.Semaphore, job, name: str) -> None:
+    """
+    Run a background ingestion job under semaphore, giving up after BACKGROUND_JOB_TIMEOUT.
+
+    Bursts of ingestion/refresh requests queue here instead of all hitting
+    external APIs and the DB pool at once and starving request handlers.
+    """
+    async with semaphore:
+        try:
+            await asyncio.wait_for(job(), timeout=BACKGROUND_JOB_TIMEOUT)
+        except TimeoutError:
+            logger.error("background_job_timed_out", job=name, timeout=BACKGROUND_JOB_TIMEOUT)
+
+
+def _log_task_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("background_task_failed", task=task.get_name(), error=str(task.exception()))
+
 
 async def run_startup_updates():
     """
@@ -69,11 +117,23 @@ async def run_startup_updates():
 async def lifespan(app: FastAPI):
     """Startup and shutdown events."""
     logger.info("starting_powerplai_api")
+    app.state.background_tasks = set()
+    app.state.ingest_sem = asyncio.Semaphore(INGEST_CONCURRENCY)
+    app.state.refresh_sem = asyncio.Semaphore(REFRESH_CONCURRENCY)
+
+    # Cluster-wide rate limits when REDIS_URL is set (per-process otherwise)
+    await init_redis(settings.redis_url)
 
     # Run database migrations (ensure tables exist)
     from backend.src.db.migrations import run_migrations
     await run_migrations()
 
+    # Open the pool's connections now rather than on the first requests
+    try:
+        await warm_pool()
+    except Exception as e:
+        logger.warning("db_pool_warmup_failed", error=str(e))
+
     # Create user_feedback table if it doesn't exist
     try:
         async with async_session_maker() as session:
@@ -108,15 +168,16 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning("parlay_table_init_failed", error=str(e))
 
+    # Load the embedding model now so the first RAG query doesn't pay for it
+    try:
+        await rag_service.warmup()
+    except Exception as e:
+        logger.warning("embedding_warmup_failed", error=str(e))
+
     # Run startup updates in background (don't block startup)
     # This includes: schedule refresh, game log catch-up, injuries, team/goalie stats
     if settings.auto_update_enabled:
-        task = asyncio.create_task(run_startup_updates())
-        # Add callback to log any unhandled exceptions
-        def handle_task_exception(t):
-            if t.exception() is not None:
-                logger.error("startup_updates_task_failed", error=str(t.exception()))
-        task.add_done_callback(handle_task_exception)
+        spawn_background_task(run_startup_updates(), name="startup_updates")
 
         # Start background scheduler for ongoing updates (hourly injuries, daily stats)
         try:
@@ -132,11 +193,19 @@ async def lifespan(app: FastAPI):
 
     # Cleanup
     logger.info("shutting_down_powerplai_api")
+    tasks = set(app.state.background_tasks)
+    if tasks:
+        _, pending = await asyncio.wait(tasks, timeout=BACKGROUND_TASK_SHUTDOWN_TIMEOUT)
+        for task in pending:
+            logger.warning("cancelling_background_task", task=task.get_name())
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
     try:
         from backend.src.pipeline.orchestrator import stop_scheduler
         await stop_scheduler()
     except Exception:
         pass
+    await close_redis()
     await engine.dispose()
 
 
@@ -146,12 +215,9 @@ app = FastAPI(
     version="0.1.0",
     lifespan=lifespan,
     redirect_slashes=False,
+    default_response_class=ORJSONResponse,
 )
 
-# Add rate limiter to app state
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
 # CORS for frontend - configurable via CORS_ORIGINS env var
 import os
 cors_origins_env = os.getenv("CORS_ORIGINS", "")
@@ -165,11 +231,17 @@ cors_origins = [
 ]
 # Add production origins from environment
 if cors_origins_env:
-    cors_origins.extend([o.strip() for o in cors_origins_env.split(",") if o.strip()])
+    cors_origins.extend(cors_origins_env.split(","))
+# Browsers send serialized (lower-case) origins; a frozenset makes the
+# middleware's per-request `origin in allow_origins` check a hash lookup
+cors_origins = frozenset(o.strip().lower() for o in cors_origins if o.strip())
 # In debug mode, allow all origins for easier development
 if settings.debug:
     cors_origins = ["*"]
 
+# Short-lived cache (with ETags) for read-only GETs; see response_cache.py
+app.middleware("http")(cache_read_responses)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=cors_origins,
@@ -227,34 +299,91 @@ class DocumentRequest(BaseModel):
     url: str | None = None
 
 
+# -------------------------------------------------------------------------
+# Path/query validation
+# -------------------------------------------------------------------------
+# Checked before any SQL runs: a 1-2 character name matches most of the
+# players table via ILIKE, and malformed teams/seasons can never match.
+
+TEAM_ABBREV_RE = re.compile(r"^[A-Z]{2,4}$")
+SEASON_RE = re.compile(r"^\d{8}$")
+MIN_PLAYER_NAME_LENGTH = 3
+
+
+def validate_team_abbrev(team_abbrev: str) -> str:
+    """Return the upper-cased abbreviation, or raise a 400."""
+    team_abbrev = team_abbrev.upper()
+    if not TEAM_ABBREV_RE.match(team_abbrev):
+        raise HTTPException(status_code=400, detail=f"Invalid team abbreviation '{team_abbrev}'")
+    return team_abbrev
+
+
+def validate_season(season: str | None) -> str | None:
+    """Pass through an 8-digit season like "20242025" (or None), else raise a 400."""
+    if season is not None and not SEASON_RE.match(season):
+        raise HTTPException(status_code=400, detail="Invalid season. Use e.g. 20242025")
+    return season
+
+
+def validate_player_name(player_name: str) -> str:
+    """Return the stripped name if it's long enough to search on, else raise a 400."""
+    player_name = player_name.strip()
+    if len(player_name) < MIN_PLAYER_NAME_LENGTH:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Player name must be at least {MIN_PLAYER_NAME_LENGTH} characters",
+        )
+    return player_name
+
+
 # -------------------------------------------------------------------------
 # Endpoints
 # -------------------------------------------------------------------------
 
 
+# Liveness probes are hit constantly; serve prebuilt bodies
+_HEALTH_BODY = b'{"status":"healthy","service":"powerplai"}'
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "service": "powerplai"}
+    return Response(_HEALTH_BODY, media_type="application/json")
+
+
+@app.get("/health/db-pool")
+async def db_pool_health():
+    """Connection pool usage, for spotting pool exhaustion under load."""
+    return pool_status()
 
 
 @app.get("/api/ping")
 async def ping():
     """Simple ping endpoint for testing connectivity."""
-    return {"pong": True, "timestamp": datetime.now().isoformat()}
+    return Response(_ping_body(int(time.time())), media_type="application/json")
+
+
+@lru_cache(maxsize=1)
+def _ping_body(second: int) -> bytes:
+    """Ping response for one wall-clock second (timestamp to the second)."""
+    timestamp = datetime.fromtimestamp(second).isoformat()
+    return b'{"pong":true,"timestamp":"%s"}' % timestamp.encode()
 
 
-@app.post("/api/query", response_model=QueryResponse)
-@limiter.limit("20/minute")  # 20 queries per minute per IP (protects Anthropic API costs)
+# 20 queries per minute per IP (protects Anthropic API costs)
+@app.post("/api/query", response_model=QueryResponse, dependencies=[rate_limit("20/minute")])
 async def query_copilot(
     request: Request,
+    response: Response,
     query_request: QueryRequest,
     db: AsyncSession = Depends(get_db),
 ):
     """
     Main copilot endpoint - ask any hockey analytics question.
 
-    Rate limited to 20 requests per minute per IP address.
+    Rate limited to 20 requests per minute per IP address. Standalone
+    questions (no history or images) are answered from query_cache when
+    asked before; the Cache-Status header says HIT or MISS.
 
     Examples:
     - "How many goals does Cale Makar have this season?"
@@ -268,6 +397,15 @@ async def query_copilot(
         # Convert image attachments to dict format
         images = [{"data": img.data, "media_type": img.media_type, "name": img.name}
                   for img in query_request.images]
+
+        # Follow-ups and image questions depend on more than the text
+        cacheable = not history and not images
+        if cacheable:
+            cached = await query_cache.lookup(db, query_request.query, query_request.include_rag)
+            if cached is not None:
+                response.headers["Cache-Status"] = "HIT"
+                return QueryResponse.model_construct(**cached)
+
         result = await copilot.query(
             query_request.query,
             db,
@@ -275,12 +413,42 @@ async def query_copilot(
             conversation_history=history,
             images=images,
         )
-        return QueryResponse(**result)
+        if cacheable and result["response"] != NO_RESPONSE_MESSAGE:
+            await query_cache.store(db, query_request.query, query_request.include_rag, result)
+        response.headers["Cache-Status"] = "MISS"
+        return QueryResponse.model_construct(**result)
     except Exception as e:
         logger.error("copilot_query_error", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/query/cache/stats")
+async def query_cache_stats():
+    """Copilot answer cache hit/miss counters for this process."""
+    return query_cache.stats()
+
+
+# Bind parameter types declared once at import, so asyncpg doesn't have to
+# negotiate them for each execute
+_SEASON_PARAM = bindparam("season", type_=String)
+_LIMIT_PARAM = bindparam("limit", type_=Integer)
+_NAME_PARAM = bindparam("name", type_=String)
+
+_PLAYER_STATS_SQL = """
+    SELECT
+        p.name, p.position, p.team_abbrev,
+        s.games_played, s.goals, s.assists, s.points, s.xg
+    FROM players p
+    LEFT JOIN player_season_stats s ON p.id = s.player_id
+    WHERE p.name ILIKE :name {season_filter}
+    ORDER BY s.season DESC LIMIT 5
+"""
+_Q_PLAYER_STATS = text(_PLAYER_STATS_SQL.format(season_filter="")).bindparams(_NAME_PARAM)
+_Q_PLAYER_STATS_SEASON = text(
+    _PLAYER_STATS_SQL.format(season_filter="AND s.season = :season")
+).bindparams(_NAME_PARAM, _SEASON_PARAM)
+
+
 @app.get("/api/players/{player_name}", response_model=list[PlayerStatsResponse])
 async def get_player_stats(
     player_name: str,
@@ -288,30 +456,21 @@ async def get_player_stats(
     db: AsyncSession = Depends(get_db),
 ):
     """Get stats for a specific player."""
-    query = """
-        SELECT
-            p.name, p.position, p.team_abbrev,
-            s.games_played, s.goals, s.assists, s.points, s.xg
-        FROM players p
-        LEFT JOIN player_season_stats s ON p.id = s.player_id
-        WHERE p.name ILIKE :name
-    """
+    player_name = validate_player_name(player_name)
+    season = validate_season(season)
+
+    query = _Q_PLAYER_STATS
     params = {"name": f"%{player_name}%"}
 
     if season:
-        query += " AND s.season = :season"
+        query = _Q_PLAYER_STATS_SEASON
         params["season"] = season
 
-    query += " ORDER BY s.season DESC LIMIT 5"
-
-    result = await db.execute(text(query), params)
-    rows = result.fetchall()
-
-    if not rows:
-        raise HTTPException(status_code=404, detail=f"Player '{player_name}' not found")
-
-    return [
-        PlayerStatsResponse(
+    # Stream from a server-side cursor and build responses row by row;
+    # the rows already have the model's types, so skip validation
+    result = await db.stream(query, params)
+    players = [
+        PlayerStatsResponse.model_construct(
             name=row.name,
             position=row.position,
             team=row.team_abbrev,
@@ -321,9 +480,30 @@ async def get_player_stats(
             points=row.points,
             xg=float(row.xg) if row.xg else None,
         )
-        for row in rows
+        async for row in result
     ]
 
+    if not players:
+        raise HTTPException(status_code=404, detail=f"Player '{player_name}' not found")
+
+    return players
+
+
+# Stats /api/leaders/{stat} accepts, each with its own prebuilt statement so
+# the SQL text is identical across calls and its prepared statement is reused
+LEADER_STATS = ("goals", "assists", "points", "xg", "corsi_for_pct")
+_LEADER_QUERIES = {
+    stat: text(f"""
+        SELECT p.name, p.team_abbrev, s.{stat}, s.games_played
+        FROM players p
+        JOIN player_season_stats s ON p.id = s.player_id
+        WHERE s.season = :season AND s.{stat} IS NOT NULL
+        ORDER BY s.{stat} DESC
+        LIMIT :limit
+    """).bindparams(_SEASON_PARAM, _LIMIT_PARAM)
+    for stat in LEADER_STATS
+}
+
 
 @app.get("/api/leaders/{stat}")
 async def get_stat_leaders(
@@ -337,36 +517,26 @@ async def get_stat_leaders(
 
     Valid stats: goals, assists, points, xg, corsi_for_pct
     """
-    valid_stats = ["goals", "assists", "points", "xg", "corsi_for_pct"]
-    if stat not in valid_stats:
+    season = validate_season(season)
+    query = _LEADER_QUERIES.get(stat)
+    if query is None:
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid stat. Valid options: {valid_stats}"
+            detail=f"Invalid stat. Valid options: {list(LEADER_STATS)}"
         )
 
-    result = await db.execute(
-        text(f"""
-            SELECT p.name, p.team_abbrev, s.{stat}, s.games_played
-            FROM players p
-            JOIN player_season_stats s ON p.id = s.player_id
-            WHERE s.season = :season AND s.{stat} IS NOT NULL
-            ORDER BY s.{stat} DESC
-            LIMIT :limit
-        """),
-        {"season": season, "limit": limit},
-    )
+    result = await db.stream(query, {"season": season, "limit": limit})
 
-    rows = result.fetchall()
-    return [
-        {
-            "rank": i + 1,
+    leaders = []
+    async for row in result:
+        leaders.append({
+            "rank": len(leaders) + 1,
             "name": row.name,
             "team": row.team_abbrev,
             stat: row[2],
             "games_played": row.games_played,
-        }
-        for i, row in enumerate(rows)
-    ]
+        })
+    return leaders
 
 
 @app.post("/api/documents")
@@ -404,16 +574,17 @@ async def search_documents(
 @app.get("/api/data/status")
 async def get_data_status(db: AsyncSession = Depends(get_db)):
     """Get ingestion status and available seasons."""
-    progress = load_progress()
-    pending = get_pending_seasons()
-
-    # Get season counts from database
-    result = await db.execute(text("""
-        SELECT season, COUNT(*) as player_count
-        FROM player_season_stats
-        GROUP BY season
-        ORDER BY season DESC
-    """))
+    # Progress file reads overlap the season count query
+    progress, pending, result = await asyncio.gather(
+        asyncio.to_thread(load_progress),
+        asyncio.to_thread(get_pending_seasons),
+        db.execute(text("""
+            SELECT season, COUNT(*) as player_count
+            FROM player_season_stats
+            GROUP BY season
+            ORDER BY season DESC
+        """)),
+    )
     seasons_in_db = {row[0]: row[1] for row in result.fetchall()}
 
     return {
@@ -428,17 +599,16 @@ async def get_data_status(db: AsyncSession = Depends(get_db)):
 
 
 @app.post("/api/data/update")
-async def trigger_update(background_tasks: BackgroundTasks):
+async def trigger_update():
     """Trigger a manual update of current season data."""
     if _auto_update_running:
         return {"status": "already_running", "message": "Update already in progress"}
 
-    background_tasks.add_task(run_startup_update)
+    spawn_background_task(run_startup_updates(), name="startup_updates")
     return {"status": "started", "message": "Update started in background"}
 
 
-@app.post("/api/data/ingest-history")
-@limiter.limit("1/hour")
+@app.post("/api/data/ingest-history", dependencies=[rate_limit("1/hour")])
 async def ingest_history(
     request: Request,
     background_tasks: BackgroundTasks,
@@ -456,8 +626,9 @@ async def ingest_history(
         async with async_session_maker() as db:
             result = await ingest_historical_seasons(db, start_year=start_year, end_year=end_year)
             logger.info("historical_ingestion_complete", result=result)
+        invalidate_cache("/api/leaders/", "/api/seasons")
 
-    background_tasks.add_task(run_ingestion)
+    background_tasks.add_task(run_bounded, app.state.ingest_sem, run_ingestion, "historical_ingestion")
     end_display = end_year or "latest completed season"
     return {
         "status": "started",
@@ -492,8 +663,7 @@ async def get_pipeline_status():
     }
 
 
-@app.post("/api/pipeline/run/{pipeline_name}")
-@limiter.limit("5/minute")
+@app.post("/api/pipeline/run/{pipeline_name}", dependencies=[rate_limit("5/minute")])
 async def run_single_pipeline(
     request: Request,
     pipeline_name: str,
@@ -517,8 +687,7 @@ async def run_single_pipeline(
     return result.to_dict()
 
 
-@app.post("/api/pipeline/run-all")
-@limiter.limit("2/minute")
+@app.post("/api/pipeline/run-all", dependencies=[rate_limit("2/minute")])
 async def run_all_pipelines(
     request: Request,
     background_tasks: BackgroundTasks,
@@ -592,11 +761,11 @@ async def get_todays_games(db: AsyncSession = Depends(get_db)):
     """Get today's scheduled games."""
     from backend.src.ingestion.games import get_todays_games as fetch_games
     games = await fetch_games(db)
-    return {"date": date.today().isoformat(), "games": games}
+    return {"date": date.today(), "games": games}
 
 
-@app.post("/api/games/refresh")
-@limiter.limit("5/minute")  # Limit refresh calls to prevent API abuse
+# Limit refresh calls to prevent API abuse
+@app.post("/api/games/refresh", dependencies=[rate_limit("5/minute")])
 async def refresh_games(
     request: Request,
     background_tasks: BackgroundTasks,
@@ -605,6 +774,7 @@ async def refresh_games(
     """Refresh today's game schedule from NHL API. Rate limited to 5/minute."""
     from backend.src.ingestion.games import refresh_todays_schedule
     games_count = await refresh_todays_schedule(db)
+    invalidate_cache("/api/games/today")
     return {"status": "success", "games_refreshed": games_count}
 
 
@@ -614,8 +784,8 @@ class GameLogIngestionRequest(BaseModel):
     limit: int | None = None
 
 
-@app.post("/api/games/ingest-logs")
-@limiter.limit("2/minute")  # Heavy operation - strict limit
+# Heavy operation - strict limit
+@app.post("/api/games/ingest-logs", dependencies=[rate_limit("2/minute")])
 async def ingest_game_logs(
     request: Request,
     ingest_request: GameLogIngestionRequest,
@@ -640,7 +810,7 @@ async def ingest_game_logs(
                 limit=ingest_request.limit
             )
 
-    background_tasks.add_task(run_ingestion)
+    background_tasks.add_task(run_bounded, app.state.ingest_sem, run_ingestion, "game_log_ingestion")
     return {
         "status": "started",
         "message": f"Game log ingestion started for season {season}",
@@ -667,6 +837,7 @@ async def ingest_team_goalie_stats(
     Ingest team and goalie statistics from NHL Stats API.
     This includes goalie save %, GAA, and team pace metrics.
     """
+    from backend.src.agents.predictions import prediction_engine
     from backend.src.ingestion.team_goalie_stats import refresh_all_stats
     from backend.src.ingestion.scheduler import get_current_season
 
@@ -675,8 +846,10 @@ async def ingest_team_goalie_stats(
     async def run_ingestion():
         result = await refresh_all_stats(season)
         logger.info("team_goalie_stats_ingested", **result)
+        invalidate_cache("/api/stats/")
+        prediction_engine.invalidate_matchup_contexts()
 
-    background_tasks.add_task(run_ingestion)
+    background_tasks.add_task(run_bounded, app.state.refresh_sem, run_ingestion, "team_goalie_stats")
     return {
         "status": "started",
         "message": f"Team and goalie stats ingestion started for season {season}",
@@ -693,14 +866,15 @@ async def get_team_stats(
     from backend.src.ingestion.team_goalie_stats import get_team_pace
     from backend.src.ingestion.scheduler import get_current_season
 
-    season = season or f"{get_current_season()}{int(get_current_season()) + 1}"
-    pace = await get_team_pace(db, team_abbrev.upper(), season)
+    team_abbrev = validate_team_abbrev(team_abbrev)
+    season = validate_season(season) or f"{get_current_season()}{int(get_current_season()) + 1}"
+    pace = await get_team_pace(db, team_abbrev, season)
 
     if not pace:
         raise HTTPException(status_code=404, detail=f"No stats found for team {team_abbrev}")
 
     return {
-        "team": team_abbrev.upper(),
+        "team": team_abbrev,
         "season": season,
         **pace
     }
@@ -716,14 +890,15 @@ async def get_team_goalie_stats(
     from backend.src.ingestion.team_goalie_stats import get_goalie_stats
     from backend.src.ingestion.scheduler import get_current_season
 
-    season = season or f"{get_current_season()}{int(get_current_season()) + 1}"
-    goalie = await get_goalie_stats(db, team_abbrev.upper(), season)
+    team_abbrev = validate_team_abbrev(team_abbrev)
+    season = validate_season(season) or f"{get_current_season()}{int(get_current_season()) + 1}"
+    goalie = await get_goalie_stats(db, team_abbrev, season)
 
     if not goalie:
         raise HTTPException(status_code=404, detail=f"No goalie stats found for team {team_abbrev}")
 
     return {
-        "team": team_abbrev.upper(),
+        "team": team_abbrev,
         "season": season,
         **goalie
     }
@@ -781,8 +956,7 @@ async def get_team_injuries(
     return {"team": team_abbrev.upper(), "injuries": injuries, "count": len(injuries)}
 
 
-@app.post("/api/injuries/refresh")
-@limiter.limit("5/minute")
+@app.post("/api/injuries/refresh", dependencies=[rate_limit("5/minute")])
 async def refresh_injuries(request: Request, background_tasks: BackgroundTasks):
     """Trigger a refresh of injury data from ESPN. Rate limited to 5/minute."""
     from backend.src.ingestion.espn_injuries import refresh_espn_injuries
@@ -790,8 +964,9 @@ async def refresh_injuries(request: Request, background_tasks: BackgroundTasks):
     async def run_refresh():
         result = await refresh_espn_injuries()
         logger.info("espn_injuries_refreshed", **result)
+        invalidate_cache("/api/injuries")
 
-    background_tasks.add_task(run_refresh)
+    background_tasks.add_task(run_bounded, app.state.refresh_sem, run_refresh, "injury_refresh")
     return {"status": "started", "message": "ESPN injury refresh started in background"}
 
 
@@ -823,8 +998,8 @@ async def get_best_value_contracts(
     return {"min_points_threshold": min_points, "players": players}
 
 
-@app.post("/api/salary/refresh")
-@limiter.limit("2/hour")  # Very heavy operation - strict limit
+# Very heavy operation - strict limit
+@app.post("/api/salary/refresh", dependencies=[rate_limit("2/hour")])
 async def refresh_salary_data(
     request: Request,
     background_tasks: BackgroundTasks,
@@ -849,7 +1024,7 @@ async def refresh_salary_data(
             result = await ingest_all_salaries(db, source=source)
             logger.info("salary_data_refreshed", source=source, **result)
 
-    background_tasks.add_task(run_refresh)
+    background_tasks.add_task(run_bounded, app.state.ingest_sem, run_refresh, "salary_refresh")
     return {
         "status": "started",
         "source": source,
@@ -933,7 +1108,7 @@ async def test_salary_scrape(team_abbrev: str):
 @app.get("/api/updates/status")
 async def get_update_status():
     """Get status of startup updates and last update times."""
-    progress = load_progress()
+    progress = await asyncio.to_thread(load_progress)
 
     return {
         "is_running": _auto_update_running,
@@ -946,17 +1121,17 @@ async def get_update_status():
 
 
 @app.post("/api/updates/run")
-async def trigger_updates(background_tasks: BackgroundTasks):
+async def trigger_updates():
     """Manually trigger startup updates."""
     if _auto_update_running:
         return {"status": "already_running", "message": "Updates already in progress"}
 
-    background_tasks.add_task(run_startup_updates)
+    spawn_background_task(run_startup_updates(), name="startup_updates")
     return {"status": "started", "message": "Updates started in background"}
 
 
 @app.post("/api/updates/daily")
-async def trigger_daily_updates(background_tasks: BackgroundTasks):
+async def trigger_daily_updates():
     """Trigger full daily updates (more aggressive than startup)."""
     from backend.src.ingestion.startup_updates import run_daily_updates
 
@@ -971,12 +1146,11 @@ async def trigger_daily_updates(background_tasks: BackgroundTasks):
         finally:
             _auto_update_running = False
 
-    background_tasks.add_task(run_daily)
+    spawn_background_task(run_daily(), name="daily_updates")
     return {"status": "started", "message": "Daily updates started in background"}
 
 
-@app.post("/api/rosters/sync")
-@limiter.limit("2/hour")
+@app.post("/api/rosters/sync", dependencies=[rate_limit("2/hour")])
 async def sync_rosters(request: Request, background_tasks: BackgroundTasks):
     """
     Sync team rosters from NHL API.
@@ -993,12 +1167,11 @@ async def sync_rosters(request: Request, background_tasks: BackgroundTasks):
         async with async_session_maker() as db:
             await sync_team_rosters(db, season)
 
-    background_tasks.add_task(run_sync)
+    background_tasks.add_task(run_bounded, app.state.ingest_sem, run_sync, "roster_sync")
     return {"status": "started", "message": "Roster sync started in background"}
 
 
-@app.post("/api/rosters/sync/{team_abbrev}")
-@limiter.limit("10/hour")
+@app.post("/api/rosters/sync/{team_abbrev}", dependencies=[rate_limit("10/hour")])
 async def sync_single_team_roster(
     team_abbrev: str,
     request: Request,
@@ -1015,8 +1188,7 @@ async def sync_single_team_roster(
     return {"status": "complete", "team": team_abbrev.upper(), **stats}
 
 
-@app.post("/api/stats/moneypuck/refresh")
-@limiter.limit("2/hour")
+@app.post("/api/stats/moneypuck/refresh", dependencies=[rate_limit("2/hour")])
 async def refresh_moneypuck_stats(request: Request, background_tasks: BackgroundTasks):
     """
     Refresh MoneyPuck advanced stats (xG, Corsi, etc.) for current season.
@@ -1032,14 +1204,34 @@ async def refresh_moneypuck_stats(request: Request, background_tasks: Background
     async def run_refresh():
         async with async_session_maker() as db:
             await update_moneypuck_stats(db, season_year)
+        invalidate_cache("/api/leaders/")
 
-    background_tasks.add_task(run_refresh)
+    background_tasks.add_task(run_bounded, app.state.refresh_sem, run_refresh, "moneypuck_refresh")
     return {
         "status": "started",
         "message": f"MoneyPuck stats refresh started for {season_year}-{int(season_year)+1} season"
     }
 
 
+_GAME_LOGS_SQL = """
+    SELECT
+        p.name, gl.game_date, gl.opponent, gl.home_away,
+        gl.goals, gl.assists, gl.points, gl.shots, gl.toi,
+        gl.powerplay_goals, gl.powerplay_points, gl.plus_minus
+    FROM game_logs gl
+    JOIN players p ON gl.player_id = p.id
+    WHERE p.name ILIKE :name {season_filter}
+    ORDER BY gl.game_date DESC
+    LIMIT :limit
+"""
+_Q_GAME_LOGS = text(_GAME_LOGS_SQL.format(season_filter="")).bindparams(
+    _NAME_PARAM, _LIMIT_PARAM
+)
+_Q_GAME_LOGS_SEASON = text(
+    _GAME_LOGS_SQL.format(season_filter="AND gl.season = :season")
+).bindparams(_NAME_PARAM, _SEASON_PARAM, _LIMIT_PARAM)
+
+
 @app.get("/api/games/logs/{player_name}")
 async def get_player_game_logs(
     player_name: str,
@@ -1048,49 +1240,36 @@ async def get_player_game_logs(
     db: AsyncSession = Depends(get_db)
 ):
     """Get recent game logs for a player."""
-    from backend.src.ingestion.scheduler import get_current_season
+    player_name = validate_player_name(player_name)
+    season = validate_season(season)
 
-    season_filter = ""
+    query = _Q_GAME_LOGS
     params = {"name": f"%{player_name}%", "limit": limit}
 
     if season:
-        season_filter = "AND gl.season = :season"
+        query = _Q_GAME_LOGS_SEASON
         params["season"] = season
 
-    result = await db.execute(
-        text(f"""
-            SELECT
-                p.name, gl.game_date, gl.opponent, gl.home_away,
-                gl.goals, gl.assists, gl.points, gl.shots, gl.toi,
-                gl.powerplay_goals, gl.powerplay_points, gl.plus_minus
-            FROM game_logs gl
-            JOIN players p ON gl.player_id = p.id
-            WHERE p.name ILIKE :name {season_filter}
-            ORDER BY gl.game_date DESC
-            LIMIT :limit
-        """),
-        params
-    )
+    result = await db.stream(query, params)
 
-    rows = result.fetchall()
     return {
         "player": player_name,
         "game_logs": [
             {
                 "name": row.name,
-                "date": row.game_date.isoformat(),
+                "date": row.game_date,
                 "opponent": row.opponent,
                 "home_away": row.home_away,
                 "goals": row.goals,
                 "assists": row.assists,
                 "points": row.points,
                 "shots": row.shots,
-                "toi": float(row.toi) if row.toi else None,
+                "toi": round(row.toi / 60, 2) if row.toi else None,  # stored as seconds
                 "pp_goals": row.powerplay_goals,
                 "pp_points": row.powerplay_points,
                 "plus_minus": row.plus_minus,
             }
-            for row in rows
+            async for row in result
         ]
     }
 
@@ -1100,41 +1279,64 @@ async def get_player_game_logs(
 # -------------------------------------------------------------------------
 
 
+# Every PlayerPrediction field prediction_to_dict emits, fetched in one call
+_prediction_fields = attrgetter(
+    "player_name", "player_id", "team", "opponent", "is_home",
+    "prob_goal", "prob_point", "prob_multi_point",
+    "expected_goals", "expected_assists", "expected_points", "expected_shots",
+    "recent_form_ppg", "season_avg_ppg", "h2h_ppg",
+    "home_away_adjustment", "goalie_adjustment", "pace_adjustment",
+    "opponent_goalie", "opponent_goalie_sv_pct",
+    "confidence", "confidence_score", "games_analyzed", "factors",
+)
+
+_by_prob_goal = attrgetter("prob_goal")
+
+
 def prediction_to_dict(pred) -> dict:
     """Convert PlayerPrediction to API-friendly dict."""
+    (
+        player_name, player_id, team, opponent, is_home,
+        prob_goal, prob_point, prob_multi_point,
+        expected_goals, expected_assists, expected_points, expected_shots,
+        recent_form_ppg, season_avg_ppg, h2h_ppg,
+        home_away_adjustment, goalie_adjustment, pace_adjustment,
+        opponent_goalie, opponent_goalie_sv_pct,
+        confidence, confidence_score, games_analyzed, factors,
+    ) = _prediction_fields(pred)
     return {
-        "player_name": pred.player_name,
-        "player_id": pred.player_id,
-        "team": pred.team,
-        "opponent": pred.opponent,
-        "is_home": pred.is_home,
+        "player_name": player_name,
+        "player_id": player_id,
+        "team": team,
+        "opponent": opponent,
+        "is_home": is_home,
         "probabilities": {
-            "goal": pred.prob_goal,
-            "point": pred.prob_point,
-            "multi_point": pred.prob_multi_point,
+            "goal": prob_goal,
+            "point": prob_point,
+            "multi_point": prob_multi_point,
         },
         "expected": {
-            "goals": pred.expected_goals,
-            "assists": pred.expected_assists,
-            "points": pred.expected_points,
-            "shots": pred.expected_shots,
+            "goals": expected_goals,
+            "assists": expected_assists,
+            "points": expected_points,
+            "shots": expected_shots,
         },
         "model_components": {
-            "recent_form_ppg": pred.recent_form_ppg,
-            "season_avg_ppg": pred.season_avg_ppg,
-            "h2h_ppg": pred.h2h_ppg,
-            "home_away_adjustment": pred.home_away_adjustment,
-            "goalie_adjustment": pred.goalie_adjustment,
-            "pace_adjustment": pred.pace_adjustment,
+            "recent_form_ppg": recent_form_ppg,
+            "season_avg_ppg": season_avg_ppg,
+            "h2h_ppg": h2h_ppg,
+            "home_away_adjustment": home_away_adjustment,
+            "goalie_adjustment": goalie_adjustment,
+            "pace_adjustment": pace_adjustment,
         },
         "matchup_info": {
-            "opponent_goalie": pred.opponent_goalie,
-            "opponent_goalie_sv_pct": pred.opponent_goalie_sv_pct,
+            "opponent_goalie": opponent_goalie,
+            "opponent_goalie_sv_pct": opponent_goalie_sv_pct,
         },
-        "confidence": pred.confidence,
-        "confidence_score": pred.confidence_score,
-        "games_analyzed": pred.games_analyzed,
-        "factors": pred.factors,
+        "confidence": confidence,
+        "confidence_score": confidence_score,
+        "games_analyzed": games_analyzed,
+        "factors": factors,
     }
 
 
@@ -1169,8 +1371,10 @@ async def get_matchup_predictions(
         db, home_team.upper(), away_team.upper(), parsed_date, top_n
     )
 
-    return {
-        "game_date": prediction.game_date.isoformat(),
+    # Only plain JSON types here, so hand the payload straight to orjson
+    # rather than letting jsonable_encoder walk every prediction dict first
+    return ORJSONResponse({
+        "game_date": prediction.game_date,
         "home_team": prediction.home_team,
         "away_team": prediction.away_team,
         "venue": prediction.venue,
@@ -1186,7 +1390,7 @@ async def get_matchup_predictions(
         "top_scorers": [prediction_to_dict(p) for p in prediction.top_scorers],
         "home_players": [prediction_to_dict(p) for p in prediction.home_players],
         "away_players": [prediction_to_dict(p) for p in prediction.away_players],
-    }
+    })
 
 
 @app.get("/api/predictions/player/{player_name}")
@@ -1223,7 +1427,69 @@ async def get_player_prediction(
     if not prediction:
         raise HTTPException(status_code=404, detail=f"Player '{player_name}' not found")
 
-    return prediction_to_dict(prediction)
+    return ORJSONResponse(prediction_to_dict(prediction))
+
+
+# Matchups predicted at once when /api/predictions/tonight falls back to
+# per-game predictions. Each holds a session plus one per team while
+# waiting on short-lived per-player ones.
+TONIGHT_CONCURRENT_GAMES = 4
+
+# Static part of /api/predictions/tonight, built once rather than per request
+_TONIGHT_METHODOLOGY = {
+    "model": "PowerplAI Scoring Model v1",
+    "description": "Weighted ensemble model combining multiple factors to predict player scoring outcomes",
+    "data_sources": [
+        "NHL Official API (player stats, game logs, schedule)",
+        "ESPN Injuries API (injury status)",
+        "Team/goalie statistics (current season)",
+    ],
+    "model_weights": {
+        "recent_form": 0.30,
+        "season_baseline": 0.25,
+        "head_to_head_history": 0.15,
+        "home_away_splits": 0.10,
+        "goalie_matchup": 0.10,
+        "team_pace": 0.10,
+    },
+    "confidence_factors": [
+        "Games played this season (min 10 for high confidence)",
+        "Recent form consistency",
+        "Historical matchup data availability",
+    ],
+    "notes": [
+        "Probabilities based on expected goals/points and historical conversion rates",
+        "Goalie adjustment uses opponent starter's save percentage vs league average",
+        "Recent form weighted toward last 5 games",
+    ],
+}
+
+
+async def _predict_games_individually(games: list[dict], top_n: int) -> list:
+    """
+    Predict each game on its own session, concurrently.
+
+    Failed games come back as exceptions in place of their prediction.
+    """
+    from backend.src.agents.predictions import prediction_engine
+
+    # Each matchup fans out to further sessions, so cap how many run at once
+    # to keep held connections well under the pool size.
+    game_slots = asyncio.Semaphore(TONIGHT_CONCURRENT_GAMES)
+
+    async def predict_game(game: dict):
+        async with game_slots, async_session_maker() as game_db:
+            return await prediction_engine.get_matchup_prediction(
+                game_db,
+                game["home_team"],
+                game["away_team"],
+                date.today(),
+                top_n=top_n,
+            )
+
+    return await asyncio.gather(
+        *(predict_game(game) for game in games), return_exceptions=True
+    )
 
 
 @app.get("/api/predictions/tonight")
@@ -1247,74 +1513,52 @@ async def get_tonight_predictions(
 
     if not games:
         return {
-            "date": date.today().isoformat(),
+            "date": date.today(),
             "message": "No games scheduled today",
             "games": [],
             "top_scorers": [],
         }
 
+    # All matchups in a handful of queries rather than several per game
+    try:
+        matchups = await prediction_engine.get_matchup_predictions_batch(
+            db,
+            [(game["home_team"], game["away_team"]) for game in games],
+            date.today(),
+            top_n=top_n,
+        )
+    except Exception as e:
+        logger.warning("batch_matchup_prediction_failed", error=str(e))
+        await db.rollback()
+        matchups = await _predict_games_individually(games, top_n)
+
     all_top_scorers = []
     game_predictions = []
 
-    for game in games:
-        try:
-            matchup = await prediction_engine.get_matchup_prediction(
-                db,
-                game["home_team"],
-                game["away_team"],
-                date.today(),
-                top_n=top_n,
-            )
-            game_predictions.append({
-                "home_team": game["home_team"],
-                "away_team": game["away_team"],
-                "venue": game["venue"],
-                "start_time": game["start_time"],
-                "state": game["state"],
-                "top_scorers": [prediction_to_dict(p) for p in matchup.top_scorers[:3]],
-            })
-            all_top_scorers.extend(matchup.top_scorers)
-        except Exception as e:
-            logger.warning("matchup_prediction_failed", game=game, error=str(e))
+    for game, matchup in zip(games, matchups):
+        if isinstance(matchup, Exception):
+            logger.warning("matchup_prediction_failed", game=game, error=str(matchup))
             continue
+        game_predictions.append({
+            "home_team": game["home_team"],
+            "away_team": game["away_team"],
+            "venue": game["venue"],
+            "start_time": game["start_time"],
+            "state": game["state"],
+            "top_scorers": [prediction_to_dict(p) for p in matchup.top_scorers[:3]],
+        })
+        all_top_scorers.extend(matchup.top_scorers)
 
-    # Get overall top scorers
-    all_top_scorers.sort(key=lambda p: p.prob_goal, reverse=True)
-    overall_top = all_top_scorers[:10]
+    # Get overall top scorers (selection, not a full sort)
+    overall_top = nlargest(10, all_top_scorers, key=_by_prob_goal)
 
-    return {
-        "date": date.today().isoformat(),
+    return ORJSONResponse({
+        "date": date.today(),
         "games_count": len(game_predictions),
         "games": game_predictions,
         "top_scorers_overall": [prediction_to_dict(p) for p in overall_top],
-        "methodology": {
-            "model": "PowerplAI Scoring Model v1",
-            "description": "Weighted ensemble model combining multiple factors to predict player scoring outcomes",
-            "data_sources": [
-                "NHL Official API (player stats, game logs, schedule)",
-                "ESPN Injuries API (injury status)",
-                "Team/goalie statistics (current season)",
-            ],
-            "model_weights": {
-                "recent_form": 0.30,
-                "season_baseline": 0.25,
-                "head_to_head_history": 0.15,
-                "home_away_splits": 0.10,
-                "goalie_matchup": 0.10,
-                "team_pace": 0.10,
-            },
-            "confidence_factors": [
-                "Games played this season (min 10 for high confidence)",
-                "Recent form consistency",
-                "Historical matchup data availability",
-            ],
-            "notes": [
-                "Probabilities based on expected goals/points and historical conversion rates",
-                "Goalie adjustment uses opponent starter's save percentage vs league average",
-                "Recent form weighted toward last 5 games",
-            ],
-        },
-    }
+        "methodology": _TONIGHT_METHODOLOGY,
+    })
 
 
 # -------------------------------------------------------------------------
@@ -1439,7 +1683,7 @@ async def get_value_bets(
 
     if not matchups:
         return {
-            "generated_at": datetime.utcnow().isoformat(),
+            "generated_at": datetime.utcnow(),
             "games_analyzed": 0,
             "value_bets": [],
             "message": "No games scheduled tonight"
@@ -1541,7 +1785,7 @@ async def get_edge_summary(db: AsyncSession = Depends(get_db)):
     regression = await tracker.get_regression_report(top_n=5)
 
     return {
-        "generated_at": datetime.utcnow().isoformat(),
+        "generated_at": datetime.utcnow(),
         "tonight": {
             "games": edges.game_count,
             "a_plus_edges": edges.a_plus_edges,
@@ -1675,6 +1919,26 @@ async def get_olympic_player(
     }
 
 
+# Static methodology block of the Olympic prediction response
+_OLYMPIC_METHODOLOGY = {
+    "description": "Specialized model for short tournament format",
+    "key_differences_from_nhl": [
+        "Goalie matchup weighted 2x (20% vs 10% in NHL model)",
+        "In-tournament form weighted higher than season stats",
+        "Elimination game pressure coefficients applied",
+        "Country strength differential (roster composition) factored in",
+        "Cross-league normalization for non-NHL players",
+    ],
+    "weights": {
+        "nhl_baseline": 0.45,
+        "olympic_form": 0.20,
+        "goalie_matchup": 0.20,
+        "country_strength": 0.10,
+        "international_experience": 0.05,
+    },
+}
+
+
 @app.get("/api/olympics/predictions/{home_country}/{away_country}")
 async def get_olympic_matchup_prediction(
     home_country: str,
@@ -1710,29 +1974,12 @@ async def get_olympic_matchup_prediction(
 
     return {
         "model": "PowerplAI Olympic Prediction Model v1",
-        "methodology": {
-            "description": "Specialized model for short tournament format",
-            "key_differences_from_nhl": [
-                "Goalie matchup weighted 2x (20% vs 10% in NHL model)",
-                "In-tournament form weighted higher than season stats",
-                "Elimination game pressure coefficients applied",
-                "Country strength differential (roster composition) factored in",
-                "Cross-league normalization for non-NHL players",
-            ],
-            "weights": {
-                "nhl_baseline": 0.45,
-                "olympic_form": 0.20,
-                "goalie_matchup": 0.20,
-                "country_strength": 0.10,
-                "international_experience": 0.05,
-            }
-        },
+        "methodology": _OLYMPIC_METHODOLOGY,
         **predictions
     }
 
 
-@app.post("/api/olympics/refresh")
-@limiter.limit("10/hour")
+@app.post("/api/olympics/refresh", dependencies=[rate_limit("10/hour")])
 async def refresh_olympic_data(
     request: Request,
     db: AsyncSession = Depends(get_db),
@@ -1794,7 +2041,7 @@ async def get_olympic_status():
     return {
         "tournament": "Milano Cortina 2026",
         "is_active": is_active,
-        "last_update": last_update.isoformat() if last_update else None,
+        "last_update": last_update,
         "tournament_dates": {
             "start": "2026-02-08",
             "end": "2026-02-22",
@@ -2178,7 +2425,7 @@ async def log_tonight_predictions(
 
     return {
         "status": "success",
-        "date": date.today().isoformat(),
+        "date": date.today(),
         "games_processed": games_processed,
         "predictions_logged": total_logged,
         "message": f"Logged {total_logged} predictions for {games_processed} games. Run /api/audit/validate/{date.today().isoformat()} after games complete."
@@ -2225,7 +2472,7 @@ async def run_daily_audit_now(
             result = await run_daily_audit(session)
             logger.info("manual_daily_audit_complete", **result)
 
-    background_tasks.add_task(run_audit)
+    background_tasks.add_task(run_bounded, app.state.refresh_sem, run_audit, "daily_audit")
     return {
         "status": "started",
         "message": "Daily audit started in background. Check /api/audit/stats for results."
@@ -2520,8 +2767,7 @@ class FeedbackRequest(BaseModel):
     response_preview: str = ""  # First ~200 chars of the AI response
 
 
-@app.post("/api/feedback")
-@limiter.limit("30/minute")
+@app.post("/api/feedback", dependencies=[rate_limit("30/minute")])
 async def submit_feedback(
     request: Request,
     body: FeedbackRequest,
@@ -2727,17 +2973,18 @@ async def get_player_playoff_record(
 if settings.debug:
     @app.get("/api/debug/tables")
     async def debug_tables(db: AsyncSession = Depends(get_db)):
-        """List all tables and row counts."""
+        """
+        List all tables and their approximate row counts.
+
+        Reads the planner's pg_class estimates in one round-trip instead of
+        a COUNT(*) scan per table (-1 means the table was never analyzed).
+        """
         result = await db.execute(text("""
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema = 'public'
+            SELECT c.relname, c.reltuples::bigint
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = 'public' AND c.relkind = 'r'
         """))
-        tables = [row[0] for row in result.fetchall()]
-
-        counts = {}
-        for table in tables:
-            count_result = await db.execute(text(f"SELECT COUNT(*) FROM {table}"))
-            counts[table] = count_result.scalar()
+        counts = {row[0]: row[1] for row in result.fetchall()}
 
         return counts
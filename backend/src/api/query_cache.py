@@ -0,0 +1,208 @@
+"""
+Answer cache in front of the copilot's /api/query endpoint.
+
+A copilot answer costs a classification call plus a generation call to
+Anthropic, seconds and real money, while many questions are asked again
+nearly verbatim ("How many goals does Makar have?"). Standalone questions
+(no conversation history, no images) are looked up in two tiers:
+
+- exact: sha256 of the normalized question + include_rag, in an in-process
+  TTL/LRU map
+- semantic: the nearest stored question by embedding (rag_cache table,
+  cosine similarity >= SEMANTIC_THRESHOLD), shared by all workers. Near
+  neighbours can still ask about another player, stat or season ("Quinn
+  Hughes" vs "Jack Hughes", "this season" vs "last season"), so a semantic
+  hit also needs the same query_entities() as the question
+
+Answers are kept for CACHE_TTL seconds, which also bounds how stale a
+cached stat line can get; prune() drops expired rows and runs on the
+scheduler.
+"""
+import asyncio
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+import orjson
+import structlog
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.src.agents.rag import rag_service
+
+logger = structlog.get_logger()
+
+CACHE_TTL = 3600
+CACHE_MAX_ENTRIES = 500
+# Cosine similarity above which a stored question counts as the same one
+SEMANTIC_THRESHOLD = 0.95
+# Nearest stored questions checked for one with matching entities
+SEMANTIC_CANDIDATES = 5
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_TOKEN_RE = re.compile(r"[a-z0-9%+'\-]+")
+
+# How a question is phrased rather than what it asks about; every other word
+# (names, teams, stats, seasons, qualifiers like "this"/"last") is an entity
+PHRASING_WORDS = frozenset("""
+    a an the is are was were be been being am do does did has have had having
+    how many much what whats which who whos whom when where why can could would
+    should will shall may might must i me my we our you your he him his she her
+    it its they them their tell show give list get find about of in on at for
+    to from by with so far and or vs versus than there here please currently
+    right now total number count scored put up got stats statistics
+""".split())
+
+_Q_NEAREST = text("""
+    SELECT query, response, 1 - (embedding <=> CAST(:embedding AS vector(384))) AS similarity
+    FROM rag_cache
+    WHERE include_rag = :include_rag AND created_at >= :cutoff
+    ORDER BY embedding <=> CAST(:embedding AS vector(384))
+    LIMIT :candidates
+""")
+
+_Q_STORE = text("""
+    INSERT INTO rag_cache (query_hash, include_rag, query, response, embedding, created_at)
+    VALUES (
+        :query_hash, :include_rag, :query, :response,
+        CAST(:embedding AS vector(384)), :created_at
+    )
+    ON CONFLICT (query_hash) DO UPDATE
+    SET response = EXCLUDED.response,
+        embedding = EXCLUDED.embedding,
+        created_at = EXCLUDED.created_at
+""")
+
+_Q_PRUNE = text("DELETE FROM rag_cache WHERE created_at < :cutoff")
+
+
+@dataclass(slots=True)
+class _Entry:
+    expires_at: float
+    result: dict
+
+
+# key -> entry, least recently used first
+_entries: OrderedDict[str, _Entry] = OrderedDict()
+_stats = {"exact_hits": 0, "semantic_hits": 0, "misses": 0}
+
+
+def normalize_query(query: str) -> str:
+    """Case, whitespace and trailing punctuation don't change the answer."""
+    return _WHITESPACE_RE.sub(" ", query).strip().rstrip("?!. ").lower()
+
+
+def cache_key(normalized: str, include_rag: bool) -> str:
+    return hashlib.sha256(f"{int(include_rag)}\0{normalized}".encode()).hexdigest()
+
+
+def query_entities(normalized: str) -> frozenset[str]:
+    """
+    The words of a normalized question that pick out what it asks about.
+
+    Player, team and stat names, seasons and their qualifiers all survive;
+    only PHRASING_WORDS and possessives are dropped, so two questions with
+    equal entities differ in wording alone.
+    """
+    words = _TOKEN_RE.findall(normalized.replace("\u2019", "'"))
+    tokens = (word.removesuffix("'s").strip("'") for word in words)
+    return frozenset(token for token in tokens if token and token not in PHRASING_WORDS)
+
+
+def _remember(key: str, result: dict) -> None:
+    _entries[key] = _Entry(expires_at=time.monotonic() + CACHE_TTL, result=result)
+    _entries.move_to_end(key)
+    if len(_entries) > CACHE_MAX_ENTRIES:
+        _entries.popitem(last=False)
+
+
+async def lookup(db: AsyncSession, query: str, include_rag: bool) -> dict | None:
+    """Cached copilot result for query, or None on a miss."""
+    normalized = normalize_query(query)
+    key = cache_key(normalized, include_rag)
+
+    entry = _entries.get(key)
+    if entry is not None:
+        if entry.expires_at > time.monotonic():
+            _entries.move_to_end(key)
+            _stats["exact_hits"] += 1
+            return entry.result
+        del _entries[key]
+
+    try:
+        rows = (await db.execute(_Q_NEAREST, {
+            "embedding": await asyncio.to_thread(rag_service.embed, normalized),
+            "include_rag": include_rag,
+            "cutoff": datetime.utcnow() - timedelta(seconds=CACHE_TTL),
+            "candidates": SEMANTIC_CANDIDATES,
+        })).all()
+    except Exception as e:
+        # The cache is an optimization; fall through to the copilot
+        logger.warning("query_cache_lookup_failed", error=str(e))
+        await db.rollback()
+        rows = []
+
+    entities = query_entities(normalized)
+    row = next(
+        (
+            row for row in rows
+            if row.similarity >= SEMANTIC_THRESHOLD and query_entities(row.query) == entities
+        ),
+        None,
+    )
+    if row is None:
+        _stats["misses"] += 1
+        return None
+
+    result = orjson.loads(row.response)
+    _remember(key, result)
+    _stats["semantic_hits"] += 1
+    logger.debug("query_cache_semantic_hit", similarity=round(row.similarity, 4))
+    return result
+
+
+async def store(db: AsyncSession, query: str, include_rag: bool, result: dict) -> None:
+    """Cache a freshly generated copilot result for query."""
+    normalized = normalize_query(query)
+    key = cache_key(normalized, include_rag)
+    _remember(key, result)
+
+    try:
+        await db.execute(_Q_STORE, {
+            "query_hash": key,
+            "include_rag": include_rag,
+            "query": normalized,
+            "response": orjson.dumps(result, default=str).decode(),
+            "embedding": await asyncio.to_thread(rag_service.embed, normalized),
+            "created_at": datetime.utcnow(),
+        })
+        await db.commit()
+    except Exception as e:
+        logger.warning("query_cache_store_failed", error=str(e))
+        await db.rollback()
+
+
+async def prune(db: AsyncSession) -> int:
+    """Delete stored answers older than CACHE_TTL; lookups already ignore them."""
+    cutoff = datetime.utcnow() - timedelta(seconds=CACHE_TTL)
+    result = await db.execute(_Q_PRUNE, {"cutoff": cutoff})
+    await db.commit()
+    logger.info("query_cache_pruned", rows=result.rowcount)
+    return result.rowcount
+
+
+def stats() -> dict:
+    """Hit/miss counters for this process and its in-memory entry count."""
+    lookups = sum(_stats.values())
+    hits = _stats["exact_hits"] + _stats["semantic_hits"]
+    return {
+        **_stats,
+        "hit_rate": round(hits / lookups, 3) if lookups else None,
+        "entries": len(_entries),
+        "max_entries": CACHE_MAX_ENTRIES,
+        "ttl_seconds": CACHE_TTL,
+        "semantic_threshold": SEMANTIC_THRESHOLD,
+    }
@@ -0,0 +1,129 @@
+"""
+Per-IP, per-route rate limiting for expensive endpoints.
+
+With REDIS_URL set, limits are token buckets kept in Redis and checked with
+one atomic Lua script, so they hold across uvicorn workers and replicas and
+absorb bursts instead of resetting at window edges. Without Redis, each
+process falls back to the in-memory fixed-window limiter SlowAPI used
+(the `limits` library it is built on).
+"""
+import math
+import time
+
+import structlog
+from fastapi import Depends, HTTPException, Request
+from limits import parse
+from limits.storage import MemoryStorage
+from limits.strategies import FixedWindowRateLimiter
+from slowapi.util import get_remote_address
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+logger = structlog.get_logger()
+
+# KEYS[1] = bucket hash; ARGV = capacity, refill rate (tokens/sec), cost.
+# Uses the Redis server clock so replicas with skewed clocks agree.
+# Returns {allowed (0/1), seconds until enough tokens (as string)}.
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local allowed = 0
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    wait = (cost - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(wait)}
+"""
+
+_redis = None
+_token_bucket = None
+_fallback = FixedWindowRateLimiter(MemoryStorage())
+
+
+async def init_redis(url: str) -> None:
+    """Connect the shared Redis client; a no-op when url is empty."""
+    global _redis, _token_bucket
+    if not url:
+        return
+    if aioredis is None:
+        logger.warning("redis_not_available", message="Install redis for cluster-wide rate limits")
+        return
+    _redis = aioredis.from_url(url)
+    _token_bucket = _redis.register_script(TOKEN_BUCKET_LUA)
+    logger.info("rate_limiter_backend", backend="redis")
+
+
+async def close_redis() -> None:
+    """Close the shared Redis client if one was opened."""
+    global _redis, _token_bucket
+    if _redis is not None:
+        await _redis.aclose()
+    _redis = None
+    _token_bucket = None
+
+
+class RateLimit:
+    """
+    FastAPI dependency enforcing a SlowAPI-style limit such as "20/minute".
+
+    The limit's amount is the bucket capacity (burst) and it refills evenly
+    over the period, so the long-run rate matches the old fixed window.
+    """
+
+    def __init__(self, spec: str, cost: int = 1):
+        self.item = parse(spec)
+        self.capacity = self.item.amount
+        self.rate = self.item.amount / self.item.get_expiry()
+        self.cost = cost
+
+    async def __call__(self, request: Request) -> None:
+        client = get_remote_address(request)
+        route = request.scope["route"].path
+
+        if _token_bucket is not None:
+            try:
+                allowed, wait = await _token_bucket(
+                    keys=[f"rl:{client}:{route}"],
+                    args=[self.capacity, self.rate, self.cost],
+                )
+            except Exception as e:
+                # Fail open: a Redis outage shouldn't take the API down with it
+                logger.warning("rate_limit_check_failed", error=str(e))
+                return
+            if not int(allowed):
+                self._deny(float(wait))
+            return
+
+        if not _fallback.hit(self.item, client, route, cost=self.cost):
+            reset_time = _fallback.get_window_stats(self.item, client, route).reset_time
+            self._deny(reset_time - time.time())
+
+    def _deny(self, retry_after: float) -> None:
+        raise HTTPException(
+            status_code=429,
+            detail=f"Rate limit exceeded: {self.item.amount} per {self.item.get_expiry()} seconds",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+
+def rate_limit(spec: str, cost: int = 1):
+    """Route dependency for `dependencies=[rate_limit("5/minute")]`."""
+    return Depends(RateLimit(spec, cost))
@@ -0,0 +1,103 @@
+"""
+In-process cache for read-only GET endpoints.
+
+Leaders, team/goalie stats and matchup context, injuries, seasons and
+today's games change at most a few times an hour, so their responses are
+kept for CACHE_TTL seconds per path + query string instead of hitting
+PostgreSQL on every call. Cached
+responses carry Cache-Control and a content-hash ETag; a client sending a
+matching If-None-Match gets an empty 304. Endpoints that refresh the
+underlying data call invalidate() with the affected path prefix.
+
+The cache is per process, so with several workers a refresh only clears the
+worker that handled it; the others catch up within CACHE_TTL.
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from fastapi import Request, Response
+
+CACHE_TTL = 300
+CACHE_MAX_ENTRIES = 1024
+
+# GET paths (by prefix) whose responses are cached
+CACHED_PATH_PREFIXES = (
+    "/api/leaders/",
+    "/api/stats/team/",
+    "/api/stats/goalie/",
+    "/api/stats/matchup/",
+    "/api/injuries",
+    "/api/seasons",
+    "/api/games/today",
+)
+
+
+@dataclass(slots=True)
+class _Entry:
+    expires_at: float
+    body: bytes
+    headers: dict[str, str]
+    etag: str
+
+
+# key -> entry, least recently used first
+_entries: OrderedDict[str, _Entry] = OrderedDict()
+
+
+def invalidate(*prefixes: str) -> None:
+    """Drop cached responses whose path starts with any of prefixes."""
+    for key in [k for k in _entries if k.startswith(prefixes)]:
+        del _entries[key]
+
+
+def _cache_key(request: Request) -> str:
+    return f"{request.url.path}?{'&'.join(sorted(request.url.query.split('&')))}"
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in (t.strip() for t in if_none_match.split(","))
+
+
+def _respond(request: Request, entry: _Entry) -> Response:
+    headers = {
+        "ETag": entry.etag,
+        "Cache-Control": f"public, max-age={max(0, int(entry.expires_at - time.monotonic()))}",
+    }
+    if _etag_matches(request, entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, headers={**entry.headers, **headers})
+
+
+async def cache_read_responses(request: Request, call_next) -> Response:
+    """HTTP middleware serving CACHED_PATH_PREFIXES GETs from the cache."""
+    if request.method != "GET" or not request.url.path.startswith(CACHED_PATH_PREFIXES):
+        return await call_next(request)
+
+    key = _cache_key(request)
+    entry = _entries.get(key)
+    if entry is not None:
+        if entry.expires_at > time.monotonic():
+            _entries.move_to_end(key)
+            return _respond(request, entry)
+        del _entries[key]
+
+    response = await call_next(request)
+    if response.status_code != 200:
+        return response
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    entry = _Entry(
+        expires_at=time.monotonic() + CACHE_TTL,
+        body=body,
+        headers={k: v for k, v in response.headers.items() if k != "content-length"},
+        etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+    )
+    _entries[key] = entry
+    if len(_entries) > CACHE_MAX_ENTRIES:
+        _entries.popitem(last=False)
+    return _respond(request, entry)
@@ -1,3 +1,7 @@
+import asyncio
+
+from pgvector.asyncpg import register_vector
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 
@@ -8,10 +12,33 @@ settings = get_settings()
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
     pool_pre_ping=True,
-    connect_args={"ssl": False},
+    # Recycle before Postgres/proxies drop idle connections
+    pool_recycle=settings.db_pool_recycle,
+    connect_args={
+        "ssl": False,
+        # Per-connection LRU of prepared statements, keyed by SQL text
+        # (SQLAlchemy's asyncpg adapter; default 100)
+        "prepared_statement_cache_size": 512,
+        # Short OLTP queries never benefit from JIT, but pay its compile time
+        "server_settings": {"jit": "off", "application_name": "powerplai"},
+    },
 )
 
+
+@event.listens_for(engine.sync_engine, "connect")
+def _register_vector_codecs(dbapi_connection, connection_record):
+    """Send and receive pgvector values in binary instead of '[...]' text."""
+    try:
+        dbapi_connection.run_async(register_vector)
+    except ValueError:
+        # The vector extension doesn't exist yet; create_all_tables() creates
+        # it and then recycles the pool so new connections get the codecs.
+        pass
+
 async_session_maker = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -23,6 +50,43 @@ class Base(DeclarativeBase):
     pass
 
 
+async def warm_pool() -> None:
+    """Open pool_size connections up front so early requests skip the connect handshake."""
+    async def ping():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    # Concurrently, so each ping checks out a distinct connection
+    await asyncio.gather(*(ping() for _ in range(settings.db_pool_size)))
+
+
+def pool_status() -> dict:
+    """Snapshot of connection pool usage."""
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "max_overflow": settings.db_max_overflow,
+    }
+
+
+async def bulk_copy(session: AsyncSession, table: str, columns, records) -> None:
+    """
+    COPY records (tuples in columns order) into table on the session's connection.
+
+    Skips per-row statement parsing entirely, so it is the fastest way to
+    load thousands of rows; it has no ON CONFLICT, so upserts COPY into a
+    staging table first.
+    """
+    conn = await session.connection()
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        table, records=records, columns=list(columns)
+    )
+
+
 async def get_db() -> AsyncSession:
     async with async_session_maker() as session:
         try:
@@ -5,15 +5,41 @@ Handles schema updates without using a full migration framework.
 Run these when adding new tables or columns.
 """
 import asyncio
-from sqlalchemy import text
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import MetaData, Table, text
+from sqlalchemy.exc import DBAPIError, IntegrityError
 import structlog
 
 from backend.src.db.database import engine
-from backend.src.db.models import Base
+from backend.src.db.models import Base, Document
 
 logger = structlog.get_logger()
 
+# pgvector server version that added halfvec, bit and binary_quantize()
+QUANTIZED_VECTOR_MIN_VERSION = (0, 7)
+QUANTIZED_DOCUMENT_COLUMNS = ("embedding_bits", "embedding_half")
+
+
+async def _vector_version(conn) -> tuple[int, ...]:
+    """Installed pgvector extension version, () if it isn't installed."""
+    result = await conn.execute(text("SELECT extversion FROM pg_extension WHERE extname = 'vector'"))
+    version = result.scalar()
+    return tuple(int(part) for part in version.split(".")) if version else ()
+
+
+async def _supports_quantized_vectors(conn) -> bool:
+    return await _vector_version(conn) >= QUANTIZED_VECTOR_MIN_VERSION
+
+
+def _create_tables_without_quantized_vectors(sync_conn) -> None:
+    """create_all, but documents without the columns an older pgvector can't store."""
+    documents = Document.__table__
+    Base.metadata.create_all(sync_conn, tables=[t for t in Base.metadata.sorted_tables if t is not documents])
+    Table(
+        documents.name,
+        MetaData(),
+        *(c._copy() for c in documents.columns if c.name not in QUANTIZED_DOCUMENT_COLUMNS),
+    ).create(sync_conn, checkfirst=True)
+
 
 async def create_all_tables():
     """Create all tables that don't exist yet."""
@@ -24,10 +50,66 @@ async def create_all_tables():
             await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
         except IntegrityError:
             pass  # Already exists, safe to ignore
-        await conn.run_sync(Base.metadata.create_all)
+        # CREATE EXTENSION never upgrades an existing install; pick up a newer
+        # pgvector if the server has one
+        try:
+            async with conn.begin_nested():
+                await conn.execute(text("ALTER EXTENSION vector UPDATE"))
+        except DBAPIError as e:
+            logger.warning("vector_extension_update_failed", error=str(e))
+        # Trigram operators for the players name index. Optional: managed
+        # Postgres may not offer it or may not let this role create it, and
+        # create_concurrent_indexes() then just skips idx_players_name_trgm.
+        # The savepoint keeps a failure from aborting the table creation below.
+        try:
+            async with conn.begin_nested():
+                await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        except DBAPIError as e:
+            logger.warning("pg_trgm_extension_unavailable", error=str(e))
+        if await _supports_quantized_vectors(conn):
+            await conn.run_sync(Base.metadata.create_all)
+        else:
+            logger.warning(
+                "vector_extension_too_old_for_quantized_embeddings",
+                version=".".join(map(str, await _vector_version(conn))),
+            )
+            await conn.run_sync(_create_tables_without_quantized_vectors)
+    # Connections opened before the extension existed have no pgvector codecs
+    await engine.dispose()
     logger.info("ensured_all_tables_exist")
 
 
+async def _add_columns(conn, table: str, columns: list[tuple[str, str]]) -> None:
+    """
+    Add the columns table doesn't have yet with one multi-clause ALTER TABLE.
+
+    Existing columns are read from information_schema first, so an
+    up-to-date table costs one catalog query and no DDL at all.
+    """
+    result = await conn.execute(
+        text("SELECT column_name FROM information_schema.columns WHERE table_name = :table"),
+        {"table": table},
+    )
+    existing = {row[0] for row in result}
+    missing = [(name, col_type) for name, col_type in columns if name not in existing]
+    if not missing:
+        return
+
+    # IF NOT EXISTS still guards against another worker migrating concurrently
+    clauses = ", ".join(f"ADD COLUMN IF NOT EXISTS {name} {col_type}" for name, col_type in missing)
+    await conn.execute(text(f"ALTER TABLE {table} {clauses}"))
+    logger.debug("added_columns", table=table, columns=[name for name, _ in missing])
+
+
+async def _existing_indexes(conn, names) -> set[str]:
+    """Which of the named indexes already exist in the public schema."""
+    result = await conn.execute(
+        text("SELECT indexname FROM pg_indexes WHERE schemaname = 'public' AND indexname = ANY(:names)"),
+        {"names": list(names)},
+    )
+    return {row[0] for row in result}
+
+
 async def migrate_players_table():
     """Add salary/contract columns to players table if they don't exist."""
     columns_to_add = [
@@ -37,15 +119,7 @@ async def migrate_players_table():
     ]
 
     async with engine.begin() as conn:
-        for col_name, col_type in columns_to_add:
-            try:
-                await conn.execute(text(f"""
-                    ALTER TABLE players ADD COLUMN IF NOT EXISTS {col_name} {col_type}
-                """))
-                logger.debug("added_column", table="players", column=col_name)
-            except Exception as e:
-                if "already exists" not in str(e).lower():
-                    logger.warning("column_add_failed", column=col_name, error=str(e))
+        await _add_columns(conn, "players", columns_to_add)
 
     logger.info("migrated_players_table")
 
@@ -66,16 +140,18 @@ async def migrate_game_logs_table():
     ]
 
     async with engine.begin() as conn:
-        for col_name, col_type in columns_to_add:
-            try:
-                await conn.execute(text(f"""
-                    ALTER TABLE game_logs ADD COLUMN IF NOT EXISTS {col_name} {col_type}
-                """))
-                logger.debug("added_column", table="game_logs", column=col_name)
-            except Exception as e:
-                # Column might already exist (older Postgres doesn't have IF NOT EXISTS)
-                if "already exists" not in str(e).lower():
-                    logger.warning("column_add_failed", column=col_name, error=str(e))
+        await _add_columns(conn, "game_logs", columns_to_add)
+
+        # toi was NUMERIC decimal minutes; it is now INTEGER seconds
+        result = await conn.execute(text("""
+            SELECT data_type FROM information_schema.columns
+            WHERE table_name = 'game_logs' AND column_name = 'toi'
+        """))
+        if result.scalar() == "numeric":
+            await conn.execute(text(
+                "ALTER TABLE game_logs ALTER COLUMN toi TYPE INTEGER USING round(toi * 60)::integer"
+            ))
+            logger.debug("converted_column", table="game_logs", column="toi", to="seconds")
 
         # Add new indexes for predictions
         indexes = [
@@ -84,16 +160,180 @@ async def migrate_game_logs_table():
             ("idx_game_logs_game", "game_logs", "game_id"),
         ]
 
+        existing = await _existing_indexes(conn, [idx_name for idx_name, _, _ in indexes])
         for idx_name, table, columns in indexes:
+            if idx_name not in existing:
+                await conn.execute(text(f"CREATE INDEX IF NOT EXISTS {idx_name} ON {table} ({columns})"))
+                logger.debug("added_index", index=idx_name)
+
+    logger.info("migrated_game_logs_table")
+
+
+async def set_timestamp_defaults():
+    """Move created_at/updated_at defaults from Python into the database."""
+    tables = {
+        "players": ("created_at", "updated_at"),
+        "teams": ("created_at",),
+        "goalie_stats": ("created_at", "updated_at"),
+        "team_season_stats": ("created_at", "updated_at"),
+        "injuries": ("created_at", "updated_at"),
+        "probable_goalies": ("created_at", "updated_at"),
+        "games": ("created_at", "updated_at"),
+        "player_season_stats": ("created_at",),
+        "game_logs": ("created_at",),
+        "documents": ("created_at",),
+        "rag_cache": ("created_at",),
+    }
+
+    async with engine.begin() as conn:
+        # ALTER TABLE takes an ACCESS EXCLUSIVE lock even when nothing changes,
+        # so only touch columns whose default isn't already the UTC one
+        result = await conn.execute(
+            text("""
+                SELECT table_name, column_name FROM information_schema.columns
+                WHERE table_schema = 'public' AND table_name = ANY(:tables)
+                  AND column_name IN ('created_at', 'updated_at')
+                  AND column_default IS DISTINCT FROM 'timezone(''utc''::text, now())'
+            """),
+            {"tables": list(tables)},
+        )
+        stale = {(row.table_name, row.column_name) for row in result}
+
+        for table, columns in tables.items():
+            columns = [c for c in columns if (table, c) in stale]
+            if not columns:
+                continue
+            clauses = ", ".join(f"ALTER COLUMN {c} SET DEFAULT timezone('utc', now())" for c in columns)
+            await conn.execute(text(f"ALTER TABLE {table} {clauses}"))
+            logger.debug("set_timestamp_default", table=table, columns=columns)
+
+    logger.info("set_timestamp_defaults")
+
+
+async def migrate_documents_table():
+    """
+    Add the quantized embedding columns to documents and backfill them.
+
+    The quantized columns need pgvector >= 0.7; on an older extension they are
+    skipped and RAG search ranks by the full-precision embedding instead.
+    """
+    async with engine.begin() as conn:
+        # token_ids was written at ingest but never read; reclaim it
+        result = await conn.execute(text("""
+            SELECT 1 FROM information_schema.columns
+            WHERE table_name = 'documents' AND column_name = 'token_ids'
+        """))
+        if result.first():
+            await conn.execute(text("ALTER TABLE documents DROP COLUMN token_ids"))
+
+        if not await _supports_quantized_vectors(conn):
+            logger.info("migrated_documents_table", quantized=False)
+            return
+
+        await _add_columns(conn, "documents", [
+            ("embedding_bits", "BIT(384)"),
+            ("embedding_half", "HALFVEC(384)"),
+        ])
+        await conn.execute(text("""
+            UPDATE documents
+            SET embedding_bits = binary_quantize(embedding)::bit(384),
+                embedding_half = embedding::halfvec(384)
+            WHERE (embedding_bits IS NULL OR embedding_half IS NULL) AND embedding IS NOT NULL
+        """))
+
+    logger.info("migrated_documents_table")
+
+
+async def create_concurrent_indexes():
+    """
+    Build large indexes on hot tables without blocking writers.
+
+    CREATE INDEX CONCURRENTLY can't run inside a transaction block, so this
+    uses an autocommit connection rather than engine.begin().
+    """
+    indexes = [
+        # Covering index for the prediction engine's recent-form window
+        (
+            "idx_game_logs_player_date",
+            "game_logs (player_id, game_date DESC) INCLUDE (goals, assists, points, shots, opponent, home_away)",
+        ),
+        # Hamming-distance ANN index for the RAG search prefilter
+        (
+            "idx_documents_embedding_bits",
+            "documents USING hnsw (embedding_bits bit_hamming_ops)",
+        ),
+        # Player lookups are `name ILIKE '%...%'`, which a btree can't serve
+        (
+            "idx_players_name_trgm",
+            "players USING gin (name gin_trgm_ops)",
+        ),
+    ]
+
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        if not await _supports_quantized_vectors(conn):
+            indexes = [(name, d) for name, d in indexes if name != "idx_documents_embedding_bits"]
+        existing = await _existing_indexes(conn, [idx_name for idx_name, _ in indexes])
+        for idx_name, definition in indexes:
+            if idx_name in existing:
+                continue
+            # Each build is its own transaction; one failing (e.g. a missing
+            # extension) shouldn't stop the others or startup
             try:
                 await conn.execute(text(f"""
-                    CREATE INDEX IF NOT EXISTS {idx_name} ON {table} ({columns})
+                    CREATE INDEX CONCURRENTLY IF NOT EXISTS {idx_name} ON {definition}
                 """))
+                logger.debug("added_index", index=idx_name)
             except Exception as e:
-                if "already exists" not in str(e).lower():
-                    logger.warning("index_create_failed", index=idx_name, error=str(e))
+                logger.warning("index_create_failed", index=idx_name, error=str(e))
 
-    logger.info("migrated_game_logs_table")
+
+async def create_materialized_views():
+    """
+    Create read-side materialized views used by the prediction engine.
+
+    player_recent_form holds each player's last-5-games aggregates (games
+    before the refresh date). It is refreshed after game log ingestion; the
+    unique index is required for REFRESH ... CONCURRENTLY.
+    """
+    async with engine.begin() as conn:
+        result = await conn.execute(
+            text("SELECT 1 FROM pg_matviews WHERE matviewname = 'player_recent_form'")
+        )
+        if result.first():
+            return
+
+        await conn.execute(text("""
+            CREATE MATERIALIZED VIEW IF NOT EXISTS player_recent_form AS
+            WITH ranked AS (
+                SELECT
+                    player_id, goals, assists, points, shots,
+                    ROW_NUMBER() OVER (PARTITION BY player_id ORDER BY game_date DESC) as rn
+                FROM game_logs
+                WHERE game_date < CURRENT_DATE
+            )
+            SELECT
+                player_id,
+                COUNT(*) as games,
+                COALESCE(SUM(goals), 0) as goals,
+                COALESCE(SUM(assists), 0) as assists,
+                COALESCE(SUM(points), 0) as points,
+                COALESCE(AVG(shots), 0) as avg_shots
+            FROM ranked
+            WHERE rn <= 5
+            GROUP BY player_id
+        """))
+        await conn.execute(text("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_player_recent_form_player
+            ON player_recent_form (player_id)
+        """))
+        # Built with data just now, so it's current for today
+        await conn.execute(text("""
+            INSERT INTO matview_refreshes (view_name, refreshed_on)
+            VALUES ('player_recent_form', CURRENT_DATE)
+            ON CONFLICT (view_name) DO UPDATE SET refreshed_on = EXCLUDED.refreshed_on
+        """))
+        logger.debug("added_materialized_view", view="player_recent_form")
 
 
 async def add_unique_constraints():
@@ -102,48 +342,76 @@ async def add_unique_constraints():
         ("goalie_stats", "goalie_stats_player_season_key", "player_id, season"),
         ("team_season_stats", "team_season_stats_team_season_key", "team_abbrev, season"),
         ("player_season_stats", "player_season_stats_player_season_key", "player_id, season"),
+        ("game_logs", "game_logs_player_game_key", "player_id, game_id"),
     ]
 
     async with engine.begin() as conn:
+        result = await conn.execute(
+            text("SELECT conname FROM pg_constraint WHERE conname = ANY(:names)"),
+            {"names": [name for _, name, _ in constraints]},
+        )
+        existing = {row[0] for row in result}
+
         for table, constraint_name, columns in constraints:
+            if constraint_name in existing:
+                continue
+            # Fails on duplicate rows; a savepoint keeps that from aborting
+            # the rest of the migration
             try:
-                # Check if constraint exists
-                result = await conn.execute(text(f"""
-                    SELECT 1 FROM pg_constraint WHERE conname = '{constraint_name}'
-                """))
-                if not result.fetchone():
+                async with conn.begin_nested():
                     await conn.execute(text(f"""
                         ALTER TABLE {table} ADD CONSTRAINT {constraint_name} UNIQUE ({columns})
                     """))
-                    logger.debug("added_constraint", table=table, constraint=constraint_name)
+                logger.debug("added_constraint", table=table, constraint=constraint_name)
             except Exception as e:
-                if "already exists" not in str(e).lower():
-                    logger.warning("constraint_add_failed", constraint=constraint_name, error=str(e))
+                logger.warning("constraint_add_failed", constraint=constraint_name, error=str(e))
 
         # Add partial unique index for active injuries (for upsert)
-        try:
-            await conn.execute(text("""
-                CREATE UNIQUE INDEX IF NOT EXISTS idx_injuries_player_active
-                ON injuries (player_id) WHERE is_active = TRUE
-            """))
-            logger.debug("added_index", index="idx_injuries_player_active")
-        except Exception as e:
-            if "already exists" not in str(e).lower():
+        if not await _existing_indexes(conn, ["idx_injuries_player_active"]):
+            try:
+                async with conn.begin_nested():
+                    await conn.execute(text("""
+                        CREATE UNIQUE INDEX IF NOT EXISTS idx_injuries_player_active
+                        ON injuries (player_id) WHERE is_active = TRUE
+                    """))
+                logger.debug("added_index", index="idx_injuries_player_active")
+            except Exception as e:
                 logger.warning("index_create_failed", index="idx_injuries_player_active", error=str(e))
 
-        # Add unique constraint for game_logs (player_id, game_id)
-        try:
-            result = await conn.execute(text("""
-                SELECT 1 FROM pg_constraint WHERE conname = 'game_logs_player_game_key'
-            """))
-            if not result.fetchone():
-                await conn.execute(text("""
-                    ALTER TABLE game_logs ADD CONSTRAINT game_logs_player_game_key UNIQUE (player_id, game_id)
-                """))
-                logger.debug("added_constraint", table="game_logs", constraint="game_logs_player_game_key")
-        except Exception as e:
-            if "already exists" not in str(e).lower():
-                logger.warning("constraint_add_failed", constraint="game_logs_player_game_key", error=str(e))
+
+async def drop_redundant_indexes():
+    """
+    Drop indexes that other indexes already serve, to save writes on upsert.
+
+    An index is only dropped once the unique constraint or index that leads
+    with the same columns exists, so a failed add_unique_constraints() never
+    leaves a lookup without an index.
+    """
+    # index -> unique constraint whose index makes it redundant
+    covered_by_constraint = {
+        "idx_goalie_stats_player": "goalie_stats_player_season_key",
+        "idx_team_stats_team": "team_season_stats_team_season_key",
+        "idx_player_stats_player": "player_season_stats_player_season_key",
+    }
+    # index -> index that makes it redundant
+    covered_by_index = {
+        "idx_injuries_active": "idx_injuries_player_active",
+    }
+
+    async with engine.begin() as conn:
+        result = await conn.execute(
+            text("SELECT conname FROM pg_constraint WHERE conname = ANY(:names)"),
+            {"names": list(covered_by_constraint.values())},
+        )
+        existing = {row[0] for row in result}
+        existing |= await _existing_indexes(conn, covered_by_index.values())
+        droppable = [
+            idx for idx, covering in (covered_by_constraint | covered_by_index).items()
+            if covering in existing
+        ]
+        if droppable:
+            await conn.execute(text(f"DROP INDEX IF EXISTS {', '.join(droppable)}"))
+            logger.debug("dropped_indexes", indexes=droppable)
 
 
 async def run_migrations():
@@ -156,9 +424,14 @@ async def run_migrations():
     # Add new columns to existing tables
     await migrate_players_table()
     await migrate_game_logs_table()
+    await set_timestamp_defaults()
+    await migrate_documents_table()
+    await create_concurrent_indexes()
+    await create_materialized_views()
 
     # Add unique constraints for upserts
     await add_unique_constraints()
+    await drop_redundant_indexes()
 
     logger.info("database_migrations_complete")
 
@@ -1,12 +1,38 @@
 from datetime import date, datetime
-from sqlalchemy import Integer, String, Date, DateTime, Numeric, ForeignKey, Text, Index, Boolean
+from sqlalchemy import Integer, String, Date, DateTime, Numeric, ForeignKey, Text, Index, Boolean, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.dialects.postgresql import JSONB
-from pgvector.sqlalchemy import Vector
+from pgvector.sqlalchemy import BIT, HALFVEC, Vector
 
 from backend.src.db.database import Base
 
 
+# Naive UTC timestamps (like datetime.utcnow) stamped by Postgres, so bulk
+# inserts don't build a datetime per row and raw INSERTs can omit the column
+UTC_NOW = text("timezone('utc', now())")
+
+
+class BinaryVector(TypeDecorator):
+    """
+    pgvector VECTOR column bound through the asyncpg binary codec.
+
+    database.py registers pgvector's codecs on every connection, so lists and
+    ndarrays are handed to the driver as-is (4 bytes per dimension) instead
+    of being formatted as '[...]' text for the server to parse.
+    """
+    impl = Vector
+    cache_ok = True
+
+    def bind_processor(self, dialect):
+        return None
+
+
+class BinaryHalfVector(BinaryVector):
+    """pgvector HALFVEC column bound through the asyncpg binary codec."""
+    impl = HALFVEC
+
+
 class Player(Base):
     __tablename__ = "players"
 
@@ -25,12 +51,13 @@ class Player(Base):
     contract_years: Mapped[int | None] = mapped_column(Integer)  # Years remaining
     contract_expiry: Mapped[int | None] = mapped_column(Integer)  # Expiry year (e.g., 2028)
 
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW, onupdate=UTC_NOW)
 
-    # Relationships
-    season_stats: Mapped[list["PlayerSeasonStats"]] = relationship(back_populates="player")
-    game_logs: Mapped[list["GameLog"]] = relationship(back_populates="player")
+    # Relationships. Lazy loads raise: under asyncio they can't run implicitly,
+    # and per-player loads are N+1 queries. Use selectinload() when needed.
+    season_stats: Mapped[list["PlayerSeasonStats"]] = relationship(back_populates="player", lazy="raise")
+    game_logs: Mapped[list["GameLog"]] = relationship(back_populates="player", lazy="raise")
 
 
 class Team(Base):
@@ -42,7 +69,7 @@ class Team(Base):
     abbrev: Mapped[str] = mapped_column(String(10), unique=True, nullable=False)
     conference: Mapped[str | None] = mapped_column(String(50))
     division: Mapped[str | None] = mapped_column(String(50))
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW)
 
 
 class GoalieStats(Base):
@@ -75,12 +102,12 @@ class GoalieStats(Base):
     recent_save_pct: Mapped[float | None] = mapped_column(Numeric(5, 3))
     recent_gaa: Mapped[float | None] = mapped_column(Numeric(4, 2))
 
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW, onupdate=UTC_NOW)
 
     __table_args__ = (
+        # player_id lookups use the (player_id, season) unique constraint's index
         Index("idx_goalie_stats_season", "season"),
-        Index("idx_goalie_stats_player", "player_id"),
         Index("idx_goalie_stats_team", "team_abbrev"),
     )
 
@@ -115,12 +142,12 @@ class TeamSeasonStats(Base):
     # Combined pace metric (total goals per game both teams)
     total_goals_per_game: Mapped[float | None] = mapped_column(Numeric(4, 2))
 
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW, onupdate=UTC_NOW)
 
     __table_args__ = (
+        # team_abbrev lookups use the (team_abbrev, season) unique constraint's index
         Index("idx_team_stats_season", "season"),
-        Index("idx_team_stats_team", "team_abbrev"),
     )
 
 
@@ -141,12 +168,13 @@ class Injury(Base):
 
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)  # Currently injured?
 
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW, onupdate=UTC_NOW)
 
     __table_args__ = (
+        # No index on is_active alone: too unselective to beat a scan. Active
+        # rows per player are covered by the partial unique idx_injuries_player_active.
         Index("idx_injuries_player", "player_id"),
-        Index("idx_injuries_active", "is_active"),
         Index("idx_injuries_team", "team_abbrev"),
     )
 
@@ -164,8 +192,8 @@ class ProbableGoalie(Base):
     confirmed: Mapped[bool] = mapped_column(Boolean, default=False)
     source: Mapped[str | None] = mapped_column(String(50))  # "NHL", "DailyFaceoff", etc.
 
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW, onupdate=UTC_NOW)
 
     __table_args__ = (
         Index("idx_probable_goalie_date", "game_date"),
@@ -193,8 +221,8 @@ class Game(Base):
     game_state: Mapped[str] = mapped_column(String(20), default="FUT")  # FUT, LIVE, FINAL, OFF, etc.
     is_completed: Mapped[bool] = mapped_column(Boolean, default=False)
 
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW, onupdate=UTC_NOW)
 
     __table_args__ = (
         Index("idx_games_date", "game_date"),
@@ -224,14 +252,14 @@ class PlayerSeasonStats(Base):
     xg_per_60: Mapped[float | None] = mapped_column(Numeric(6, 3))
     corsi_for_pct: Mapped[float | None] = mapped_column(Numeric(5, 2))
     fenwick_for_pct: Mapped[float | None] = mapped_column(Numeric(5, 2))
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW)
 
     # Relationships
     player: Mapped["Player"] = relationship(back_populates="season_stats")
 
     __table_args__ = (
+        # player_id lookups use the (player_id, season) unique constraint's index
         Index("idx_player_stats_season", "season"),
-        Index("idx_player_stats_player", "player_id"),
     )
 
 
@@ -253,7 +281,7 @@ class GameLog(Base):
     assists: Mapped[int | None] = mapped_column(Integer, default=0)
     points: Mapped[int | None] = mapped_column(Integer, default=0)
     shots: Mapped[int | None] = mapped_column(Integer, default=0)
-    toi: Mapped[float | None] = mapped_column(Numeric(6, 2))  # decimal minutes
+    toi: Mapped[int | None] = mapped_column(Integer)  # seconds
     plus_minus: Mapped[int | None] = mapped_column(Integer, default=0)
     pim: Mapped[int | None] = mapped_column(Integer, default=0)
 
@@ -266,19 +294,37 @@ class GameLog(Base):
     overtime_goals: Mapped[int | None] = mapped_column(Integer, default=0)
     shifts: Mapped[int | None] = mapped_column(Integer)
 
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW)
 
     # Relationships
     player: Mapped["Player"] = relationship(back_populates="game_logs")
 
     __table_args__ = (
+        # Kept alongside idx_game_logs_player_date: the daily audit and copilot
+        # look up everyone's games on one date, which needs game_date leading
         Index("idx_game_logs_date", "game_date"),
         Index("idx_game_logs_player_season", "player_id", "season"),
         Index("idx_game_logs_opponent", "player_id", "opponent"),  # For H2H lookups
         Index("idx_game_logs_game", "game_id"),
+        # Recent-form lookups (last N games before a date); the INCLUDE columns
+        # let the recent/h2h/home-away aggregates run as index-only scans.
+        Index(
+            "idx_game_logs_player_date",
+            "player_id",
+            text("game_date DESC"),
+            postgresql_include=["goals", "assists", "points", "shots", "opponent", "home_away"],
+        ),
     )
 
 
+class MatviewRefresh(Base):
+    """Day each materialized view was last refreshed, so readers can tell if it is current."""
+    __tablename__ = "matview_refreshes"
+
+    view_name: Mapped[str] = mapped_column(String(63), primary_key=True)
+    refreshed_on: Mapped[date] = mapped_column(Date, nullable=False)  # CURRENT_DATE at refresh
+
+
 class Document(Base):
     __tablename__ = "documents"
 
@@ -288,6 +334,38 @@ class Document(Base):
     content: Mapped[str] = mapped_column(Text, nullable=False)
     url: Mapped[str | None] = mapped_column(String(1000))
     published_at: Mapped[datetime | None] = mapped_column(DateTime)
-    embedding = mapped_column(Vector(384))  # all-MiniLM-L6-v2 dimension
+    embedding = mapped_column(BinaryVector(384))  # all-MiniLM-L6-v2 dimension
+    embedding_bits = mapped_column(BIT(384))  # binary_quantize(embedding), search prefilter
+    embedding_half = mapped_column(BinaryHalfVector(384))  # embedding as float16, search rerank
     metadata_: Mapped[dict | None] = mapped_column("metadata", JSONB)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW)
+
+    __table_args__ = (
+        Index(
+            "idx_documents_embedding_bits",
+            "embedding_bits",
+            postgresql_using="hnsw",
+            postgresql_ops={"embedding_bits": "bit_hamming_ops"},
+        ),
+    )
+
+
+class RagCacheEntry(Base):
+    """Copilot answer cached by question, for exact and embedding lookups."""
+    __tablename__ = "rag_cache"
+
+    query_hash: Mapped[str] = mapped_column(String(64), primary_key=True)  # sha256(include_rag, query)
+    include_rag: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    query: Mapped[str] = mapped_column(Text, nullable=False)  # normalized question
+    response: Mapped[str] = mapped_column(Text, nullable=False)  # JSON-encoded QueryResponse
+    embedding = mapped_column(BinaryVector(384), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=UTC_NOW, index=True)
+
+    __table_args__ = (
+        Index(
+            "idx_rag_cache_embedding",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
+    )
@@ -14,8 +14,8 @@ import structlog
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.src.db.database import async_session_maker
-from backend.src.ingestion.nhl_api import NHLAPIClient, _parse_toi
+from backend.src.db.database import async_session_maker, bulk_copy
+from backend.src.ingestion.nhl_api import NHLAPIClient, _parse_toi_seconds
 
 logger = structlog.get_logger()
 
@@ -90,7 +90,7 @@ def parse_game_log_entry(
         "assists": entry.get("assists", 0),
         "points": entry.get("points", 0),
         "shots": entry.get("shots", 0),
-        "toi": _parse_toi(entry.get("toi", "0:00")),
+        "toi": _parse_toi_seconds(entry.get("toi", "0:00")),
         "plus_minus": entry.get("plusMinus", 0),
         "pim": entry.get("pim", 0),
         "powerplay_goals": entry.get("powerPlayGoals", 0),
@@ -197,6 +197,109 @@ async def ingest_schedule_range(
             await client.close()
 
 
+# Columns parse_game_log_entry() produces, in the order COPY records use
+GAME_LOG_COLUMNS = (
+    "player_id", "game_id", "game_date", "season", "team_abbrev", "opponent", "home_away",
+    "goals", "assists", "points", "shots", "toi", "plus_minus", "pim",
+    "powerplay_goals", "powerplay_points", "shorthanded_goals", "shorthanded_points",
+    "game_winning_goals", "overtime_goals", "shifts",
+)
+
+# Batches above this are COPYed through a staging table; smaller ones are
+# cheaper as one executemany of the upsert
+GAME_LOG_COPY_THRESHOLD = 100
+
+_GAME_LOG_UPDATE_SET = """
+    goals = EXCLUDED.goals,
+    assists = EXCLUDED.assists,
+    points = EXCLUDED.points,
+    shots = EXCLUDED.shots,
+    toi = EXCLUDED.toi,
+    plus_minus = EXCLUDED.plus_minus,
+    pim = EXCLUDED.pim,
+    powerplay_goals = EXCLUDED.powerplay_goals,
+    powerplay_points = EXCLUDED.powerplay_points,
+    shorthanded_goals = EXCLUDED.shorthanded_goals,
+    shorthanded_points = EXCLUDED.shorthanded_points,
+    game_winning_goals = EXCLUDED.game_winning_goals,
+    overtime_goals = EXCLUDED.overtime_goals,
+    shifts = EXCLUDED.shifts
+"""
+
+_Q_UPSERT_GAME_LOG = text(f"""
+    INSERT INTO game_logs ({", ".join(GAME_LOG_COLUMNS)}, created_at)
+    VALUES ({", ".join(f":{c}" for c in GAME_LOG_COLUMNS)}, NOW())
+    ON CONFLICT (player_id, game_id) DO UPDATE SET {_GAME_LOG_UPDATE_SET}
+""")
+
+_Q_CREATE_GAME_LOG_STAGE = text(f"""
+    CREATE TEMP TABLE game_logs_stage AS
+    SELECT {", ".join(GAME_LOG_COLUMNS)} FROM game_logs WITH NO DATA
+""")
+
+_Q_MERGE_GAME_LOG_STAGE = text(f"""
+    INSERT INTO game_logs ({", ".join(GAME_LOG_COLUMNS)}, created_at)
+    SELECT {", ".join(GAME_LOG_COLUMNS)}, NOW() FROM game_logs_stage
+    ON CONFLICT (player_id, game_id) DO UPDATE SET {_GAME_LOG_UPDATE_SET}
+""")
+
+
+async def upsert_game_logs(db: AsyncSession, logs: list[dict[str, Any]]) -> int:
+    """
+    Upsert parsed game logs (see parse_game_log_entry) without committing.
+
+    Large batches are COPYed into a temp staging table and merged with one
+    INSERT ... SELECT ... ON CONFLICT; small ones go through executemany.
+
+    Returns number of game logs upserted.
+    """
+    if not logs:
+        return 0
+
+    if len(logs) <= GAME_LOG_COPY_THRESHOLD:
+        await db.execute(_Q_UPSERT_GAME_LOG, logs)
+        return len(logs)
+
+    await db.execute(_Q_CREATE_GAME_LOG_STAGE)
+    await bulk_copy(
+        db,
+        "game_logs_stage",
+        GAME_LOG_COLUMNS,
+        [tuple(log[c] for c in GAME_LOG_COLUMNS) for log in logs],
+    )
+    await db.execute(_Q_MERGE_GAME_LOG_STAGE)
+    # So a later batch in the same transaction can stage again
+    await db.execute(text("DROP TABLE game_logs_stage"))
+    return len(logs)
+
+
+async def refresh_recent_form_view(db: AsyncSession) -> dict:
+    """
+    Refresh the player_recent_form materialized view and record the day it was built.
+
+    The prediction engine only reads the view when it was refreshed today
+    (it bakes in CURRENT_DATE), falling back to the live window otherwise.
+    """
+    await db.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY player_recent_form"))
+    await db.execute(text("""
+        INSERT INTO matview_refreshes (view_name, refreshed_on)
+        VALUES ('player_recent_form', CURRENT_DATE)
+        ON CONFLICT (view_name) DO UPDATE SET refreshed_on = EXCLUDED.refreshed_on
+    """))
+    await db.commit()
+    logger.info("recent_form_view_refreshed")
+    return {"refreshed": True}
+
+
+async def _refresh_recent_form_after_ingest(db: AsyncSession) -> None:
+    """refresh_recent_form_view, without failing the ingestion that wrote the logs."""
+    try:
+        await refresh_recent_form_view(db)
+    except Exception as e:
+        logger.error("recent_form_view_refresh_failed", error=str(e))
+        await db.rollback()
+
+
 async def ingest_player_game_logs(
     db: AsyncSession,
     player_nhl_id: int,
@@ -237,45 +340,11 @@ async def ingest_player_game_logs(
             logger.warning("game_log_fetch_failed", player_id=player_nhl_id, error=str(e))
             return 0
 
-        game_log = game_log_data.get("gameLog", [])
-        logs_upserted = 0
-
-        for entry in game_log:
-            log = parse_game_log_entry(internal_player_id, entry, season)
-
-            # Upsert game log
-            await db.execute(
-                text("""
-                    INSERT INTO game_logs (
-                        player_id, game_id, game_date, season, team_abbrev, opponent, home_away,
-                        goals, assists, points, shots, toi, plus_minus, pim,
-                        powerplay_goals, powerplay_points, shorthanded_goals, shorthanded_points,
-                        game_winning_goals, overtime_goals, shifts, created_at
-                    ) VALUES (
-                        :player_id, :game_id, :game_date, :season, :team_abbrev, :opponent, :home_away,
-                        :goals, :assists, :points, :shots, :toi, :plus_minus, :pim,
-                        :powerplay_goals, :powerplay_points, :shorthanded_goals, :shorthanded_points,
-                        :game_winning_goals, :overtime_goals, :shifts, NOW()
-                    )
-                    ON CONFLICT (player_id, game_id) DO UPDATE SET
-                        goals = EXCLUDED.goals,
-                        assists = EXCLUDED.assists,
-                        points = EXCLUDED.points,
-                        shots = EXCLUDED.shots,
-                        toi = EXCLUDED.toi,
-                        plus_minus = EXCLUDED.plus_minus,
-                        pim = EXCLUDED.pim,
-                        powerplay_goals = EXCLUDED.powerplay_goals,
-                        powerplay_points = EXCLUDED.powerplay_points,
-                        shorthanded_goals = EXCLUDED.shorthanded_goals,
-                        shorthanded_points = EXCLUDED.shorthanded_points,
-                        game_winning_goals = EXCLUDED.game_winning_goals,
-                        overtime_goals = EXCLUDED.overtime_goals,
-                        shifts = EXCLUDED.shifts
-                """),
-                log
-            )
-            logs_upserted += 1
+        logs = [
+            parse_game_log_entry(internal_player_id, entry, season)
+            for entry in game_log_data.get("gameLog", [])
+        ]
+        logs_upserted = await upsert_game_logs(db, logs)
 
         await db.commit()
         return logs_upserted
@@ -350,6 +419,8 @@ async def ingest_all_player_game_logs(
                 continue
 
         logger.info("game_log_ingestion_complete", **stats)
+        if stats["logs_ingested"]:
+            await _refresh_recent_form_after_ingest(db)
         return stats
 
     finally:
@@ -457,7 +528,7 @@ async def ingest_game_boxscore(
                     "assists": assists,
                     "points": goals + assists,
                     "shots": p.get("shots", p.get("sog", 0)) or 0,
-                    "toi": _parse_toi(toi_str),
+                    "toi": _parse_toi_seconds(toi_str),
                     "plus_minus": p.get("plusMinus", 0) or 0,
                     "pim": p.get("pim", 0) or 0,
                     "ppg": p.get("powerPlayGoals", 0) or 0,
@@ -548,6 +619,8 @@ async def ingest_recent_games(
     finally:
         await client.close()
 
+    if results["boxscores_ingested"]:
+        await _refresh_recent_form_after_ingest(db)
     logger.info("recent_games_ingested", **results)
     return results
 
@@ -159,17 +159,17 @@ def parse_game_log_entry(player_id: int, entry: dict[str, Any]) -> dict[str, Any
         "assists": entry.get("assists", 0),
         "points": entry.get("points", 0),
         "shots": entry.get("shots", 0),
-        "toi": _parse_toi(entry.get("toi", "0:00")),
+        "toi": _parse_toi_seconds(entry.get("toi", "0:00")),
         "plus_minus": entry.get("plusMinus", 0),
     }
 
 
-def _parse_toi(toi_str: str) -> float:
-    """Parse time on ice string (MM:SS) to decimal minutes."""
+def _parse_toi_seconds(toi_str: str) -> int:
+    """Parse time on ice string (MM:SS) to whole seconds."""
     try:
         parts = toi_str.split(":")
         minutes = int(parts[0])
         seconds = int(parts[1]) if len(parts) > 1 else 0
-        return round(minutes + seconds / 60, 2)
+        return minutes * 60 + seconds
     except (ValueError, IndexError):
-        return 0.0
+        return 0
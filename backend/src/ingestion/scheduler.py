@@ -7,7 +7,9 @@ Supports:
 - Progress tracking and resumption
 """
 import asyncio
+import threading
 from datetime import datetime, date
+from functools import lru_cache
 from pathlib import Path
 import json
 import structlog
@@ -24,6 +26,10 @@ CURRENT_SEASON = datetime.now().year if datetime.now().month >= 9 else datetime.
 # Progress file for tracking ingestion state
 PROGRESS_FILE = Path("data/ingestion_progress.json")
 
+# ((st_mtime_ns, st_size), parsed progress) from the last read of PROGRESS_FILE
+_progress_cache: tuple[tuple[int, int], dict] | None = None
+_progress_lock = threading.Lock()
+
 
 def get_all_seasons(start_year: int = MONEYPUCK_FIRST_SEASON, end_year: int = CURRENT_SEASON) -> list[str]:
     """Get list of all seasons from start to end year."""
@@ -31,12 +37,30 @@ def get_all_seasons(start_year: int = MONEYPUCK_FIRST_SEASON, end_year: int = CU
 
 
 def load_progress() -> dict:
-    """Load ingestion progress from file."""
-    if PROGRESS_FILE.exists():
-        try:
-            return json.loads(PROGRESS_FILE.read_text())
-        except Exception as e:
-            logger.warning("failed_to_load_progress", error=str(e))
+    """
+    Load ingestion progress from file.
+
+    The parsed file is reused until its mtime or size changes, so status
+    polling doesn't re-read it. The returned dict is shared; callers that
+    modify it must save_progress() it.
+    """
+    global _progress_cache
+    try:
+        stat = PROGRESS_FILE.stat()
+    except FileNotFoundError:
+        stat = None
+
+    if stat is not None:
+        key = (stat.st_mtime_ns, stat.st_size)
+        with _progress_lock:
+            if _progress_cache is not None and _progress_cache[0] == key:
+                return _progress_cache[1]
+            try:
+                progress = json.loads(PROGRESS_FILE.read_text())
+                _progress_cache = (key, progress)
+                return progress
+            except Exception as e:
+                logger.warning("failed_to_load_progress", error=str(e))
     return {
         "completed_seasons": [],
         "last_update": None,
@@ -117,5 +141,10 @@ class IngestionConfig:
 
 # Export current season for use elsewhere
 def get_current_season() -> str:
-    """Get the current NHL season year."""
-    return str(CURRENT_SEASON)
+    """Get the current NHL season year (rolls over in September)."""
+    return _season_for_day(date.today())
+
+
+@lru_cache(maxsize=1)
+def _season_for_day(day: date) -> str:
+    return str(day.year if day.month >= 9 else day.year - 1)
@@ -19,6 +19,7 @@ from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.src.db.database import async_session_maker
+from backend.src.ingestion.games import refresh_recent_form_view
 from backend.src.config import get_settings
 from backend.src.ingestion.scheduler import get_current_season, load_progress, save_progress
 
@@ -470,6 +471,7 @@ async def run_startup_updates() -> dict:
         "schedule": None,
         "moneypuck": None,
         "game_logs": None,
+        "recent_form_view": None,
         "injuries": None,
         "team_stats": None,
         "rosters": None,
@@ -590,6 +592,14 @@ async def run_startup_updates() -> dict:
             results["errors"].append(f"game_logs: {str(e)}")
             await db.rollback()
 
+        # Rebuild the precomputed last-5-games view the predictor reads
+        try:
+            results["recent_form_view"] = await refresh_recent_form_view(db)
+        except Exception as e:
+            logger.error("recent_form_view_refresh_failed", error=str(e))
+            results["errors"].append(f"recent_form_view: {str(e)}")
+            await db.rollback()
+
         # 3. Update injuries
         try:
             results["injuries"] = await update_injuries(db, season)
@@ -661,6 +671,7 @@ async def run_daily_updates() -> dict:
     results = {
         "schedule": None,
         "game_logs": None,
+        "recent_form_view": None,
         "injuries": None,
         "team_stats": None,
         "rosters": None,
@@ -696,6 +707,14 @@ async def run_daily_updates() -> dict:
             logger.error("game_log_update_failed", error=str(e))
             results["errors"].append(f"game_logs: {str(e)}")
 
+        # Rebuild the precomputed last-5-games view the predictor reads
+        try:
+            results["recent_form_view"] = await refresh_recent_form_view(db)
+        except Exception as e:
+            logger.error("recent_form_view_refresh_failed", error=str(e))
+            results["errors"].append(f"recent_form_view: {str(e)}")
+            await db.rollback()
+
         # Force refresh injuries from ESPN
         from backend.src.ingestion.espn_injuries import ingest_espn_injuries
         try:
@@ -273,9 +273,11 @@ async def get_team_pace(db: AsyncSession, team_abbrev: str, season: str = "20252
         {"team": team_abbrev, "season": season}
     )
     row = result.fetchone()
-    if not row:
-        return None
+    return _pace_from_row(row) if row else None
 
+
+def _pace_from_row(row) -> dict:
+    """Convert a team_season_stats row to the pace dict used by predictions."""
     return {
         "goals_for_pg": float(row.goals_for_per_game) if row.goals_for_per_game else 0,
         "goals_against_pg": float(row.goals_against_per_game) if row.goals_against_per_game else 0,
@@ -303,9 +305,11 @@ async def get_goalie_stats(db: AsyncSession, team_abbrev: str, season: str = "20
         {"team": team_abbrev, "season": season}
     )
     row = result.fetchone()
-    if not row:
-        return None
+    return _goalie_from_row(row) if row else None
+
 
+def _goalie_from_row(row) -> dict:
+    """Convert a goalie_stats row to the starting-goalie dict used by predictions."""
     return {
         "name": row.name,
         "save_pct": float(row.save_pct) if row.save_pct else 0.900,
@@ -330,7 +334,70 @@ async def get_matchup_context(
     away_pace = await get_team_pace(db, away_team, season)
     home_goalie = await get_goalie_stats(db, home_team, season)
     away_goalie = await get_goalie_stats(db, away_team, season)
+    return _build_matchup_context(
+        home_team, away_team, home_pace, away_pace, home_goalie, away_goalie
+    )
+
+
+async def get_matchup_contexts(
+    db: AsyncSession,
+    matchups: list[tuple[str, str]],
+    season: str = "20252026"
+) -> dict[tuple[str, str], dict]:
+    """
+    Get matchup context for many (home, away) pairs at once.
+
+    Same result as get_matchup_context per pair, but team pace and starting
+    goalies for every team involved come from two queries in total.
+    """
+    teams = list({team for pair in matchups for team in pair})
 
+    result = await db.execute(
+        text("""
+            SELECT
+                team_abbrev,
+                goals_for_per_game, goals_against_per_game, total_goals_per_game,
+                shots_for_per_game, shots_against_per_game,
+                power_play_pct, penalty_kill_pct
+            FROM team_season_stats
+            WHERE team_abbrev = ANY(:teams) AND season = :season
+        """),
+        {"teams": teams, "season": season}
+    )
+    paces = {row.team_abbrev: _pace_from_row(row) for row in result.fetchall()}
+
+    result = await db.execute(
+        text("""
+            SELECT DISTINCT ON (gs.team_abbrev)
+                gs.team_abbrev,
+                p.name, gs.save_pct, gs.goals_against_avg,
+                gs.games_started, gs.wins, gs.losses, gs.shutouts
+            FROM goalie_stats gs
+            JOIN players p ON gs.player_id = p.id
+            WHERE gs.team_abbrev = ANY(:teams) AND gs.season = :season
+            ORDER BY gs.team_abbrev, gs.games_started DESC
+        """),
+        {"teams": teams, "season": season}
+    )
+    goalies = {row.team_abbrev: _goalie_from_row(row) for row in result.fetchall()}
+
+    return {
+        (home, away): _build_matchup_context(
+            home, away, paces.get(home), paces.get(away), goalies.get(home), goalies.get(away)
+        )
+        for home, away in matchups
+    }
+
+
+def _build_matchup_context(
+    home_team: str,
+    away_team: str,
+    home_pace: dict | None,
+    away_pace: dict | None,
+    home_goalie: dict | None,
+    away_goalie: dict | None,
+) -> dict:
+    """Combine both teams' pace and goalie stats into the matchup context."""
     # Calculate expected game pace
     if home_pace and away_pace:
         # Average of both teams' total goals per game
@@ -0,0 +1,92 @@
+"""
+structlog setup with rendering and I/O off the event loop.
+
+Log calls only filter by level, run the cheap event-dict processors and put
+the record on an in-memory queue. A QueueListener thread renders each record
+(console output in debug, orjson lines otherwise) and writes it to stdout,
+so a burst of log lines doesn't stall request handling on terminal or pipe
+writes.
+"""
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+
+import orjson
+import structlog
+
+# Records waiting for the listener; beyond this, new records are dropped
+# rather than blocking the event loop
+LOG_QUEUE_SIZE = 10_000
+
+
+class _PassThroughQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that enqueues records untouched.
+
+    The stock prepare() formats the message on the calling thread, which is
+    the work being moved off the loop, and it would flatten the structlog
+    event dict the listener's ProcessorFormatter needs.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+def _orjson_dumps(obj, **kwargs) -> str:
+    return orjson.dumps(obj, default=str).decode()
+
+
+def configure_logging(level: str, debug: bool) -> None:
+    """Route structlog through a queue to a background writer thread."""
+    log_level = getattr(logging, level.upper(), logging.INFO)
+
+    renderer = (
+        structlog.dev.ConsoleRenderer()
+        if debug
+        else structlog.processors.JSONRenderer(serializer=_orjson_dumps)
+    )
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(structlog.stdlib.ProcessorFormatter(
+        processors=[
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            renderer,
+        ],
+    ))
+
+    log_queue: queue.Queue = queue.Queue(LOG_QUEUE_SIZE)
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    atexit.register(listener.stop)
+
+    # A dedicated stdlib logger, so third-party loggers keep their own
+    # (root) configuration
+    app_logger = logging.getLogger("powerplai")
+    app_logger.handlers = [_PassThroughQueueHandler(log_queue)]
+    app_logger.setLevel(log_level)
+    app_logger.propagate = False
+
+    structlog.configure(
+        processors=[
+            structlog.contextvars.merge_contextvars,
+            structlog.processors.add_log_level,
+            structlog.processors.StackInfoRenderer(),
+            structlog.dev.set_exc_info,
+            # Capture tracebacks here; the listener thread has no exc_info
+            structlog.processors.format_exc_info,
+            structlog.processors.TimeStamper(fmt="%Y-%m-%d %H:%M:%S", utc=False),
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+        ],
+        # Drop log calls below the configured level at the bound-logger
+        # method itself, before any event dict is built or queued
+        wrapper_class=structlog.make_filtering_bound_logger(log_level),
+        logger_factory=lambda *args: app_logger,
+        cache_logger_on_first_use=True,
+    )
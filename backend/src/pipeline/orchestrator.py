@@ -462,6 +462,16 @@ async def start_scheduler():
         except Exception as e:
             logger.error("parlay_validation_failed", error=str(e))
 
+    # Drop expired copilot answers; lookups already skip them, this bounds the table
+    async def run_query_cache_prune():
+        try:
+            from backend.src.db.database import async_session_maker
+            from backend.src.api import query_cache
+            async with async_session_maker() as db:
+                await query_cache.prune(db)
+        except Exception as e:
+            logger.error("query_cache_prune_failed", error=str(e))
+
     _scheduler.add_job(
         run_parlay_generation,
         CronTrigger(hour=14, minute=0),
@@ -474,6 +484,12 @@ async def start_scheduler():
         id="parlay_validate",
         replace_existing=True,
     )
+    _scheduler.add_job(
+        run_query_cache_prune,
+        IntervalTrigger(hours=1),
+        id="query_cache_prune",
+        replace_existing=True,
+    )
 
     _scheduler.start()
     logger.info("scheduler_started", jobs=len(_scheduler.get_jobs()))
@@ -143,8 +143,9 @@ class DataValidator:
                 actual_value=shots,
             ))
 
-        # TOI validation
-        toi = record.get("toi", 0)
+        # TOI validation (game logs store seconds, the threshold is minutes)
+        toi_seconds = record.get("toi", 0)
+        toi = round(toi_seconds / 60, 2) if toi_seconds is not None else None
         if toi is not None and toi > self.thresholds.max_toi_per_game:
             issues.append(ValidationIssue(
                 severity=ValidationSeverity.WARNING,
@@ -0,0 +1,41 @@
+"""
+Tests for RAG document chunking.
+"""
+import pytest
+
+from backend.src.agents.rag import _chunk_bounds, chunk_text
+
+SENTENCES = (
+    "Cale Makar leads all defensemen in points. "
+    "His expected goals share at five-on-five is elite! "
+    "Is that sustainable? "
+    "Shot quality suggests it is, though his shooting percentage is high. "
+)
+
+DOCUMENTS = {
+    "sentences": SENTENCES * 30,
+    "paragraphs": "\n\n".join(SENTENCES * 3 for _ in range(12)),
+    "no_breaks": "x" * 2300,
+    "unicode": (
+        "Stützle et Lafrenière ont marqué. Señor Höglander 🏒 a obtenu une passe. " * 40
+    ),
+    "short": "Just one line.",
+}
+
+
+@pytest.mark.parametrize("name", DOCUMENTS)
+def test_chunks_cover_text_and_prefer_breaks(name):
+    text = DOCUMENTS[name]
+    chunks = chunk_text(text, chunk_size=500, overlap=50)
+
+    assert all(chunks)
+    if len(text) <= 500:
+        assert chunks == [text]
+        return
+    bounds = list(_chunk_bounds(text, 500, 50))
+    assert bounds[0][0] == 0 and bounds[-1][1] >= len(text)
+    assert all(end - start <= 500 for start, end in bounds)
+    # Consecutive chunks overlap, so nothing between them is dropped
+    assert all(next_start < end for (_, end), (next_start, _) in zip(bounds, bounds[1:]))
+    if name == "sentences":
+        assert all(chunk.endswith((".", "!", "?")) for chunk in chunks[:-1])
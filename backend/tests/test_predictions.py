@@ -0,0 +1,209 @@
+"""
+Tests for the prediction engine's batched paths and scoring kernels.
+"""
+import math
+from dataclasses import asdict, fields
+from datetime import date
+
+import numpy as np
+import pytest
+
+from backend.src.agents import predictions
+from backend.src.agents.predictions import (
+    PLAYOFF_WEIGHTS,
+    WEIGHTS,
+    MatchupPrediction,
+    PredictionEngine,
+    _score_players,
+    _score_players_loop,
+    _score_players_numpy,
+    _score_players_parallel,
+    _weight_arrays,
+)
+
+GAME_DATE = date(2026, 1, 15)  # not today, so the recent-form view is never consulted
+
+
+def _player_rows(team: str, first_id: int) -> list[tuple]:
+    """Team player stats rows in the batch query's column order, best first."""
+    rows = []
+    for n in range(12):
+        rows.append((
+            team, first_id + n, f"{team} Player {n}",
+            # recent games, goals, points, avg shots
+            5 if n % 4 else 0, 3 - n % 3, 6 - n % 5, 2.0 + n / 10,
+            # season games, goals, points, xg
+            40, 20 - n, 45 - 2 * n, 14.5 - n / 2,
+            # h2h games, goals, points
+            n % 3, n % 2, n % 3,
+            # home games, points, away games, points
+            20, 25 - n, 20, 20 - n,
+        ))
+    return rows
+
+
+TEAMS = ["TOR", "BOS", "EDM", "CGY", "NYR", "NJD"]
+ROWS = {team: _player_rows(team, 1000 * i) for i, team in enumerate(TEAMS, start=1)}
+
+
+def _context(home: str, away: str) -> dict:
+    return {
+        "home_goalie": {"name": f"{home} Goalie", "save_pct": 0.915},
+        "away_goalie": {"name": f"{away} Goalie", "save_pct": 0.898},
+        "expected_total_goals": 6.4,
+        "home_expected_goals": 3.3,
+        "away_expected_goals": 3.1,
+    }
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+
+class FakeSession:
+    """Serves the two team player stats queries from ROWS."""
+
+    async def execute(self, statement, params=None):
+        if statement is predictions._Q_TEAMS_PLAYER_STATS:
+            limit = params["limit"]
+            return _Result([row for team in params["teams"] for row in ROWS[team][:limit]])
+        if statement is predictions._Q_TEAM_PLAYER_STATS:
+            return _Result(ROWS[params["team"]][:params["limit"]])
+        raise AssertionError(f"unexpected statement: {statement}")
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    """Engine whose game info, season and matchup context lookups are stubbed."""
+    engine = PredictionEngine()
+
+    async def current_season(db):
+        return "20252026"
+
+    async def game_info(db, home_team, away_team, game_date):
+        return None
+
+    async def game_infos(db, matchups, game_date):
+        return {}
+
+    async def matchup_context(db, home_team, away_team, current_season=None):
+        return _context(home_team, away_team)
+
+    async def matchup_contexts(db, matchups, current_season=None):
+        return {pair: _context(*pair) for pair in matchups}
+
+    async def on_same_session(db, fetch, *args, **kwargs):
+        return await fetch(db, *args, **kwargs)
+
+    monkeypatch.setattr(engine, "_get_current_season", current_season)
+    monkeypatch.setattr(engine, "_get_game_info", game_info)
+    monkeypatch.setattr(engine, "_get_game_infos", game_infos)
+    monkeypatch.setattr(engine, "_get_matchup_context", matchup_context)
+    monkeypatch.setattr(engine, "_get_matchup_contexts", matchup_contexts)
+    monkeypatch.setattr(predictions, "_on_own_session", on_same_session)
+    return engine
+
+
+def _assert_same_prediction(batch: MatchupPrediction, single: MatchupPrediction) -> None:
+    for field in fields(MatchupPrediction):
+        got, want = getattr(batch, field.name), getattr(single, field.name)
+        if field.name in ("home_players", "away_players", "top_scorers"):
+            assert [p.player_id for p in got] == [p.player_id for p in want], field.name
+            for got_player, want_player in zip(got, want):
+                for key, value in asdict(want_player).items():
+                    if isinstance(value, float):
+                        assert asdict(got_player)[key] == pytest.approx(value), key
+                    else:
+                        assert asdict(got_player)[key] == value, key
+        else:
+            assert got == want, field.name
+
+
+@pytest.mark.parametrize("matchups", [
+    [("TOR", "BOS"), ("EDM", "CGY"), ("NYR", "NJD")],
+    # Split-squad: TOR plays twice, so those games can't share the batch query
+    [("TOR", "BOS"), ("EDM", "TOR"), ("NYR", "NJD")],
+    # Repeated pairs come back once per request
+    [("EDM", "CGY"), ("EDM", "CGY")],
+])
+async def test_batch_matches_per_game_predictions(engine, matchups):
+    db = FakeSession()
+    batch = await engine.get_matchup_predictions_batch(db, matchups, GAME_DATE, top_n=8)
+
+    assert [(p.home_team, p.away_team) for p in batch] == matchups
+    for prediction, (home_team, away_team) in zip(batch, matchups):
+        single = await engine.get_matchup_prediction(db, home_team, away_team, GAME_DATE, top_n=8)
+        _assert_same_prediction(prediction, single)
+
+
+class TonightSession(FakeSession):
+    """FakeSession that also lists tonight's games and counts rollbacks."""
+
+    def __init__(self, games):
+        self.games = games
+        self.rollbacks = 0
+
+    async def execute(self, statement, params=None):
+        if statement is predictions._Q_TONIGHT_GAMES:
+            return _Result([(home, away, None) for home, away in self.games])
+        return await super().execute(statement, params)
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+async def test_predict_tonight_skips_only_the_failing_matchup(engine, monkeypatch):
+    """A matchup that raises falls back to per-game predictions instead of losing the slate."""
+    async def view_not_current(db):
+        return False
+
+    monkeypatch.setattr(engine, "_recent_form_view_current", view_not_current)
+    # "XXX" has no player rows, so any query touching it raises KeyError
+    db = TonightSession([("TOR", "BOS"), ("XXX", "CGY"), ("NYR", "NJD")])
+    engine._db = db
+
+    tonight = await engine.predict_tonight()
+
+    assert [(p.home_team, p.away_team) for p in tonight] == [("TOR", "BOS"), ("NYR", "NJD")]
+    assert all(p.home_players and p.away_players for p in tonight)
+    # One rollback after the batch, one after the failing game
+    assert db.rollbacks == 2
+
+
+def _scoring_args(n: int, is_playoff: bool, seed: int = 7) -> tuple[np.ndarray, ...]:
+    rng = np.random.default_rng(seed)
+    components = rng.uniform(0.0, 1.6, size=(n, 4))
+    # Knock out components at random, including every one for some players
+    components[rng.random((n, 4)) < 0.3] = np.nan
+    components[::17] = np.nan
+    component_weights, weight_norms, adjustment_weights = _weight_arrays(
+        PLAYOFF_WEIGHTS if is_playoff else WEIGHTS
+    )
+    adjustments = rng.uniform(-0.4, 0.4, size=(n, 3))
+    # A few strongly negative adjustments exercise the zero floor
+    adjustments[::23, 0] = -5.0
+    multiplier = rng.uniform(0.9, 1.2, size=n)
+    goal_ratio = rng.uniform(0.2, 0.6, size=n)
+    return (
+        components, component_weights, weight_norms,
+        adjustments, adjustment_weights, multiplier, goal_ratio,
+    )
+
+
+@pytest.mark.parametrize("n", [1, 20, 300])
+@pytest.mark.parametrize("is_playoff", [False, True])
+@pytest.mark.parametrize("kernel", [_score_players, _score_players_parallel, _score_players_loop])
+def test_scoring_kernels_match_numpy(kernel, is_playoff, n):
+    """The numba builds (or their fallbacks) score exactly like the NumPy model."""
+    args = _scoring_args(n, is_playoff)
+    expected = _score_players_numpy(*args)
+    got = kernel(*args)
+
+    assert len(got) == len(expected) == 6
+    for got_col, expected_col in zip(got, expected):
+        np.testing.assert_allclose(got_col, expected_col, rtol=1e-12, atol=1e-15)
+    assert all(not math.isnan(value) for col in got for value in col)
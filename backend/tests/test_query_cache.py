@@ -0,0 +1,57 @@
+"""
+Tests for the copilot answer cache's key normalization and semantic-hit guard.
+"""
+import pytest
+
+from backend.src.api.query_cache import cache_key, normalize_query, query_entities
+
+
+@pytest.mark.parametrize("query", [
+    "How many goals does Makar have?",
+    "  how many goals does makar have ",
+    "HOW MANY GOALS\tDOES   MAKAR HAVE?!",
+    "How many goals does Makar have...",
+])
+def test_normalize_query_ignores_case_whitespace_and_trailing_punctuation(query):
+    assert normalize_query(query) == "how many goals does makar have"
+
+
+def test_normalize_query_keeps_inner_punctuation():
+    normalized = normalize_query("Stats for 2023-24, Makar vs. Hughes?")
+    assert normalized == "stats for 2023-24, makar vs. hughes"
+
+
+def test_cache_key_depends_on_question_and_include_rag():
+    normalized = normalize_query("Who leads the league in points?")
+    key = cache_key(normalized, include_rag=True)
+
+    assert key == cache_key(normalize_query("who leads the league in points"), include_rag=True)
+    assert key != cache_key(normalized, include_rag=False)
+    assert key != cache_key(normalize_query("Who leads the league in goals?"), include_rag=True)
+    assert len(key) == 64
+
+
+def entities(query: str) -> frozenset[str]:
+    return query_entities(normalize_query(query))
+
+
+@pytest.mark.parametrize("first, second", [
+    ("How many goals does Makar have this season?", "How many goals does Makar have last season?"),
+    ("How many goals does Makar have?", "How many assists does Makar have?"),
+    ("How many points does Quinn Hughes have?", "How many points does Jack Hughes have?"),
+    ("Who leads the Avalanche in points?", "Who leads the Oilers in points?"),
+    ("McDavid stats in 2023-24", "McDavid stats in 2022-23"),
+])
+def test_near_miss_questions_have_different_entities(first, second):
+    """Neighbours by embedding that ask about something else aren't the same question."""
+    assert entities(first) != entities(second)
+
+
+@pytest.mark.parametrize("first, second", [
+    ("How many goals does Makar have?", "how many goals has Makar scored"),
+    ("What are Makar's assists this season?", "Makar assists this season"),
+    ("Show me   Quinn Hughes stats", "quinn hughes stats?"),
+])
+def test_rephrased_questions_share_entities(first, second):
+    """Wording-only differences still let a semantic hit through."""
+    assert entities(first) == entities(second)
@@ -0,0 +1,43 @@
+"""
+Tests for the in-memory fallback of the per-route rate limiter.
+"""
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from backend.src.api import rate_limit as rate_limit_module
+from backend.src.api.rate_limit import rate_limit
+
+
+@pytest.fixture
+async def client(monkeypatch):
+    """App with one limited route, on the fallback limiter (no Redis)."""
+    monkeypatch.setattr(rate_limit_module, "_token_bucket", None)
+    app = FastAPI()
+
+    @app.get("/limited", dependencies=[rate_limit("2/minute")])
+    async def limited():
+        return {"ok": True}
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+    rate_limit_module._fallback.storage.reset()
+
+
+async def test_requests_within_limit_pass(client):
+    for _ in range(2):
+        response = await client.get("/limited")
+        assert response.status_code == 200
+
+
+async def test_request_over_limit_gets_429_with_retry_after(client):
+    """The fallback limiter rejects the request past the window's amount."""
+    for _ in range(2):
+        await client.get("/limited")
+
+    response = await client.get("/limited")
+    assert response.status_code == 429
+    assert "Rate limit exceeded" in response.json()["detail"]
+    retry_after = int(response.headers["Retry-After"])
+    assert 1 <= retry_after <= 60
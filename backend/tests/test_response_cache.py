@@ -0,0 +1,71 @@
+"""
+Tests for the GET response cache middleware.
+"""
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from backend.src.api import response_cache
+
+
+@pytest.fixture
+def calls():
+    return {"leaders": 0, "injuries": 0}
+
+
+@pytest.fixture
+async def client(calls):
+    """App with two cached routes that count how often they really run."""
+    response_cache._entries.clear()
+    app = FastAPI()
+    app.middleware("http")(response_cache.cache_read_responses)
+
+    @app.get("/api/leaders/{stat}")
+    async def leaders(stat: str):
+        calls["leaders"] += 1
+        return {"stat": stat}
+
+    @app.get("/api/injuries")
+    async def injuries():
+        calls["injuries"] += 1
+        return []
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+    response_cache._entries.clear()
+
+
+async def test_repeat_get_is_served_from_cache(client, calls):
+    first = await client.get("/api/leaders/points")
+    second = await client.get("/api/leaders/points")
+
+    assert first.status_code == second.status_code == 200
+    assert second.json() == {"stat": "points"}
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert "max-age" in second.headers["Cache-Control"]
+    assert calls["leaders"] == 1
+
+
+async def test_matching_if_none_match_returns_304(client, calls):
+    etag = (await client.get("/api/leaders/points")).headers["ETag"]
+
+    response = await client.get("/api/leaders/points", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+    stale = await client.get("/api/leaders/points", headers={"If-None-Match": '"not-the-etag"'})
+    assert stale.status_code == 200
+    assert calls["leaders"] == 1
+
+
+async def test_invalidate_drops_only_matching_prefix(client, calls):
+    await client.get("/api/leaders/points")
+    await client.get("/api/injuries")
+
+    response_cache.invalidate("/api/leaders/")
+    await client.get("/api/leaders/points")
+    await client.get("/api/injuries")
+
+    assert calls == {"leaders": 2, "injuries": 1}
@@ -1,5 +1,7 @@
 -- Enable pgvector extension
 CREATE EXTENSION IF NOT EXISTS vector;
+-- Trigram index support for ILIKE '%name%' player lookups
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
 
 -- Players table
 CREATE TABLE IF NOT EXISTS players (
@@ -63,7 +65,7 @@ CREATE TABLE IF NOT EXISTS game_logs (
     assists INTEGER,
     points INTEGER,
     shots INTEGER,
-    toi DECIMAL(6,2),
+    toi INTEGER,  -- time on ice in seconds
     plus_minus INTEGER,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     UNIQUE(player_id, game_id)
@@ -78,17 +80,36 @@ CREATE TABLE IF NOT EXISTS documents (
     url VARCHAR(1000),
     published_at TIMESTAMP,
     embedding vector(384),  -- for all-MiniLM-L6-v2
+    embedding_bits bit(384),  -- binary_quantize(embedding), search prefilter
+    embedding_half halfvec(384),  -- embedding as float16, search rerank
     metadata JSONB,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
 -- Create index for vector similarity search
 CREATE INDEX IF NOT EXISTS documents_embedding_idx
-ON documents USING ivfflat (embedding vector_cosine_ops)
-WITH (lists = 100);
+ON documents USING hnsw (embedding vector_cosine_ops)
+WITH (m = 16, ef_construction = 64);
+
+CREATE INDEX IF NOT EXISTS idx_documents_embedding_bits
+ON documents USING hnsw (embedding_bits bit_hamming_ops);
+
+-- Copilot answers cached by question (exact hash and embedding lookups)
+CREATE TABLE IF NOT EXISTS rag_cache (
+    query_hash VARCHAR(64) PRIMARY KEY,  -- sha256(include_rag, normalized query)
+    include_rag BOOLEAN NOT NULL,
+    query TEXT NOT NULL,
+    response TEXT NOT NULL,  -- JSON-encoded QueryResponse
+    embedding vector(384) NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_rag_cache_embedding
+ON rag_cache USING hnsw (embedding vector_cosine_ops);
+CREATE INDEX IF NOT EXISTS ix_rag_cache_created_at ON rag_cache(created_at);
 
 -- Index for common queries
 CREATE INDEX IF NOT EXISTS idx_player_stats_season ON player_season_stats(season);
-CREATE INDEX IF NOT EXISTS idx_player_stats_player ON player_season_stats(player_id);
 CREATE INDEX IF NOT EXISTS idx_game_logs_date ON game_logs(game_date);
 CREATE INDEX IF NOT EXISTS idx_players_name ON players(name);
+CREATE INDEX IF NOT EXISTS idx_players_name_trgm ON players USING gin (name gin_trgm_ops);